@@ -0,0 +1,99 @@
+"""
+Benchmark del critical merge path: implementación original (lista ordenada
+en cada iteración, copia del camino por arista) frente al motor 0-1 BFS.
+
+Uso:
+    python -m benchmarks.bench_merge_path --sizes 1000 2000 4000 8000 --shape merges
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from benchmarks.synthetic import (
+    SHAPES,
+    commit_hash,
+    generate_dag,
+    rev_list_text,
+)
+from src.graph_anaylisis import GitGraphAnalyzer
+
+# Por encima de este tamaño la versión original tarda demasiado
+LEGACY_MAX_COMMITS = 20_000
+
+
+def legacy_merge_path(
+    commits: Dict[str, dict], start: str, end: str
+) -> List[str]:
+    """Copia de la implementación original de _dijkstra_merge_path."""
+    queue = [(0, start, [start])]
+    visited = set()
+
+    while queue:
+        queue.sort()
+        cost, current, path = queue.pop(0)
+        if current in visited:
+            continue
+        visited.add(current)
+        if current == end:
+            return path
+
+        for parent in commits[current]["parents"]:
+            if parent not in visited:
+                edge_cost = 1 if commits[current]["type"] == "merge" else 0
+                queue.append((cost + edge_cost, parent, path + [parent]))
+    return []
+
+
+def merge_cost(commits: Dict[str, dict], path: List[str]) -> int:
+    """Costo de un camino: un punto por cada arista que sale de un merge."""
+    return sum(1 for commit in path[:-1] if commits[commit]["type"] == "merge")
+
+
+def run(sizes: List[int], shape: str = "merges") -> None:
+    """Medir ambas implementaciones para cada tamaño y comprobar que coinciden."""
+    print(f"{'commits':>10} {'original (s)':>14} {'0-1 BFS (s)':>12}")
+    for size in sizes:
+        analyzer = GitGraphAnalyzer(".")
+        analyzer._parse_git_output(
+            rev_list_text(generate_dag(size, shape, seed=size))
+        )
+        analyzer._store.resolve()
+        analyzer._GitGraphAnalyzer__analyze_commit_types()
+        # El último commit siempre es un tip; con varias raíces c0 puede no alcanzarse
+        start, end = commit_hash(size - 1), commit_hash(0)
+
+        begin = time.perf_counter()
+        path = analyzer._dijkstra_merge_path(start, end)
+        new_time = time.perf_counter() - begin
+
+        legacy_time = float("nan")
+        if size <= LEGACY_MAX_COMMITS:
+            commits = {h: analyzer.commits[h] for h in analyzer.commits}
+            begin = time.perf_counter()
+            legacy_path = legacy_merge_path(commits, start, end)
+            legacy_time = time.perf_counter() - begin
+            assert bool(path) == bool(legacy_path)
+            if path:
+                assert path[0] == legacy_path[0] == start
+                assert path[-1] == legacy_path[-1] == end
+                assert merge_cost(commits, path) == merge_cost(
+                    commits, legacy_path
+                )
+
+        print(f"{size:>10} {legacy_time:>14.4f} {new_time:>12.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 2000, 4000, 8000, 16000, 100_000],
+    )
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="merges")
+    args = parser.parse_args()
+    run(args.sizes, args.shape)
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark de consultas de ancestros: índice de alcanzabilidad frente
+a BFS ingenuo sobre los padres.
+
+Uso:
+    python -m benchmarks.bench_reachability --sizes 10000 100000 --queries 2000
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from benchmarks.synthetic import generate_dag, rev_list_text
+from src.graph_anaylisis import GitGraphAnalyzer
+from src.reachability import ReachabilityIndex
+
+
+def naive_is_ancestor(store, ancestor: int, descendant: int) -> bool:
+    """BFS sobre los padres sin ninguna poda."""
+    seen = {descendant}
+    stack = [descendant]
+    while stack:
+        node = stack.pop()
+        if node == ancestor:
+            return True
+        for parent in store.parents(node):
+            if parent >= 0 and parent not in seen:
+                seen.add(parent)
+                stack.append(parent)
+    return False
+
+
+def run(sizes: List[int], queries: int) -> None:
+    """Medir construcción del índice y consultas para cada tamaño."""
+    print(
+        f"{'commits':>10} {'índice (s)':>11} {'BFS/consulta (ms)':>18} "
+        f"{'índice/consulta (ms)':>21}"
+    )
+    for size in sizes:
+        analyzer = GitGraphAnalyzer(".")
+        analyzer._parse_git_output(
+            rev_list_text(generate_dag(size, "merges", seed=size))
+        )
+        store = analyzer._store
+        store.resolve()
+
+        begin = time.perf_counter()
+        index = ReachabilityIndex(store)
+        build_time = time.perf_counter() - begin
+
+        rng = random.Random(size)
+        pairs = [
+            (rng.randrange(size), rng.randrange(size)) for _ in range(queries)
+        ]
+
+        begin = time.perf_counter()
+        expected = [naive_is_ancestor(store, a, b) for a, b in pairs]
+        naive_time = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        answers = [index.is_ancestor(a, b) for a, b in pairs]
+        index_time = time.perf_counter() - begin
+
+        assert answers == expected
+        print(
+            f"{size:>10} {build_time:>11.3f} {1000 * naive_time / queries:>18.4f} "
+            f"{1000 * index_time / queries:>21.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000]
+    )
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
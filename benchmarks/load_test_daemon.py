@@ -0,0 +1,170 @@
+"""
+Prueba de carga del servidor de análisis: N clientes concurrentes envían
+consultas durante un tiempo fijo y se reportan peticiones por segundo y
+latencias (p50/p99).
+
+Sin --socket/--port se arranca un servidor propio sobre un repositorio
+sintético generado con benchmarks.synthetic.
+
+Uso:
+    python -m benchmarks.load_test_daemon --size 20000 --clients 16 --duration 5
+    python -m benchmarks.load_test_daemon --socket git-graph.sock --op metrics
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic import SHAPES, generate_dag, write_repo
+from src.daemon import DEFAULT_HOST, STREAM_LIMIT, AnalysisServer
+
+QUERIES = {
+    "ping": {},
+    "metrics": {},
+    "metric": {"name": "summary_stats"},
+    "critical_path": {"targets": ["v0.0.0"]},
+    "is_ancestor": {"ancestor": "HEAD", "descendant": "HEAD"},
+    "merge_base": {"first": "HEAD", "second": "HEAD"},
+}
+
+
+async def _client(
+    connect, request: Dict[str, Any], deadline: float, latencies: List[float]
+) -> int:
+    """Enviar peticiones (al menos una) hasta el deadline; retorna los errores."""
+    reader, writer = await connect()
+    payload = json.dumps(request).encode() + b"\n"
+    errors = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            writer.write(payload)
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            errors += not response.get("ok")
+            if time.perf_counter() >= deadline:
+                break
+    finally:
+        writer.close()
+    return errors
+
+
+async def run_load(
+    connect, request: Dict[str, Any], clients: int, duration: float
+) -> Dict[str, float]:
+    """Lanzar los clientes y resumir el throughput y las latencias."""
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(
+            _client(connect, request, deadline, latencies)
+            for _ in range(clients)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[
+            min(len(latencies) - 1, int(len(latencies) * 0.99))
+        ]
+        * 1000,
+    }
+
+
+async def main_async(args) -> None:
+    request = {"op": args.op, **QUERIES[args.op]}
+    server: Optional[AnalysisServer] = None
+    workdir = None
+
+    if args.socket is None and args.port is None:
+        workdir = tempfile.TemporaryDirectory(prefix="git-graph-load-")
+        repo = Path(workdir.name) / "repo"
+        started = time.perf_counter()
+        shas = write_repo(
+            generate_dag(args.size, args.shape, args.seed), str(repo)
+        )
+        # Consultas de ancestros entre la raíz y una rama (sin HEAD en el repo)
+        if args.op == "is_ancestor":
+            request.update(ancestor=shas[0], descendant="tip-0")
+        elif args.op == "merge_base":
+            request.update(first=shas[0], second="tip-0")
+        print(
+            f"Repositorio sintético de {args.size} commits en "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+
+        server = AnalysisServer([str(repo)], cache_dir=workdir.name)
+        started = time.perf_counter()
+        await server.start(str(Path(workdir.name) / "daemon.sock"))
+        print(f"Servidor listo en {time.perf_counter() - started:.2f}s")
+        socket_path = server.address
+    else:
+        socket_path = None if args.port is not None else args.socket
+
+    if socket_path is not None:
+
+        def connect():
+            return asyncio.open_unix_connection(
+                socket_path, limit=STREAM_LIMIT
+            )
+
+    else:
+
+        def connect():
+            return asyncio.open_connection(
+                args.host, args.port, limit=STREAM_LIMIT
+            )
+
+    try:
+        # Una petición de calentamiento: la primera calcula y memoriza la métrica
+        await run_load(connect, request, 1, 0)
+        result = await run_load(connect, request, args.clients, args.duration)
+    finally:
+        if server is not None:
+            await server.close()
+        if workdir is not None:
+            workdir.cleanup()
+
+    print(
+        f"{args.op}: {result['requests']} peticiones, {result['errors']} errores, "
+        f"{result['requests_per_second']:.0f} req/s, "
+        f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Prueba de carga del servidor de análisis"
+    )
+    parser.add_argument(
+        "--socket", default=None, help="Socket de un servidor ya arrancado"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--op", choices=sorted(QUERIES), default="metric")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Segundos de carga"
+    )
+    parser.add_argument(
+        "--size", type=int, default=20000, help="Commits del repo sintético"
+    )
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Suite de benchmarks por fase de GitGraphAnalyzer sobre historias sintéticas.
+
+Mide tiempo (mínimo de --repeat ejecuciones) y memoria pico rastreada de:
+parseo, resolución de padres, _build_graph, _calculate_levels, tipos de
+commit, ruta crítica, entropía y exportación. Los resultados se guardan
+como baseline JSON; al comparar con un baseline previo el proceso termina
+con código 1 si alguna fase empeora más que la tolerancia.
+
+Uso:
+    python -m benchmarks.suite --sizes 1000 10000 100000 --save baseline.json
+    python -m benchmarks.suite --sizes 1000 10000 100000 --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import (
+    SHAPES,
+    SyntheticDag,
+    commit_hash,
+    generate_dag,
+    rev_list_text,
+)
+from src.graph_anaylisis import GitGraphAnalyzer
+
+BASELINE_VERSION = 1
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Tolerancias por defecto: relativa y absoluta (ignora ruido en fases cortas)
+DEFAULT_TIME_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.10
+MIN_TIME_DELTA = 0.005
+MIN_MEMORY_DELTA_MB = 1.0
+
+PHASES = (
+    "parse",
+    "resolve",
+    "build_graph",
+    "levels",
+    "commit_types",
+    "critical_path",
+    "entropy",
+    "export",
+)
+
+
+def _phases(
+    analyzer: GitGraphAnalyzer, dag: SyntheticDag, text: str, output: str
+) -> List[Tuple[str, Callable[[], Any]]]:
+    """Fases en orden; cada una depende del estado que dejan las anteriores."""
+    head = commit_hash(max(dag.tips))
+    oldest = commit_hash(0)
+    return [
+        ("parse", lambda: analyzer._parse_git_output(text)),
+        ("resolve", analyzer._store.resolve),
+        ("build_graph", analyzer._build_graph),
+        ("levels", analyzer._calculate_levels),
+        ("commit_types", analyzer._GitGraphAnalyzer__analyze_commit_types),
+        ("critical_path", lambda: analyzer._dijkstra_merge_path(head, oldest)),
+        ("entropy", analyzer.calculate_historical_entropy),
+        ("export", lambda: analyzer.export_metrics(output)),
+    ]
+
+
+def run_pipeline(
+    dag: SyntheticDag, text: str, workdir: str, trace_memory: bool = False
+) -> Dict[str, Dict[str, float]]:
+    """Ejecutar todas las fases una vez sobre un analizador nuevo."""
+    # Un directorio que no es repositorio: la ruta crítica de export usa el fallback
+    analyzer = GitGraphAnalyzer(workdir)
+    output = str(Path(workdir) / "metrics.json")
+    results: Dict[str, Dict[str, float]] = {}
+
+    for name, phase in _phases(analyzer, dag, text, output):
+        if trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        phase()
+        elapsed = time.perf_counter() - start
+        entry = results[name] = {"seconds": elapsed}
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            entry["peak_mb"] = (peak - base) / (1024 * 1024)
+    return results
+
+
+def run_suite(
+    sizes: List[int],
+    shapes: List[str],
+    repeat: int = 3,
+    measure_memory: bool = True,
+    seed: int = 0,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Medir cada combinación forma/tamaño y retornar el documento de baseline."""
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for shape in shapes:
+            for size in sizes:
+                dag = generate_dag(size, shape, seed)
+                text = rev_list_text(dag)
+
+                best: Dict[str, Dict[str, float]] = {}
+                for _ in range(repeat):
+                    for name, entry in run_pipeline(
+                        dag, text, workdir
+                    ).items():
+                        seconds = min(
+                            entry["seconds"], best.get(name, entry)["seconds"]
+                        )
+                        best[name] = {"seconds": round(seconds, 6)}
+
+                # La memoria se mide en una pasada aparte: tracemalloc ralentiza todo
+                if measure_memory:
+                    tracemalloc.start()
+                    try:
+                        traced = run_pipeline(
+                            dag, text, workdir, trace_memory=True
+                        )
+                    finally:
+                        tracemalloc.stop()
+                    for name, entry in traced.items():
+                        best[name]["peak_mb"] = round(entry["peak_mb"], 3)
+
+                key = f"{shape}/{size}"
+                results[key] = best
+                if log is not None:
+                    log(format_row(key, best))
+                del text, dag
+
+    return {
+        "version": BASELINE_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "parameters": {
+            "sizes": sizes,
+            "shapes": shapes,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> List[str]:
+    """Regresiones de current frente a baseline (lista vacía si no hay)."""
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(
+            f"Versión de baseline no soportada: {baseline.get('version')}"
+        )
+
+    regressions = []
+    for key, phases in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        for name, entry in phases.items():
+            old = reference.get(name)
+            if old is None:
+                continue
+
+            delta = entry["seconds"] - old["seconds"]
+            if delta > MIN_TIME_DELTA and entry["seconds"] > old["seconds"] * (
+                1 + time_tolerance
+            ):
+                regressions.append(
+                    f"{key} {name}: {old['seconds']:.4f} s -> {entry['seconds']:.4f} s"
+                )
+
+            if "peak_mb" in entry and "peak_mb" in old:
+                delta = entry["peak_mb"] - old["peak_mb"]
+                if delta > MIN_MEMORY_DELTA_MB and entry["peak_mb"] > old[
+                    "peak_mb"
+                ] * (1 + memory_tolerance):
+                    regressions.append(
+                        f"{key} {name}: {old['peak_mb']:.1f} MB -> {entry['peak_mb']:.1f} MB"
+                    )
+    return regressions
+
+
+def format_row(key: str, phases: Dict[str, Dict[str, float]]) -> str:
+    """Fila de la tabla: segundos (y MB) por fase."""
+    cells = []
+    for name in PHASES:
+        entry = phases[name]
+        cell = f"{entry['seconds']:.4f}"
+        if "peak_mb" in entry:
+            cell += f"/{entry['peak_mb']:.1f}"
+        cells.append(f"{cell:>16}")
+    return f"{key:>22}" + "".join(cells)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Número de commits (hasta 10^7 con memoria suficiente)",
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        choices=sorted(SHAPES),
+        default=["linear", "mixed", "octopus"],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="No medir memoria (evita la pasada con tracemalloc)",
+    )
+    parser.add_argument(
+        "--save", help="Guardar los resultados como baseline JSON"
+    )
+    parser.add_argument(
+        "--compare", help="Baseline JSON contra el que comparar"
+    )
+    parser.add_argument(
+        "--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE
+    )
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'forma/commits':>22}" + "".join(f"{name:>16}" for name in PHASES))
+    print(f"{'':>22}{'(s/MB)':>16}")
+    current = run_suite(
+        args.sizes,
+        args.shapes,
+        args.repeat,
+        not args.no_memory,
+        args.seed,
+        log=print,
+    )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"Baseline guardado en {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(
+            current, baseline, args.time_tolerance, args.memory_tolerance
+        )
+        if regressions:
+            print("Regresiones:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Sin regresiones frente al baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Generador determinista de historias sintéticas para benchmarks.
+
+Una historia es un DAG en formato CSR (padres antes que los hijos) con
+ramas abiertas que avanzan, se bifurcan y se fusionan. Las formas
+predefinidas cubren cadenas lineales, fan-out de ramas de feature, merges
+frecuentes, merges octopus y varias raíces. La historia se puede pasar a
+GitGraphAnalyzer._parse_git_output como salida de rev-list o escribirse
+como repositorio real con git fast-import.
+
+Uso:
+    python -m benchmarks.synthetic --commits 100000 --shape octopus --repo /tmp/synth
+"""
+
+import argparse
+import random
+import subprocess
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple
+
+# Fecha del primer commit y separación entre commits (segundos)
+BASE_TIMESTAMP = 1_600_000_000
+COMMIT_INTERVAL = 600
+
+
+class Shape(NamedTuple):
+    """Probabilidades por commit de cada tipo de evento."""
+
+    roots: int = 1
+    branch: float = 0.0  # abrir una rama nueva desde un tip
+    merge: float = 0.0  # fusionar otra rama abierta
+    octopus: float = 0.0  # fusionar 2+ ramas a la vez
+    max_branches: int = 1  # ramas abiertas como máximo
+    max_octopus: int = 8  # padres como máximo en un octopus
+
+
+SHAPES: Dict[str, Shape] = {
+    "linear": Shape(),
+    "fanout": Shape(branch=0.25, merge=0.02, max_branches=256),
+    "merges": Shape(branch=0.15, merge=0.3, max_branches=16),
+    "octopus": Shape(branch=0.3, merge=0.05, octopus=0.05, max_branches=64),
+    "multi_root": Shape(roots=16, branch=0.05, merge=0.1, max_branches=32),
+    "mixed": Shape(
+        roots=4, branch=0.1, merge=0.1, octopus=0.01, max_branches=64
+    ),
+}
+
+
+class SyntheticDag(NamedTuple):
+    """Historia generada: padres en CSR y tips de las ramas que quedan abiertas."""
+
+    offsets: array
+    parents: array
+    tips: List[int]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def parents_of(self, commit: int) -> array:
+        return self.parents[self.offsets[commit] : self.offsets[commit + 1]]
+
+
+def commit_hash(commit: int) -> str:
+    """Hash sintético de 40 caracteres hexadecimales."""
+    return f"{commit:040x}"
+
+
+def generate_dag(
+    num_commits: int, shape: str = "mixed", seed: int = 0
+) -> SyntheticDag:
+    """Generar una historia determinista (misma semilla, misma historia)."""
+    spec = SHAPES[shape]
+    rng = random.Random(seed)
+    offsets = array("q", [0])
+    parents = array("q")
+    heads: List[int] = []
+
+    for commit in range(num_commits):
+        if commit < spec.roots:
+            heads.append(commit)
+            offsets.append(len(parents))
+            continue
+
+        branch = rng.randrange(len(heads))
+        tip = heads[branch]
+        parents.append(tip)
+        roll = rng.random()
+        if roll < spec.octopus and len(heads) >= 3:
+            count = rng.randint(2, min(spec.max_octopus, len(heads)) - 1)
+            parents.extend(_take_heads(heads, branch, count, rng))
+        elif roll < spec.octopus + spec.merge and len(heads) >= 2:
+            parents.extend(_take_heads(heads, branch, 1, rng))
+        elif (
+            roll < spec.octopus + spec.merge + spec.branch
+            and len(heads) < spec.max_branches
+        ):
+            # Rama nueva: el tip anterior sigue abierto
+            heads.append(commit)
+            offsets.append(len(parents))
+            continue
+
+        # El tip de la rama avanza (su índice puede haber cambiado al fusionar)
+        heads[heads.index(tip)] = commit
+        offsets.append(len(parents))
+
+    return SyntheticDag(offsets, parents, heads)
+
+
+def _take_heads(
+    heads: List[int], keep: int, count: int, rng: random.Random
+) -> List[int]:
+    """Quitar count tips distintos de heads[keep] (para fusionarlos)."""
+    others = [i for i in range(len(heads)) if i != keep]
+    chosen = sorted(rng.sample(others, count), reverse=True)
+    merged = [heads[i] for i in chosen]
+    for i in chosen:
+        heads[i] = heads[-1]
+        heads.pop()
+    return merged
+
+
+def iter_rev_list(dag: SyntheticDag) -> Iterator[str]:
+    """Líneas como git rev-list --all --parents (hijos antes que padres)."""
+    offsets, parents = dag.offsets, dag.parents
+    for commit in range(len(dag) - 1, -1, -1):
+        line = [commit_hash(commit)]
+        line.extend(
+            commit_hash(p)
+            for p in parents[offsets[commit] : offsets[commit + 1]]
+        )
+        yield " ".join(line) + "\n"
+
+
+def rev_list_text(dag: SyntheticDag) -> str:
+    """Salida completa de rev-list para _parse_git_output."""
+    return "".join(iter_rev_list(dag))
+
+
+def iter_fast_import(dag: SyntheticDag) -> Iterator[str]:
+    """Comandos de git fast-import que reproducen la historia (commits vacíos)."""
+    offsets, parents = dag.offsets, dag.parents
+    for commit in range(len(dag)):
+        commit_parents = parents[offsets[commit] : offsets[commit + 1]]
+        ref = (
+            f"refs/heads/root-{commit}"
+            if not commit_parents
+            else "refs/heads/work"
+        )
+        lines = []
+        if not commit_parents:
+            lines.append(f"reset {ref}")
+        lines += [
+            f"commit {ref}",
+            f"mark :{commit + 1}",
+            f"committer Bench <bench@example.com> "
+            f"{BASE_TIMESTAMP + commit * COMMIT_INTERVAL} +0000",
+            "data 0",
+        ]
+        if commit_parents:
+            lines.append(f"from :{commit_parents[0] + 1}")
+            lines.extend(f"merge :{p + 1}" for p in commit_parents[1:])
+        yield "\n".join(lines) + "\n\n"
+
+    # Una rama por tip para que rev-list --all vea toda la historia
+    for number, tip in enumerate(sorted(dag.tips)):
+        yield f"reset refs/heads/tip-{number}\nfrom :{tip + 1}\n\n"
+
+
+def write_repo(dag: SyntheticDag, path: str) -> Dict[int, str]:
+    """
+    Crear un repositorio git real con la historia usando git fast-import.
+
+    Retorna el hash real de cada commit (los de commit_hash son ficticios).
+    """
+    repo = Path(path)
+    repo.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "--quiet"], cwd=repo, check=True)
+
+    marks = repo / ".git" / "synthetic-marks"
+    process = subprocess.Popen(
+        ["git", "fast-import", "--quiet", f"--export-marks={marks}"],
+        cwd=repo,
+        stdin=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        for chunk in iter_fast_import(dag):
+            process.stdin.write(chunk)
+        process.stdin.close()
+    except BaseException:
+        process.kill()
+        raise
+    if process.wait() != 0:
+        raise RuntimeError(
+            f"git fast-import falló con código {process.returncode}"
+        )
+
+    shas = {}
+    for line in marks.read_text().splitlines():
+        mark, _, sha = line.partition(" ")
+        shas[int(mark[1:]) - 1] = sha
+    marks.unlink()
+    return shas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--commits", type=int, default=10_000)
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--repo", required=True, help="Directorio del repositorio a crear"
+    )
+    args = parser.parse_args()
+
+    dag = generate_dag(args.commits, args.shape, args.seed)
+    write_repo(dag, args.repo)
+    print(
+        f"{len(dag)} commits ({args.shape}, {len(dag.tips)} tips) en {args.repo}"
+    )
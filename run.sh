@@ -26,28 +26,30 @@ error() {
     echo -e "${RED}[ERROR]${NC} $1"
 }
 
+show_help() {
+    cat <<EOF
+Uso: $(basename "$0") [opciones]
+
+Analiza el repositorio (REPO_PATH, por defecto este directorio) y genera
+metrics.json y report.md en un solo proceso (python -m src pipeline).
+
+Opciones:
+  -v, --verbose   Mostrar los resultados del análisis
+  -h, --help      Mostrar esta ayuda
+EOF
+}
+
 # Ejecución principal
 main() {
     log "Iniciando pipeline de análisis de repositorio."
-    
-    # Paso 1: Análisis de gráfico
-    log "Paso 1: Análisis de gráfico"
-    if [[ "$VERBOSE" == "true" ]]; then
-        python3 src/graph_analysis.py --repo "$REPO_PATH" --output metrics.json --verbose
-    else
-        python3 src/graph_analysis.py --repo "$REPO_PATH" --output metrics.json
-    fi
-    success "Analisis de gráfico completado. Métricas guardadas en metrics.json"
-    
-    # Paso 2: Generar reporte Markdown
-    log "Paso 2: Generación de reporte Markdown"
+
+    # Análisis de gráfico y reporte Markdown en un mismo intérprete
+    local args=(--repo "$REPO_PATH" --output metrics.json --report report.md --format md)
     if [[ "$VERBOSE" == "true" ]]; then
-        python3 src/report_suite.py --format md --input metrics.json --output report.md --repo "$REPO_PATH" --verbose
-    else
-        python3 src/report_suite.py --format md --input metrics.json --output report.md --repo "$REPO_PATH"
+        args+=(--verbose)
     fi
-    success "Reporte Markdown generado: report.md"
-
+    PYTHONPATH="$SCRIPT_DIR${PYTHONPATH:+:$PYTHONPATH}" python3 -m src pipeline "${args[@]}"
+    success "Métricas guardadas en metrics.json y reporte Markdown generado: report.md"
 }
 
 
@@ -0,0 +1,98 @@
+"""
+Punto de entrada único:
+
+    python -m src analyze  [opciones]   análisis del grafo (ver analyze --help)
+    python -m src report   [opciones]   reporte a partir de metrics.json
+    python -m src pipeline [opciones]   analyze + report en un solo proceso
+    python -m src daemon   [opciones]   servidor de consultas
+
+Cada comando importa solo los módulos que necesita, y las dependencias
+pesadas (networkx, NumPy, pandas) se importan cuando se usan.
+"""
+
+import sys
+from typing import Callable, Dict, List, Optional
+
+
+def analyze(argv: List[str]) -> int:
+    from .graph_anaylisis import main
+
+    return main(argv)
+
+
+def report(argv: List[str]) -> int:
+    from .report_suite import main
+
+    return main(argv)
+
+
+def daemon(argv: List[str]) -> int:
+    from .daemon import main
+
+    return main(argv)
+
+
+def pipeline(argv: List[str]) -> int:
+    """Los dos pasos de run.sh sin lanzar un intérprete por paso."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src pipeline",
+        description="Analizar el repositorio y generar el reporte a la vez",
+    )
+    parser.add_argument("--repo", default=".", help="Ruta del repositorio git")
+    parser.add_argument(
+        "--output", default="metrics.json", help="Archivo de métricas"
+    )
+    parser.add_argument(
+        "--report", default="report.md", help="Archivo del reporte"
+    )
+    parser.add_argument("--format", choices=["md", "html"], default="md")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args(argv)
+
+    analyze_args = ["--repo", args.repo, "--output", args.output]
+    if args.verbose:
+        analyze_args.append("--verbose")
+    status = analyze(analyze_args)
+    if status:
+        return status
+    return report(
+        [
+            "--format",
+            args.format,
+            "--input",
+            args.output,
+            "--output",
+            args.report,
+        ]
+    )
+
+
+COMMANDS: Dict[str, Callable[[List[str]], int]] = {
+    "analyze": analyze,
+    "report": report,
+    "pipeline": pipeline,
+    "daemon": daemon,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return 0 if argv else 2
+
+    command = COMMANDS.get(argv[0])
+    if command is None:
+        print(
+            f"Comando desconocido: {argv[0]} "
+            "(analyze, report, pipeline, daemon)",
+            file=sys.stderr,
+        )
+        return 2
+    return command(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
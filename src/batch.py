@@ -0,0 +1,273 @@
+"""Análisis de múltiples repositorios con un pool de procesos."""
+
+import glob
+import json
+import queue
+import hashlib
+import signal
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .graph_anaylisis import (
+    BOUNDED_OPTIONS,
+    GitGraphAnalyzer,
+    scalars_first,
+    write_metrics,
+)
+from .snapshot import snapshot_path_for
+
+# Margen extra sobre el timeout del worker antes de darlo por perdido
+TIMEOUT_GRACE_SECONDS = 5
+
+
+class RepoTimeoutError(Exception):
+    """El análisis de un repositorio superó su timeout."""
+
+
+def collect_repos(
+    repos: Iterable[str] = (),
+    repos_file: Optional[str] = None,
+    repos_glob: Optional[str] = None,
+) -> List[str]:
+    """Repositorios de argumentos, un archivo (uno por línea) o un glob."""
+    collected = list(repos)
+
+    if repos_file:
+        with open(repos_file) as f:
+            collected.extend(
+                line.strip()
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+
+    if repos_glob:
+        collected.extend(
+            path
+            for path in sorted(glob.glob(repos_glob))
+            if (Path(path) / ".git").exists()
+        )
+
+    # Quitar duplicados preservando el orden
+    return list(dict.fromkeys(collected))
+
+
+def output_name(repo: str) -> str:
+    """Nombre de archivo único y legible para un repositorio."""
+    resolved = Path(repo).resolve()
+    key = hashlib.sha1(str(resolved).encode()).hexdigest()[:8]
+    return f"{resolved.name or 'repo'}-{key}.json"
+
+
+def _raise_timeout(signum, frame):
+    raise RepoTimeoutError()
+
+
+def analyze_repo(repo: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analizar un repositorio dentro de un worker.
+
+    Nunca lanza excepciones: los fallos se reportan en el resultado para
+    que un repositorio no afecte al resto del lote.
+    """
+    start = time.perf_counter()
+    timeout = options.get("timeout")
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(int(timeout))
+
+    result: Dict[str, Any] = {"repo": repo}
+    try:
+        analyzer = GitGraphAnalyzer(repo)
+        load_options = {"stream": options.get("stream", False)}
+        if options.get("cache_dir"):
+            snapshot = snapshot_path_for(
+                repo, output_name(repo), options["cache_dir"]
+            )
+            analyzer.load_incremental(snapshot, **load_options)
+        elif options.get("commit_graph"):
+            analyzer.load_from_commit_graph(**load_options)
+        else:
+            bounded = {key: options.get(key) for key in BOUNDED_OPTIONS}
+            analyzer.load_git_data(**load_options, **bounded)
+
+        analyzer.find_critical_merge_paths(options.get("tags", ["v0.0.0"]))
+        result["metrics"] = analyzer.collect_metrics()
+        result["status"] = "ok"
+    except RepoTimeoutError:
+        result["status"] = "timeout"
+        result["error"] = f"Timeout de {timeout} s superado"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+    result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+class BatchWriter:
+    """Escribe resultados como archivos por repo o como un único NDJSON."""
+
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        ndjson_path: Optional[str] = None,
+    ):
+        self.output_dir = Path(output_dir) if output_dir else None
+        self._ndjson = open(ndjson_path, "w") if ndjson_path else None
+        if self.output_dir:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """Escribir un resultado en cuanto está disponible."""
+        if self._ndjson is not None:
+            # Mismo orden de claves que analyze: el reporte en streaming
+            # espera los escalares de cada sección antes que sus listas
+            self._ndjson.write(json.dumps(scalars_first(result)) + "\n")
+            self._ndjson.flush()
+
+        if self.output_dir is not None and result["status"] == "ok":
+            write_metrics(
+                result["metrics"],
+                str(self.output_dir / output_name(result["repo"])),
+            )
+
+    def close(self) -> None:
+        if self._ndjson is not None:
+            self._ndjson.close()
+
+
+def run_batch(
+    repos: List[str],
+    options: Dict[str, Any],
+    workers: Optional[int] = None,
+    writer: Optional[BatchWriter] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Analizar repositorios en un pool de procesos.
+
+    Cada worker importa los módulos una sola vez y atiende varios repositorios.
+    Si un worker muere (p. ej. por OOM) los repositorios afectados se
+    reintentan de uno en uno para aislar al culpable.
+    """
+    results: List[Dict[str, Any]] = []
+    broken: List[str] = []
+
+    def record(result: Dict[str, Any]) -> None:
+        results.append(result)
+        if writer is not None:
+            writer.write(result)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(analyze_repo, repo, options): repo for repo in repos
+        }
+        for future in as_completed(futures):
+            try:
+                record(future.result())
+            except BrokenProcessPool:
+                broken.append(futures[future])
+
+    for repo in broken:
+        record(_run_isolated(repo, options))
+    return results
+
+
+def _run_isolated(repo: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Reintentar un repositorio en su propio proceso."""
+    timeout = options.get("timeout")
+    deadline = (
+        time.monotonic() + timeout + TIMEOUT_GRACE_SECONDS if timeout else None
+    )
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_isolated_worker, args=(repo, options, results)
+    )
+    process.start()
+
+    try:
+        while True:
+            try:
+                return results.get(timeout=1)
+            except queue.Empty:
+                pass
+            if not process.is_alive():
+                return {
+                    "repo": repo,
+                    "status": "error",
+                    "error": (
+                        f"El worker terminó con código {process.exitcode}"
+                    ),
+                }
+            if deadline is not None and time.monotonic() > deadline:
+                return {
+                    "repo": repo,
+                    "status": "timeout",
+                    "error": f"Timeout de {timeout} s superado",
+                }
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+
+def _isolated_worker(repo: str, options: Dict[str, Any], results) -> None:
+    results.put(analyze_repo(repo, options))
+
+
+def main_batch(args) -> int:
+    """Ejecutar el modo batch desde los argumentos de la CLI."""
+    repos = collect_repos(args.repos or (), args.repos_file, args.repos_glob)
+    if not repos:
+        print("Error: no se encontraron repositorios")
+        return 1
+
+    output_dir = args.output_dir
+    if output_dir is None and args.ndjson is None:
+        output_dir = "metrics"
+
+    cache_dir = args.cache_dir
+    if args.incremental and cache_dir is None:
+        # Como con un solo repositorio: snapshots junto a las métricas
+        cache_dir = str(
+            Path(output_dir or Path(args.ndjson).parent) / "snapshots"
+        )
+
+    options = {
+        "tags": args.tag,
+        "stream": args.stream,
+        "commit_graph": args.commit_graph,
+        "cache_dir": cache_dir,
+        "timeout": args.timeout,
+        "since": args.since,
+        "max_commits": args.max_commits,
+        "refs": args.refs,
+    }
+
+    writer = BatchWriter(output_dir, args.ndjson)
+    try:
+        results = run_batch(repos, options, args.workers, writer)
+    finally:
+        writer.close()
+
+    failed = [r for r in results if r["status"] != "ok"]
+    if args.verbose:
+        for result in results:
+            print(
+                f"  [{result['status']}] {result['repo']} "
+                f"({result.get('elapsed_seconds', 0):.2f} s)"
+            )
+    print(
+        f"Batch completo: {len(results) - len(failed)}/{len(results)} "
+        "repositorios analizados"
+    )
+    return 1 if failed else 0
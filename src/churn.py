@@ -0,0 +1,347 @@
+"""
+Métricas de churn: líneas añadidas y borradas por commit, archivos más
+modificados y concentración de autores (entropía y bus factor).
+
+Los commits del DAG ya cargado se reparten en shards contiguos; cada
+worker lanza un único
+
+    git log --no-walk=unsorted --stdin --numstat -z
+
+con los hashes de su shard por stdin, lo parsea a medida que llega y
+retorna contadores compactos que el proceso principal suma. Los diffs
+dominan el coste, así que el tiempo baja casi linealmente con los cores
+hasta que el disco se satura.
+"""
+
+import math
+import os
+import subprocess
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# Separador de commit (\x01) + hash + autor (con .mailmap); -z separa con NUL
+LOG_FORMAT = "%x01%H%x00%aN"
+
+# Shards por worker: con shards más pequeños que workers/commits se
+# compensan rangos con diffs de coste muy distinto
+SHARDS_PER_WORKER = 4
+MIN_SHARD_SIZE = 256
+
+HOT_FILES = 20
+TOP_AUTHORS = 10
+# Fracción de las líneas modificadas que define el bus factor
+BUS_FACTOR_SHARE = 0.5
+
+
+class ChurnCounters:
+    """
+    Contadores de un conjunto de commits, sumables con merge.
+
+    added/deleted son arrays alineados con ids (posición del commit en el
+    CommitStore); files y authors guardan [commits, líneas] por clave.
+    """
+
+    __slots__ = (
+        "ids",
+        "added",
+        "deleted",
+        "binary_changes",
+        "files",
+        "authors",
+    )
+
+    def __init__(self):
+        self.ids = array("q")
+        self.added = array("q")
+        self.deleted = array("q")
+        self.binary_changes = 0
+        self.files: Dict[str, List[int]] = {}
+        self.authors: Dict[str, List[int]] = {}
+
+    def merge(self, other: "ChurnCounters") -> "ChurnCounters":
+        self.ids.extend(other.ids)
+        self.added.extend(other.added)
+        self.deleted.extend(other.deleted)
+        self.binary_changes += other.binary_changes
+        for target, source in (
+            (self.files, other.files),
+            (self.authors, other.authors),
+        ):
+            for key, (commits, lines) in source.items():
+                entry = target.get(key)
+                if entry is None:
+                    target[key] = [commits, lines]
+                else:
+                    entry[0] += commits
+                    entry[1] += lines
+        return self
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class _NumstatParser:
+    """Estado del parseo de git log --numstat -z, token a token."""
+
+    def __init__(self, index: Dict[str, int]):
+        self.index = index
+        self.counters = ChurnCounters()
+        self.author_entry: Optional[List[int]] = None
+        self.expect_author = False
+        self.rename_paths = 0
+        self.added = self.deleted = self.file_lines = 0
+
+    def feed(self, token: str) -> None:
+        if self.rename_paths:
+            self._rename_path(token)
+            return
+        token = token.lstrip("\n")
+        if not token:
+            return
+        if token[0] == "\x01":
+            self._start_commit(token[1:])
+        elif self.expect_author:
+            self._author(token)
+        else:
+            self._file_line(token)
+
+    def finish(self) -> ChurnCounters:
+        self._flush()
+        return self.counters
+
+    def _start_commit(self, commit: str) -> None:
+        self._flush()
+        self.counters.ids.append(self.index[commit])
+        self.added = self.deleted = 0
+        self.expect_author = True
+        self.author_entry = None
+
+    def _author(self, name: str) -> None:
+        self.expect_author = False
+        self.author_entry = self.counters.authors.setdefault(name, [0, 0])
+        self.author_entry[0] += 1
+
+    def _file_line(self, token: str) -> None:
+        plus, minus, path = token.split("\t", 2)
+        if plus == "-":
+            # Binario: sin conteo de líneas
+            self.counters.binary_changes += 1
+            self.file_lines = 0
+        else:
+            self.file_lines = int(plus) + int(minus)
+            self.added += int(plus)
+            self.deleted += int(minus)
+        if path:
+            self._count_file(path)
+        else:
+            # Renombre: siguen "origen\0destino\0"
+            self.rename_paths = 2
+
+    def _rename_path(self, path: str) -> None:
+        # Se cuenta la ruta de destino
+        self.rename_paths -= 1
+        if not self.rename_paths:
+            self._count_file(path)
+
+    def _count_file(self, path: str) -> None:
+        entry = self.counters.files.get(path)
+        if entry is None:
+            self.counters.files[path] = [1, self.file_lines]
+        else:
+            entry[0] += 1
+            entry[1] += self.file_lines
+
+    def _flush(self) -> None:
+        if self.author_entry is not None:
+            self.counters.added.append(self.added)
+            self.counters.deleted.append(self.deleted)
+            self.author_entry[1] += self.added + self.deleted
+
+
+def parse_numstat(
+    chunks: Iterable[str], index: Dict[str, int]
+) -> ChurnCounters:
+    """
+    Contadores a partir de la salida de git log -z troceada en bloques.
+
+    Cada commit es "\\x01<hash>\\0<autor>\\0" seguido de entradas
+    "añadidas\\tborradas\\truta\\0"; en renombres la ruta va vacía y le
+    siguen "origen\\0destino\\0". Los binarios tienen "-" en vez de números.
+    """
+    parser = _NumstatParser(index)
+    pending = ""
+    for chunk in chunks:
+        tokens = (pending + chunk).split("\0")
+        pending = tokens.pop()
+        for token in tokens:
+            parser.feed(token)
+    if pending.strip():
+        raise RuntimeError("Salida de git log --numstat incompleta")
+    return parser.finish()
+
+
+def shard_churn(
+    repo_path: str,
+    hashes: Sequence[str],
+    first_id: int,
+    chunk_size: int = 1 << 16,
+) -> ChurnCounters:
+    """Worker: churn de los commits hashes (ids first_id, first_id + 1...)."""
+    index = {commit: first_id + k for k, commit in enumerate(hashes)}
+    cmd = [
+        "git",
+        "log",
+        "--no-walk=unsorted",
+        "--stdin",
+        "--numstat",
+        "-z",
+        "-M",
+        f"--format={LOG_FORMAT}",
+    ]
+    process = subprocess.Popen(
+        cmd,
+        cwd=repo_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+        errors="replace",
+    )
+    try:
+        # git lee todas las revisiones de stdin antes de escribir
+        process.stdin.write("\n".join(hashes) + "\n")
+        process.stdin.close()
+        chunks: Iterator[str] = iter(
+            lambda: process.stdout.read(chunk_size), ""
+        )
+        counters = parse_numstat(chunks, index)
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return counters
+
+
+def split_shards(count: int, workers: int) -> List[Tuple[int, int]]:
+    """Rangos [inicio, fin) contiguos de ids para repartir entre workers."""
+    if count == 0:
+        return []
+    shards = max(1, min(workers * SHARDS_PER_WORKER, count // MIN_SHARD_SIZE))
+    bounds = [count * k // shards for k in range(shards + 1)]
+    return [(bounds[k], bounds[k + 1]) for k in range(shards)]
+
+
+def collect_churn(
+    repo_path: str, hashes: Sequence[str], workers: Optional[int] = None
+) -> ChurnCounters:
+    """Contadores de churn de todos los commits, en paralelo por shards."""
+    workers = workers or os.cpu_count() or 1
+    shards = split_shards(len(hashes), workers)
+    total = ChurnCounters()
+
+    if workers == 1 or len(shards) <= 1:
+        for start, end in shards:
+            total.merge(shard_churn(repo_path, list(hashes[start:end]), start))
+        return total
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        futures = [
+            pool.submit(shard_churn, repo_path, list(hashes[start:end]), start)
+            for start, end in shards
+        ]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+
+def _entropy(values: Iterable[int]) -> float:
+    """Entropía de Shannon (bits) de una distribución de conteos."""
+    values = [value for value in values if value]
+    total = sum(values)
+    entropy = 0.0
+    for value in values:
+        probability = value / total
+        entropy -= probability * math.log2(probability)
+    return entropy
+
+
+def bus_factor(
+    lines_by_author: Iterable[int], share: float = BUS_FACTOR_SHARE
+) -> int:
+    """Mínimo de autores que reúnen share de las líneas modificadas."""
+    lines = sorted(lines_by_author, reverse=True)
+    target = share * sum(lines)
+    covered = 0
+    for count, value in enumerate(lines, 1):
+        covered += value
+        if covered >= target:
+            return count
+    return 0
+
+
+def summarize(counters: ChurnCounters) -> Dict[str, Any]:
+    """Resumen exportable (claves escalares y listas acotadas)."""
+    per_commit = sorted(
+        a + d for a, d in zip(counters.added, counters.deleted)
+    )
+    commits = len(per_commit)
+    authors = counters.authors
+    # Peso de cada autor: líneas modificadas, o commits si no hay líneas
+    # (historias solo con binarios o commits vacíos)
+    weights = [lines for _, lines in authors.values()]
+    if not any(weights):
+        weights = [commits_ for commits_, _ in authors.values()]
+
+    hot_files = sorted(
+        counters.files.items(), key=lambda item: (-item[1][1], item[0])
+    )
+    top_authors = sorted(
+        authors.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])
+    )
+    author_entropy = _entropy(weights)
+
+    return {
+        "commits": commits,
+        "lines_added": sum(counters.added),
+        "lines_deleted": sum(counters.deleted),
+        "binary_changes": counters.binary_changes,
+        "mean_lines_per_commit": sum(per_commit) / commits if commits else 0.0,
+        "median_lines_per_commit": per_commit[commits // 2] if commits else 0,
+        "max_lines_per_commit": per_commit[-1] if commits else 0,
+        "files_touched": len(counters.files),
+        "authors": len(authors),
+        "author_entropy": author_entropy,
+        "author_entropy_normalized": (
+            author_entropy / math.log2(len(authors))
+            if len(authors) > 1
+            else 0.0
+        ),
+        "bus_factor": bus_factor(weights),
+        "hot_files": [
+            {"path": path, "commits": touched, "lines": lines}
+            for path, (touched, lines) in hot_files[:HOT_FILES]
+        ],
+        "top_authors": [
+            {"author": name, "commits": commits_, "lines": lines}
+            for name, (commits_, lines) in top_authors[:TOP_AUTHORS]
+        ],
+    }
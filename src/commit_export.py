@@ -0,0 +1,219 @@
+"""
+Exportación por commit (una fila por commit) a NDJSON, CSV o Parquet.
+
+Las filas salen del CommitStore por bloques de chunk_size commits: cada
+bloque se arma en columnas a partir de cortes de los arrays CSR y se
+escribe antes de pasar al siguiente, así que la memoria no crece con el
+tamaño de la historia. NDJSON y CSV se pueden comprimir con gzip, bz2 o
+xz (por extensión o con compression); Parquet se escribe por row groups
+con pyarrow y usa su propia compresión (snappy, gzip, zstd...).
+
+Columnas: hash, parents, type, level, children, on_critical_path y, si
+están cargadas, timestamp y las líneas añadidas/borradas del churn.
+"""
+
+import bz2
+import csv
+import gzip
+import lzma
+import os
+from array import array
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .commit_store import INDEX_TYPECODE, TYPE_NAMES, CommitStore
+
+DEFAULT_CHUNK_SIZE = 65536
+
+FORMATS = ("ndjson", "csv", "parquet")
+FORMAT_SUFFIXES = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+
+TEXT_COMPRESSION = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+
+def detect_format(path: str, compression: Optional[str] = None):
+    """Formato y compresión según la extensión (p. ej. commits.csv.gz)."""
+    suffixes = Path(path).suffixes
+    if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        compression = compression or COMPRESSION_SUFFIXES[suffixes[-1]]
+        suffixes = suffixes[:-1]
+    fmt = FORMAT_SUFFIXES.get(suffixes[-1]) if suffixes else None
+    return fmt, compression
+
+
+def iter_commit_chunks(
+    store: CommitStore,
+    critical_ids: Sequence[int] = (),
+    churn=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict[str, List[Any]]]:
+    """Bloques columnares de como mucho chunk_size commits, en orden de id."""
+    if chunk_size < 1:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+    store.resolve()
+    n = len(store)
+
+    critical = bytearray(n)
+    for commit in critical_ids:
+        critical[commit] = 1
+
+    added = deleted = None
+    if churn is not None:
+        # Alinear los contadores (ordenados por shard) con los ids
+        added = array(INDEX_TYPECODE, bytes(8 * n))
+        deleted = array(INDEX_TYPECODE, bytes(8 * n))
+        for commit, plus, minus in zip(churn.ids, churn.added, churn.deleted):
+            added[commit] = plus
+            deleted[commit] = minus
+
+    parent_offsets = store.parent_offsets
+    child_offsets = store.child_offsets
+    # Sin commits se emite un bloque vacío (cabecera CSV, esquema Parquet)
+    for start in range(0, max(n, 1), chunk_size):
+        end = min(start + chunk_size, n)
+        stop = end + 1
+        parents = parent_offsets[start:stop]
+        children = child_offsets[start:stop]
+        chunk = {
+            "hash": list(store.hashes[start:end]),
+            "parents": [
+                parents[k + 1] - parents[k] for k in range(end - start)
+            ],
+            "type": [TYPE_NAMES[code] for code in store.types[start:end]],
+            "level": list(store.levels[start:end]),
+            "children": [
+                children[k + 1] - children[k] for k in range(end - start)
+            ],
+            "on_critical_path": [bool(flag) for flag in critical[start:end]],
+        }
+        if store.timestamps is not None:
+            chunk["timestamp"] = list(store.timestamps[start:end])
+        if added is not None:
+            chunk["lines_added"] = added[start:end].tolist()
+            chunk["lines_deleted"] = deleted[start:end].tolist()
+        yield chunk
+
+
+def _json_column(values: List[Any]) -> List[str]:
+    """Valores de una columna ya codificados como JSON."""
+    if values and isinstance(values[0], bool):
+        return ["true" if value else "false" for value in values]
+    if values and isinstance(values[0], str):
+        return list(map(encode_basestring, values))
+    return list(map(str, values))
+
+
+def _write_ndjson(chunks: Iterator[Dict[str, List[Any]]], f) -> int:
+    rows = 0
+    for chunk in chunks:
+        # Codificar por columnas y unir con una plantilla: evita un dict y
+        # un json.dumps por fila
+        template = (
+            "{"
+            + ", ".join(f"{encode_basestring(name)}: %s" for name in chunk)
+            + "}\n"
+        )
+        columns = [_json_column(values) for values in chunk.values()]
+        f.write("".join(template % row for row in zip(*columns)))
+        rows += len(chunk["hash"])
+    return rows
+
+
+def _write_csv(chunks: Iterator[Dict[str, List[Any]]], f) -> int:
+    writer = csv.writer(f, lineterminator="\n")
+    rows = 0
+    for position, chunk in enumerate(chunks):
+        if position == 0:
+            writer.writerow(chunk)
+        writer.writerows(zip(*chunk.values()))
+        rows += len(chunk["hash"])
+    return rows
+
+
+def _write_parquet(
+    chunks: Iterator[Dict[str, List[Any]]],
+    path: Path,
+    compression: Optional[str],
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError(
+            "La exportación a Parquet requiere pyarrow"
+        ) from None
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.table(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    str(path),
+                    table.schema,
+                    compression=compression or "snappy",
+                )
+            # Un row group por bloque
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export_commits(
+    store: CommitStore,
+    output_path: str,
+    fmt: Optional[str] = None,
+    compression: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    critical_ids: Sequence[int] = (),
+    churn=None,
+) -> int:
+    """
+    Escribir una fila por commit en output_path y retornar las filas.
+
+    fmt y compression se deducen de la extensión si no se indican. El
+    archivo se escribe en un temporal y se publica con rename.
+    """
+    detected, compression = detect_format(output_path, compression)
+    fmt = fmt or detected
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt} ({', '.join(FORMATS)})")
+    if fmt != "parquet" and compression not in (
+        None,
+        "none",
+        *TEXT_COMPRESSION,
+    ):
+        raise ValueError(f"Compresión no soportada para {fmt}: {compression}")
+
+    chunks = iter_commit_chunks(store, critical_ids, churn, chunk_size)
+    path = Path(output_path)
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        if fmt == "parquet":
+            rows = _write_parquet(chunks, tmp_path, compression)
+        else:
+            opener = TEXT_COMPRESSION.get(compression, open)
+            newline = "" if fmt == "csv" else None
+            with opener(
+                tmp_path, "wt", encoding="utf-8", newline=newline
+            ) as f:
+                if fmt == "csv":
+                    rows = _write_csv(chunks, f)
+                else:
+                    rows = _write_ndjson(chunks, f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return rows
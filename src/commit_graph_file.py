@@ -0,0 +1,273 @@
+"""
+Lector del archivo commit-graph de Git (objects/info/commit-graph o la
+cadena objects/info/commit-graphs/commit-graph-chain).
+
+Formato: https://git-scm.com/docs/gitformat-commit-graph
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .lazy import optional_module
+
+np = optional_module("numpy")
+
+SIGNATURE = b"CGPH"
+HASH_LENGTHS = {1: 20, 2: 32}  # SHA-1, SHA-256
+
+CHUNK_OID_FANOUT = b"OIDF"
+CHUNK_OID_LOOKUP = b"OIDL"
+CHUNK_COMMIT_DATA = b"CDAT"
+CHUNK_EXTRA_EDGES = b"EDGE"
+
+PARENT_NONE = 0x70000000
+EDGE_FLAG = 0x80000000  # en p2: índice a EDGE; en EDGE: última arista
+POSITION_MASK = 0x7FFFFFFF
+
+
+class CommitGraphError(ValueError):
+    """Archivo commit-graph inválido o no soportado."""
+
+
+class CommitGraphLayer:
+    """Una capa commit-graph mapeada en memoria."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self._mmap)
+
+        try:
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self) -> None:
+        """Leer cabecera y tabla de chunks."""
+        signature, version, hash_version, num_chunks, _ = struct.unpack_from(
+            ">4sBBBB", self.buffer, 0
+        )
+        if signature != SIGNATURE or version != 1:
+            raise CommitGraphError(
+                f"{self.path}: cabecera commit-graph inválida"
+            )
+        if hash_version not in HASH_LENGTHS:
+            raise CommitGraphError(f"{self.path}: hash version {hash_version}")
+        self.hash_length = HASH_LENGTHS[hash_version]
+
+        # Tabla de chunks: (id, offset); la entrada final marca el fin
+        entries = [
+            struct.unpack_from(">4sQ", self.buffer, 8 + 12 * i)
+            for i in range(num_chunks + 1)
+        ]
+        self.chunks: Dict[bytes, memoryview] = {}
+        for (chunk_id, start), (_, end) in zip(entries, entries[1:]):
+            self.chunks[chunk_id] = self.buffer[start:end]
+
+        for required in (
+            CHUNK_OID_FANOUT,
+            CHUNK_OID_LOOKUP,
+            CHUNK_COMMIT_DATA,
+        ):
+            if required not in self.chunks:
+                raise CommitGraphError(
+                    f"{self.path}: falta el chunk {required!r}"
+                )
+
+        self.num_commits = struct.unpack_from(
+            ">I", self.chunks[CHUNK_OID_FANOUT], 4 * 255
+        )[0]
+        self.record = struct.Struct(f">{self.hash_length}xIIII")
+
+    def oids(self) -> List[str]:
+        """Hashes en hexadecimal, en orden de posición."""
+        step = 2 * self.hash_length
+        text = self.chunks[CHUNK_OID_LOOKUP].hex()
+        size = len(text)
+        bounds = map(
+            slice, range(0, size, step), range(step, size + step, step)
+        )
+        return list(map(text.__getitem__, bounds))
+
+    def extra_parents(self, index: int) -> List[int]:
+        """Padres 2..n de un merge octopus desde el chunk EDGE."""
+        edges = self.chunks.get(CHUNK_EXTRA_EDGES)
+        if edges is None:
+            raise CommitGraphError(f"{self.path}: falta el chunk EDGE")
+
+        parents = []
+        while True:
+            value = struct.unpack_from(">I", edges, 4 * index)[0]
+            parents.append(value & POSITION_MASK)
+            if value & EDGE_FLAG:
+                return parents
+            index += 1
+
+    def iter_records(self) -> Iterator[Tuple[int, int, int, int]]:
+        """(p1, p2, generación+bits altos de fecha, fecha baja) por commit."""
+        return self.record.iter_unpack(self.chunks[CHUNK_COMMIT_DATA])
+
+    def parents(self, p1: int, p2: int) -> List[int]:
+        """Decodificar las posiciones de los padres de un registro CDAT."""
+        if p1 == PARENT_NONE:
+            return []
+        if p2 == PARENT_NONE:
+            return [p1]
+        if p2 & EDGE_FLAG:
+            return [p1] + self.extra_parents(p2 & POSITION_MASK)
+        return [p1, p2]
+
+    def close(self) -> None:
+        """Liberar el mapeo del archivo."""
+        self.chunks = {}
+        self.buffer.release()
+        self._mmap.close()
+
+
+class CommitGraph:
+    """Commit-graph completo: una capa o una cadena de capas (base primero)."""
+
+    def __init__(self, layers: List[CommitGraphLayer]):
+        self.layers = layers
+
+    @classmethod
+    def open(cls, objects_dir: Path) -> Optional["CommitGraph"]:
+        """Abrir el commit-graph de un directorio objects/ (None si no hay)."""
+        info = Path(objects_dir) / "info"
+        chain = info / "commit-graphs" / "commit-graph-chain"
+        if chain.is_file():
+            names = chain.read_text().split()
+            paths = [
+                info / "commit-graphs" / f"graph-{name}.graph"
+                for name in names
+            ]
+        elif (info / "commit-graph").is_file():
+            paths = [info / "commit-graph"]
+        else:
+            return None
+
+        layers = []
+        try:
+            for path in paths:
+                layers.append(CommitGraphLayer(path))
+        except (OSError, ValueError, struct.error):
+            for layer in layers:
+                layer.close()
+            return None
+        return cls(layers)
+
+    def __len__(self) -> int:
+        return sum(layer.num_commits for layer in self.layers)
+
+    def oids(self) -> List[str]:
+        """Hashes de todas las capas; el índice es la posición global."""
+        oids = []
+        for layer in self.layers:
+            oids.extend(layer.oids())
+        return oids
+
+    def parent_csr(self) -> Tuple[object, object]:
+        """
+        Padres en formato CSR (offsets, ids) usando posiciones globales.
+
+        Con NumPy los registros CDAT se leen como vista sin copia del mmap.
+        """
+        if np is not None:
+            return self._parent_csr_numpy()
+
+        offsets = [0]
+        parent_ids: List[int] = []
+        for layer in self.layers:
+            for p1, p2, _, _ in layer.iter_records():
+                parent_ids.extend(layer.parents(p1, p2))
+                offsets.append(len(parent_ids))
+        return offsets, parent_ids
+
+    def _parent_csr_numpy(self) -> Tuple[object, object]:
+        """Versión vectorizada de parent_csr."""
+        counts_list = []
+        firsts = []
+        seconds = []
+        octopus = {}
+        base = 0
+        for layer in self.layers:
+            dtype = np.dtype(
+                [
+                    ("oid", f"V{layer.hash_length}"),
+                    ("p1", ">u4"),
+                    ("p2", ">u4"),
+                    ("gen", ">u4"),
+                    ("time", ">u4"),
+                ]
+            )
+            records = np.frombuffer(
+                layer.chunks[CHUNK_COMMIT_DATA],
+                dtype=dtype,
+                count=layer.num_commits,
+            )
+            p1 = records["p1"].astype(np.int64)
+            p2 = records["p2"].astype(np.int64)
+
+            has_first = p1 != PARENT_NONE
+            has_second = has_first & (p2 != PARENT_NONE)
+            is_octopus = has_second & ((p2 & EDGE_FLAG) != 0)
+
+            counts = has_first.astype(np.int64) + has_second
+            for index in np.flatnonzero(is_octopus):
+                extra = layer.extra_parents(int(p2[index]) & POSITION_MASK)
+                octopus[base + int(index)] = extra
+                counts[index] = 1 + len(extra)
+
+            counts_list.append(counts)
+            firsts.append(np.where(has_first, p1, -1))
+            seconds.append(np.where(has_second & ~is_octopus, p2, -1))
+            base += layer.num_commits
+
+        counts = (
+            np.concatenate(counts_list)
+            if counts_list
+            else np.zeros(0, np.int64)
+        )
+        first = np.concatenate(firsts) if firsts else counts
+        second = np.concatenate(seconds) if seconds else counts
+
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        parent_ids = np.empty(int(offsets[-1]), dtype=np.int64)
+
+        starts = offsets[:-1]
+        parent_ids[starts[first >= 0]] = first[first >= 0]
+        parent_ids[starts[second >= 0] + 1] = second[second >= 0]
+        for index, extra in octopus.items():
+            begin = starts[index] + 1
+            end = begin + len(extra)
+            parent_ids[begin:end] = extra
+        return offsets, parent_ids
+
+    def timestamps(self) -> List[int]:
+        """Fecha de commit (epoch, 34 bits) de cada commit."""
+        timestamps = []
+        for layer in self.layers:
+            timestamps.extend(
+                ((gen & 3) << 32) | time
+                for _, _, gen, time in layer.iter_records()
+            )
+        return timestamps
+
+    def generations(self) -> List[int]:
+        """Número de generación topológica (v1) de cada commit."""
+        generations = []
+        for layer in self.layers:
+            generations.extend(
+                gen >> 2 for _, _, gen, _ in layer.iter_records()
+            )
+        return generations
+
+    def close(self) -> None:
+        """Cerrar todas las capas."""
+        for layer in self.layers:
+            layer.close()
@@ -0,0 +1,481 @@
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .lazy import optional_module
+
+# NumPy (opcional) se importa en el primer uso
+np = optional_module("numpy")
+
+# Códigos de tipo de commit guardados en un byte por commit
+ROOT = 0
+FAST_FORWARD = 1
+MERGE = 2
+UNKNOWN = 3
+TYPE_NAMES = ("root", "fast-forward", "merge", "unknown")
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+# Typecode de los arrays de offsets e índices (entero con signo de 64 bits)
+INDEX_TYPECODE = "q"
+
+# A partir de este número de aristas se usa NumPy si está disponible
+NUMPY_MIN_EDGES = 50_000
+
+
+def type_code(parent_count: int) -> int:
+    """Tipo de commit según su número de padres."""
+    if parent_count == 0:
+        return ROOT
+    if parent_count == 1:
+        return FAST_FORWARD
+    return MERGE
+
+
+class CommitStore:
+    """
+    Almacén compacto de commits.
+
+    Los hashes se internan a ids enteros densos (0..n-1, en orden de carga).
+    Padres e hijos se guardan en formato CSR (offsets + índices) y los tipos
+    en un bytearray. Un padre que todavía no se ha cargado se referencia con
+    un id negativo (-k-1 -> external_hashes[k]) hasta que aparece su línea.
+    """
+
+    def __init__(self):
+        self.hashes: Sequence[str] = []
+        self._index: Optional[Dict[str, int]] = {}
+        self.types = bytearray()
+        self.levels = array(INDEX_TYPECODE)
+        self.timestamps: Optional[array] = (
+            None  # fecha de commit (epoch), si se cargó
+        )
+        self.parent_offsets = array(INDEX_TYPECODE, [0])
+        self.parent_ids = array(INDEX_TYPECODE)
+        self.external_hashes: List[str] = []
+        self._external_index: Dict[str, int] = {}
+        self._resolved: Dict[int, int] = {}
+        self._child_offsets: Optional[array] = None
+        self._child_ids: Optional[array] = None
+        # Dueño del buffer si las columnas son vistas de un snapshot mapeado
+        self._mapping: Any = None
+
+    @classmethod
+    def from_mapping(cls, commits: Mapping) -> "CommitStore":
+        """Construir el almacén desde un dict commit_hash -> commit_info."""
+        store = cls()
+        for commit_hash, info in commits.items():
+            parents = info.get("parents", [])
+            code = TYPE_CODES.get(info.get("type"))
+            store.add_commit(commit_hash, parents, code)
+        store.resolve()
+        return store
+
+    @classmethod
+    def from_arrays(
+        cls,
+        hashes: List[str],
+        parent_offsets: Sequence[int],
+        parent_ids: Sequence[int],
+    ) -> "CommitStore":
+        """Construir el almacén desde columnas ya decodificadas."""
+        store = cls()
+        store.hashes = hashes
+        store.index = {commit: i for i, commit in enumerate(hashes)}
+        store.parent_offsets = as_index_array(parent_offsets)
+        store.parent_ids = as_index_array(parent_ids)
+
+        offsets = store.parent_offsets
+        store.types = bytearray(
+            ROOT if offsets[i + 1] == offsets[i] else UNKNOWN
+            for i in range(len(hashes))
+        )
+        store.levels = array(INDEX_TYPECODE, [-1]) * len(hashes)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Dict hash -> id (bajo demanda si se cargó de un snapshot)."""
+        if self._index is None:
+            self._index = {commit: i for i, commit in enumerate(self.hashes)}
+        return self._index
+
+    @index.setter
+    def index(self, value: Optional[Dict[str, int]]) -> None:
+        self._index = value
+
+    def detach(self) -> None:
+        """
+        Copiar a memoria propia las columnas que son vistas de un snapshot
+        y cerrar el mapeo, para que el archivo pueda reemplazarse.
+        """
+        if self._mapping is None:
+            return
+        self.hashes = list(self.hashes)
+        self.parent_offsets = as_index_array(self.parent_offsets)
+        self.parent_ids = as_index_array(self.parent_ids)
+        self.levels = as_index_array(self.levels)
+        if self.timestamps is not None:
+            self.timestamps = as_index_array(self.timestamps)
+        if self._child_offsets is not None:
+            self._child_offsets = as_index_array(self._child_offsets)
+            self._child_ids = as_index_array(self._child_ids)
+        mapping, self._mapping = self._mapping, None
+        try:
+            mapping.close()
+        except BufferError:
+            # Quedan vistas vivas fuera del store: se libera con la última
+            pass
+
+    def add_commit(
+        self,
+        commit: str,
+        parents: Sequence[str],
+        code: Optional[int] = None,
+        timestamp: Optional[int] = None,
+    ) -> int:
+        """Añadir un commit con sus padres (y su fecha). Retorna su id."""
+        commit_id = self.index.get(commit)
+        if commit_id is not None:
+            return commit_id
+
+        if self._mapping is not None:
+            self.detach()
+        commit_id = len(self.hashes)
+        external = self._external_index.pop(commit, None)
+        if external is not None:
+            # Reusar el str ya internado y recordar la referencia pendiente
+            commit = self.external_hashes[-external - 1]
+            self._resolved[external] = commit_id
+
+        self.hashes.append(commit)
+        self.index[commit] = commit_id
+        if timestamp is not None and self.timestamps is None:
+            self.timestamps = array(INDEX_TYPECODE, bytes(8 * commit_id))
+        if self.timestamps is not None:
+            self.timestamps.append(timestamp or 0)
+
+        for parent in parents:
+            self.parent_ids.append(self._parent_id(parent))
+        self.parent_offsets.append(len(self.parent_ids))
+
+        if code is None:
+            code = ROOT if not parents else UNKNOWN
+        self.types.append(code)
+        self.levels.append(-1)
+        self._child_offsets = self._child_ids = None
+        return commit_id
+
+    def _parent_id(self, parent: str) -> int:
+        """Id de un padre, o id externo negativo si aún no se ha cargado."""
+        parent_id = self.index.get(parent)
+        if parent_id is None:
+            parent_id = self._external_index.get(parent)
+            if parent_id is None:
+                self.external_hashes.append(parent)
+                parent_id = -len(self.external_hashes)
+                self._external_index[parent] = parent_id
+        return parent_id
+
+    def resolve(self) -> None:
+        """Sustituir ids externos por ids reales de commits ya cargados."""
+        if not self._resolved:
+            return
+
+        # Tabla externo -> nuevo id (real o externo renumerado)
+        remap = array(INDEX_TYPECODE, bytes(8 * len(self.external_hashes)))
+        externals = []
+        for k, commit in enumerate(self.external_hashes):
+            new_id = self._resolved.get(-k - 1)
+            if new_id is None:
+                externals.append(commit)
+                new_id = -len(externals)
+            remap[k] = new_id
+
+        parent_ids = self.parent_ids
+        if np is not None and len(parent_ids) >= NUMPY_MIN_EDGES:
+            ids = np.frombuffer(parent_ids, dtype=np.int64)
+            negative = ids < 0
+            ids[negative] = np.frombuffer(remap, dtype=np.int64)[
+                -ids[negative] - 1
+            ]
+        else:
+            for k, parent_id in enumerate(parent_ids):
+                if parent_id < 0:
+                    parent_ids[k] = remap[-parent_id - 1]
+
+        self.external_hashes = externals
+        self._external_index = {
+            commit: -k - 1 for k, commit in enumerate(externals)
+        }
+        self._resolved.clear()
+        self._child_offsets = self._child_ids = None
+
+    def hash_of(self, commit_id: int) -> str:
+        """Hash de un id (real o externo)."""
+        if commit_id < 0:
+            return self.external_hashes[-commit_id - 1]
+        return self.hashes[commit_id]
+
+    def parents(self, commit_id: int) -> array:
+        """Ids de los padres (negativos si están fuera de la carga)."""
+        offsets = self.parent_offsets
+        start, stop = offsets[commit_id], offsets[commit_id + 1]
+        return self.parent_ids[start:stop]
+
+    def parent_count(self, commit_id: int) -> int:
+        """Número de padres, incluidos los que están fuera de la carga."""
+        return (
+            self.parent_offsets[commit_id + 1] - self.parent_offsets[commit_id]
+        )
+
+    @property
+    def child_offsets(self) -> array:
+        """Offsets CSR de hijos, construidos bajo demanda."""
+        if self._child_offsets is None:
+            self.build_children()
+        return self._child_offsets
+
+    @property
+    def child_ids(self) -> array:
+        """Índices CSR de hijos, construidos bajo demanda."""
+        if self._child_ids is None:
+            self.build_children()
+        return self._child_ids
+
+    def children(self, commit_id: int) -> array:
+        """Ids de los hijos cargados de un commit."""
+        offsets = self.child_offsets
+        start, stop = offsets[commit_id], offsets[commit_id + 1]
+        return self.child_ids[start:stop]
+
+    def build_children(self) -> None:
+        """Invertir el CSR de padres para obtener el CSR de hijos."""
+        self.resolve()
+        if self._child_offsets is not None:
+            return
+        n = len(self.hashes)
+        if np is not None and len(self.parent_ids) >= NUMPY_MIN_EDGES:
+            self._build_children_numpy(n)
+            return
+
+        counts = array(INDEX_TYPECODE, bytes(8 * (n + 1)))
+        for parent_id in self.parent_ids:
+            if parent_id >= 0:
+                counts[parent_id + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+
+        child_ids = array(INDEX_TYPECODE, bytes(8 * counts[n]))
+        cursor = array(INDEX_TYPECODE, counts[:n])
+        offsets = self.parent_offsets
+        parent_ids = self.parent_ids
+        for child in range(n):
+            for k in range(offsets[child], offsets[child + 1]):
+                parent_id = parent_ids[k]
+                if parent_id >= 0:
+                    child_ids[cursor[parent_id]] = child
+                    cursor[parent_id] += 1
+
+        self._child_offsets = counts
+        self._child_ids = child_ids
+
+    def _build_children_numpy(self, n: int) -> None:
+        """Versión vectorizada de build_children."""
+        parent_ids = np.frombuffer(self.parent_ids, dtype=np.int64)
+        offsets = np.frombuffer(self.parent_offsets, dtype=np.int64)
+        child_of_edge = np.repeat(
+            np.arange(n, dtype=np.int64), np.diff(offsets)
+        )
+
+        known = parent_ids >= 0
+        parents = parent_ids[known]
+        children = child_of_edge[known]
+        order = np.argsort(parents, kind="stable")
+
+        counts = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents, minlength=n), out=counts[1:])
+
+        self._child_offsets = array(INDEX_TYPECODE, counts.tobytes())
+        self._child_ids = array(INDEX_TYPECODE, children[order].tobytes())
+
+    def iter_edges(self) -> Iterator[tuple]:
+        """Aristas (padre, hijo) entre commits cargados, como hashes."""
+        hashes = self.hashes
+        offsets = self.parent_offsets
+        parent_ids = self.parent_ids
+        for child in range(len(hashes)):
+            for k in range(offsets[child], offsets[child + 1]):
+                parent_id = parent_ids[k]
+                if parent_id >= 0:
+                    yield hashes[parent_id], hashes[child]
+
+    def roots(self) -> List[int]:
+        """Commits sin padres cargados."""
+        offsets = self.parent_offsets
+        parent_ids = self.parent_ids
+        return [
+            i
+            for i in range(len(self.hashes))
+            if all(
+                parent_ids[k] < 0 for k in range(offsets[i], offsets[i + 1])
+            )
+        ]
+
+    def boundary(self) -> List[int]:
+        """Commits con algún padre no cargado (borde de una ventana)."""
+        offsets = self.parent_offsets
+        parent_ids = self.parent_ids
+        return [
+            i
+            for i in range(len(self.hashes))
+            if any(
+                parent_ids[k] < 0 for k in range(offsets[i], offsets[i + 1])
+            )
+        ]
+
+    def leaves(self) -> List[int]:
+        """Commits sin hijos cargados (tips del DAG)."""
+        offsets = self.child_offsets
+        return [
+            i for i in range(len(self.hashes)) if offsets[i + 1] == offsets[i]
+        ]
+
+    def subset(self, keep: Sequence[int]) -> "CommitStore":
+        """
+        Almacén con los commits marcados en keep (un flag por id), en el
+        mismo orden. keep debe incluir los padres cargados de cada commit
+        conservado; tipos y niveles quedan por recalcular.
+        """
+        remap = array(INDEX_TYPECODE, [-1]) * len(self.hashes)
+        hashes = []
+        for commit_id, flag in enumerate(keep):
+            if flag:
+                remap[commit_id] = len(hashes)
+                hashes.append(self.hashes[commit_id])
+
+        offsets = self.parent_offsets
+        parent_ids = array(INDEX_TYPECODE)
+        parent_offsets = array(INDEX_TYPECODE, [0])
+        for commit_id, flag in enumerate(keep):
+            if not flag:
+                continue
+            for k in range(offsets[commit_id], offsets[commit_id + 1]):
+                parent_id = self.parent_ids[k]
+                if parent_id >= 0:
+                    parent_id = remap[parent_id]
+                    if parent_id < 0:
+                        raise ValueError(
+                            "El subconjunto no incluye a todos los padres"
+                        )
+                parent_ids.append(parent_id)
+            parent_offsets.append(len(parent_ids))
+
+        store = CommitStore.from_arrays(hashes, parent_offsets, parent_ids)
+        store.external_hashes = list(self.external_hashes)
+        store._external_index = dict(self._external_index)
+        if self.timestamps is not None:
+            store.timestamps = array(
+                INDEX_TYPECODE,
+                (
+                    timestamp
+                    for timestamp, flag in zip(self.timestamps, keep)
+                    if flag
+                ),
+            )
+        return store
+
+    def count_type(self, code: int) -> int:
+        """Número de commits de un tipo."""
+        return self.types.count(code)
+
+    def commit_info(self, commit_id: int) -> Dict[str, Any]:
+        """Dict con el formato histórico de commit_info."""
+        return {
+            "hash": self.hashes[commit_id],
+            "parents": [self.hash_of(p) for p in self.parents(commit_id)],
+            "children": [self.hashes[c] for c in self.children(commit_id)],
+            "type": TYPE_NAMES[self.types[commit_id]],
+        }
+
+
+class CsrAdjacency(NamedTuple):
+    """Adyacencia padre -> hijo en CSR cuando SciPy no está disponible."""
+
+    indptr: Any
+    indices: Any
+    shape: Tuple[int, int]
+
+
+def as_index_array(values: Sequence[int]) -> array:
+    """Convertir lista, array, memoryview o ndarray a array de índices."""
+    if isinstance(values, array) and values.typecode == INDEX_TYPECODE:
+        return values
+    if isinstance(values, memoryview) and values.format == INDEX_TYPECODE:
+        return array(INDEX_TYPECODE, values.tobytes())
+    # Un ndarray solo puede existir si NumPy ya se importó
+    if "numpy" in sys.modules and isinstance(values, np.ndarray):
+        return array(INDEX_TYPECODE, values.astype(np.int64).tobytes())
+    return array(INDEX_TYPECODE, values)
+
+
+class CommitsView(Mapping):
+    """Vista de solo lectura commit_hash -> commit_info de un CommitStore."""
+
+    def __init__(self, store: CommitStore):
+        self._store = store
+
+    def __getitem__(self, commit: str) -> Dict[str, Any]:
+        return self._store.commit_info(self._store.index[commit])
+
+    def __contains__(self, commit: object) -> bool:
+        return commit in self._store.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.hashes)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class LevelsView(Mapping):
+    """Vista de solo lectura commit_hash -> nivel sobre un CommitStore."""
+
+    def __init__(self, store: CommitStore):
+        self._store = store
+
+    def __getitem__(self, commit: str) -> int:
+        level = self._store.levels[self._store.index[commit]]
+        if level < 0:
+            raise KeyError(commit)
+        return level
+
+    def __iter__(self) -> Iterator[str]:
+        hashes = self._store.hashes
+        return (
+            hashes[i]
+            for i, level in enumerate(self._store.levels)
+            if level >= 0
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for level in self._store.levels if level >= 0)
+
+
+def assign_levels(store: CommitStore, levels: Mapping) -> None:
+    """Copiar un dict commit_hash -> nivel al array de niveles del almacén."""
+    store.levels = array(INDEX_TYPECODE, [-1]) * len(store)
+    for commit, level in levels.items():
+        store.levels[store.index[commit]] = level
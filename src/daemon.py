@@ -0,0 +1,441 @@
+"""
+Servidor de análisis: mantiene los DAG cargados en memoria y responde
+consultas por un socket Unix (o TCP en localhost) con asyncio.
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea.
+
+    {"id": 1, "op": "metrics", "repo": "/srv/git/app"}
+    {"id": 1, "ok": true, "result": {...}}
+
+Operaciones: ping, repos, metrics, metric (name, params), critical_path
+(targets), is_ancestor (ancestor, descendant), merge_base (first, second),
+commits_between (start, end) y reload. "repo" puede omitirse si el
+servidor sirve un único repositorio.
+
+Las refs (sueltas, packed-refs y HEAD) se vigilan por sondeo; si cambian,
+el DAG se actualiza con load_incremental a partir del snapshot propio.
+
+Uso:
+    python -m src.daemon serve --repo . --socket /tmp/git-graph.sock
+    python -m src.daemon query --socket /tmp/git-graph.sock '{"op": "metrics"}'
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .git_files import find_git_dir, read_refs, ref_candidates
+from .graph_anaylisis import GitGraphAnalyzer
+from .profiling import Profiler
+from .snapshot import snapshot_path_for
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_HOST = "127.0.0.1"
+
+# Las respuestas (p. ej. rutas críticas largas) pueden ocupar varios MB
+STREAM_LIMIT = 1 << 26
+
+
+class DaemonError(Exception):
+    """Petición inválida para el servidor."""
+
+
+class RepoState:
+    """Un repositorio cargado: analizador, refs vistas y lock de acceso."""
+
+    def __init__(self, path: str, cache_dir: str):
+        self.path = path
+        self.analyzer = GitGraphAnalyzer(path)
+        self.git_dir = find_git_dir(path)
+        self.snapshot = snapshot_path_for(path, "daemon", cache_dir)
+        self.refs: Dict[str, str] = {}
+        self.lock = asyncio.Lock()
+        self.reloads = 0
+        self._metrics: Optional[Tuple[Any, Dict[str, Any]]] = None
+        self._load_events = 0
+
+    def current_refs(self) -> Dict[str, str]:
+        """Refs leídas directamente de disco (sin subprocesos)."""
+        return read_refs(self.git_dir) if self.git_dir is not None else {}
+
+    def commit(self, revision: str) -> str:
+        """
+        Hash de un commit o ref usando las refs ya leídas de disco, para no
+        lanzar git en cada consulta. Si no se encuentra (p. ej. tags anotados
+        sueltos o expresiones como HEAD~1) se deja que el analizador resuelva.
+        """
+        index = self.analyzer._store.index
+        for name in ref_candidates(revision):
+            sha = self.refs.get(name)
+            if sha is not None and sha in index:
+                return sha
+        return revision
+
+    def metrics(self) -> Dict[str, Any]:
+        """Documento de métricas, reutilizado mientras el grafo no cambie."""
+        analyzer = self.analyzer
+        # El documento solo depende del grafo y de la ruta crítica exportada
+        critical_name, critical_params = analyzer.critical_path_request()
+        key = (
+            analyzer.graph_version,
+            critical_name,
+            json.dumps(critical_params, sort_keys=True, default=str),
+        )
+        if self._metrics is None or self._metrics[0] != key:
+            self._metrics = (key, analyzer.collect_metrics())
+        return self._metrics[1]
+
+    def load(self) -> bool:
+        """Cargar o actualizar el DAG. Retorna True si fue incremental."""
+        refs = self.current_refs()
+        # Perfilador nuevo por recarga: el de la anterior acumularía eventos
+        # durante toda la vida del servidor
+        self.analyzer.profiler = Profiler()
+        incremental = self.analyzer.load_incremental(self.snapshot)
+        self._load_events = len(self.analyzer.profiler.events)
+        self.refs = refs
+        self.reloads += 1
+        return incremental
+
+    def run(
+        self,
+        operation: Callable[["RepoState", Dict[str, Any]], Any],
+        params: Dict[str, Any],
+    ) -> Any:
+        """
+        Ejecutar una operación conservando en el perfil solo la última carga:
+        los eventos de consultas anteriores se descartan.
+        """
+        self.analyzer.profiler.truncate(self._load_events)
+        return operation(self, params)
+
+
+def _op_metrics(state: RepoState, params: Dict[str, Any]) -> Any:
+    return state.metrics()
+
+
+def _op_metric(state: RepoState, params: Dict[str, Any]) -> Any:
+    return state.analyzer.metric_engine.compute(
+        params["name"], **params.get("params", {})
+    )
+
+
+def _op_critical_path(state: RepoState, params: Dict[str, Any]) -> Any:
+    return state.analyzer.find_critical_merge_paths(
+        params.get("targets", ["v0.0.0"])
+    )
+
+
+def _op_is_ancestor(state: RepoState, params: Dict[str, Any]) -> Any:
+    return state.analyzer.is_ancestor(
+        state.commit(params["ancestor"]), state.commit(params["descendant"])
+    )
+
+
+def _op_merge_base(state: RepoState, params: Dict[str, Any]) -> Any:
+    return state.analyzer.merge_base(
+        state.commit(params["first"]), state.commit(params["second"])
+    )
+
+
+def _op_commits_between(state: RepoState, params: Dict[str, Any]) -> Any:
+    return state.analyzer.commits_between(
+        state.commit(params["start"]), state.commit(params["end"])
+    )
+
+
+OPERATIONS: Dict[str, Callable[[RepoState, Dict[str, Any]], Any]] = {
+    "metrics": _op_metrics,
+    "metric": _op_metric,
+    "critical_path": _op_critical_path,
+    "is_ancestor": _op_is_ancestor,
+    "merge_base": _op_merge_base,
+    "commits_between": _op_commits_between,
+}
+
+
+class AnalysisServer:
+    """Servidor asyncio con uno o varios repositorios cargados."""
+
+    def __init__(
+        self,
+        repos: List[str],
+        cache_dir: Optional[str] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self._tmp = None
+        if cache_dir is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="git-graph-daemon-")
+            cache_dir = self._tmp.name
+        self.poll_interval = poll_interval
+        self.repos = {str(Path(repo).resolve()): repo for repo in repos}
+        self.states: Dict[str, RepoState] = {}
+        self.cache_dir = cache_dir
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def start(
+        self,
+        socket_path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: Optional[int] = None,
+    ) -> None:
+        """Cargar los repositorios y empezar a aceptar conexiones."""
+        loop = asyncio.get_running_loop()
+        for key, repo in self.repos.items():
+            state = self.states[key] = RepoState(repo, self.cache_dir)
+            await loop.run_in_executor(None, state.load)
+
+        if socket_path is not None and hasattr(socket, "AF_UNIX"):
+            Path(socket_path).unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path=socket_path, limit=STREAM_LIMIT
+            )
+        else:
+            # Sin sockets Unix (Windows) o con --port: TCP solo en localhost
+            self._server = await asyncio.start_server(
+                self._handle_client, host, port or 0, limit=STREAM_LIMIT
+            )
+        self._watcher = asyncio.create_task(self._watch_refs())
+
+    @property
+    def address(self) -> Any:
+        """Ruta del socket Unix o (host, puerto) TCP."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Detener el vigilante y el servidor."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+    async def _watch_refs(self) -> None:
+        """Sondear las refs de cada repositorio y recargar si cambian."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for state in self.states.values():
+                try:
+                    refs = await loop.run_in_executor(None, state.current_refs)
+                    if refs != state.refs:
+                        await self._reload(state)
+                except Exception as e:
+                    print(
+                        f"Error al actualizar {state.path}: {e}",
+                        file=sys.stderr,
+                    )
+
+    async def _reload(self, state: RepoState) -> bool:
+        async with state.lock:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, state.load
+            )
+
+    def _state_for(self, repo: Optional[str]) -> RepoState:
+        if repo is None:
+            if len(self.states) != 1:
+                raise DaemonError(
+                    "Falta 'repo': el servidor tiene varios repositorios"
+                )
+            return next(iter(self.states.values()))
+
+        state = self.states.get(str(Path(repo).resolve()))
+        if state is None:
+            raise DaemonError(f"Repositorio no cargado: {repo}")
+        return state
+
+    async def dispatch(self, request: Dict[str, Any]) -> Any:
+        """Ejecutar una petición y retornar su resultado."""
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "repos":
+            return {
+                state.path: {
+                    "commits": len(state.analyzer.commits),
+                    "reloads": state.reloads,
+                }
+                for state in self.states.values()
+            }
+
+        state = self._state_for(request.get("repo"))
+        if op == "reload":
+            return {"incremental": await self._reload(state)}
+
+        operation = OPERATIONS.get(op)
+        if operation is None:
+            raise DaemonError(f"Operación desconocida: {op}")
+        async with state.lock:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, state.run, operation, request
+            )
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                response: Dict[str, Any] = {}
+                try:
+                    request = json.loads(line)
+                    response["id"] = request.get("id")
+                    response["result"] = await self.dispatch(request)
+                    response["ok"] = True
+                except Exception as e:
+                    # Cualquier fallo de una petición (p. ej. TypeError por
+                    # parámetros inesperados) se responde sin cerrar la
+                    # conexión
+                    response.update(ok=False, error=f"{type(e).__name__}: {e}")
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class DaemonClient:
+    """Cliente síncrono: una conexión persistente, una petición a la vez."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: Optional[int] = None,
+        timeout: Optional[float] = 30.0,
+    ):
+        if socket_path is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path)
+        else:
+            self._socket = socket.create_connection(
+                (host, port), timeout=timeout
+            )
+        self._file = self._socket.makefile("rb")
+        self._next_id = 0
+
+    def request(self, op: str, **params) -> Any:
+        """Enviar una petición; RuntimeError si el servidor reporta error."""
+        self._next_id += 1
+        message = {"id": self._next_id, "op": op, **params}
+        self._socket.sendall(json.dumps(message).encode() + b"\n")
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("El servidor cerró la conexión")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error"))
+        return response["result"]
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def _serve(args) -> None:
+    server = AnalysisServer(args.repo, args.cache_dir, args.poll_interval)
+    socket_path = None if args.port is not None else args.socket
+    await server.start(socket_path, args.host, args.port)
+    print(
+        f"Sirviendo {len(server.states)} repositorio(s) en {server.address}",
+        flush=True,
+    )
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src daemon",
+        description=__doc__.strip().splitlines()[0],
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser(
+        "serve", help="Cargar repositorios y atender consultas"
+    )
+    serve.add_argument(
+        "--repo",
+        action="append",
+        required=True,
+        help="Repositorio a cargar (repetible)",
+    )
+    serve.add_argument(
+        "--socket", default="git-graph.sock", help="Ruta del socket Unix"
+    )
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Usar TCP en este puerto en lugar del socket Unix",
+    )
+    serve.add_argument(
+        "--cache-dir", default=None, help="Directorio de snapshots"
+    )
+    serve.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Segundos entre comprobaciones de refs",
+    )
+
+    query = commands.add_parser(
+        "query", help="Enviar una petición JSON al servidor"
+    )
+    query.add_argument(
+        "request", help='Petición JSON, p. ej. \'{"op": "metrics"}\''
+    )
+    query.add_argument("--socket", default="git-graph.sock")
+    query.add_argument("--host", default=DEFAULT_HOST)
+    query.add_argument("--port", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    request = json.loads(args.request)
+    socket_path = None if args.port is not None else args.socket
+    try:
+        with DaemonClient(socket_path, args.host, args.port) as client:
+            result = client.request(request.pop("op"), **request)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+    print(json.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
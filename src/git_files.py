@@ -0,0 +1,132 @@
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def find_git_dir(repo_path: str) -> Optional[Path]:
+    """Directorio común de git (objects/, refs/) sin lanzar subprocesos."""
+    repo = Path(repo_path)
+    git_dir = repo / ".git"
+
+    if git_dir.is_file():
+        # Worktree o submódulo: ".git" contiene "gitdir: <ruta>"
+        content = git_dir.read_text().strip()
+        if not content.startswith("gitdir:"):
+            return None
+        git_dir = (repo / content.removeprefix("gitdir:").strip()).resolve()
+    elif not git_dir.is_dir():
+        # Repositorio bare
+        if (repo / "objects").is_dir() and (repo / "HEAD").is_file():
+            git_dir = repo
+        else:
+            return None
+
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        git_dir = (git_dir / commondir.read_text().strip()).resolve()
+    return git_dir
+
+
+def read_refs(git_dir: Path) -> Dict[str, str]:
+    """
+    Leer HEAD y las refs desde packed-refs y refs/ sueltas.
+
+    Para tags anotados empaquetados se usa el commit pelado ("^" en
+    packed-refs). Los tags anotados sueltos quedan con el sha del objeto tag.
+    """
+    refs = _read_packed_refs(git_dir / "packed-refs")
+    # Las refs sueltas tienen prioridad sobre las empaquetadas
+    refs.update(_read_loose_refs(git_dir))
+
+    head = _resolve_head(git_dir, refs)
+    if head is not None:
+        refs["HEAD"] = head
+    return refs
+
+
+def _read_packed_refs(packed: Path) -> Dict[str, str]:
+    """Refs de packed-refs, con los tags anotados pelados a su commit."""
+    refs: Dict[str, str] = {}
+    if not packed.is_file():
+        return refs
+
+    last = None
+    for line in packed.read_text().splitlines():
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("^"):
+            # Commit pelado del tag anotado de la línea anterior
+            if last is not None:
+                refs[last] = line[1:].strip()
+            continue
+        sha, _, name = line.partition(" ")
+        refs[name] = sha
+        last = name
+    return refs
+
+
+def _read_loose_refs(git_dir: Path) -> Dict[str, str]:
+    """Refs guardadas como archivos bajo refs/."""
+    refs: Dict[str, str] = {}
+    refs_dir = git_dir / "refs"
+    if not refs_dir.is_dir():
+        return refs
+
+    for path in refs_dir.rglob("*"):
+        if path.is_file():
+            sha = path.read_text().strip()
+            # Las refs simbólicas ("ref: ...") se ignoran
+            if len(sha) >= 40:
+                refs[path.relative_to(git_dir).as_posix()] = sha
+    return refs
+
+
+def peel_loose_tag(
+    git_dir: Path, sha: str, max_depth: int = 8
+) -> Optional[str]:
+    """
+    Commit al que apunta un tag anotado guardado como objeto suelto, sin
+    subprocesos. None si el objeto no es suelto o no es un tag de commit.
+    """
+    for _ in range(max_depth):
+        path = git_dir / "objects" / sha[:2] / sha[2:]
+        try:
+            data = zlib.decompress(path.read_bytes())
+        except (OSError, zlib.error):
+            return None
+        header, _, body = data.partition(b"\0")
+        if not header.startswith(b"tag "):
+            return None
+        # "object <sha>\ntype <tipo>\n..."
+        lines = body.split(b"\n", 2)
+        if len(lines) < 2 or not lines[0].startswith(b"object "):
+            return None
+        sha = lines[0].removeprefix(b"object ").decode()
+        if lines[1] == b"type commit":
+            return sha
+        if lines[1] != b"type tag":
+            return None
+    return None
+
+
+def ref_candidates(name: str) -> List[str]:
+    """Nombres completos que git probaría para un nombre corto."""
+    return [
+        name,
+        f"refs/{name}",
+        f"refs/tags/{name}",
+        f"refs/heads/{name}",
+        f"refs/remotes/{name}",
+    ]
+
+
+def _resolve_head(git_dir: Path, refs: Dict[str, str]) -> Optional[str]:
+    """Resolver HEAD (simbólico o desacoplado)."""
+    head_file = git_dir / "HEAD"
+    if not head_file.is_file():
+        return None
+
+    head = head_file.read_text().strip()
+    if head.startswith("ref:"):
+        return refs.get(head.removeprefix("ref:").strip())
+    return head or None
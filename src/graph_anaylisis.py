@@ -1,332 +1,1493 @@
+import io
 import json
 import argparse
 import subprocess
-import re
-import math
-from typing import Dict, List, Tuple, Any, Set, Optional
+import fnmatch
+from typing import Callable, Dict, Iterable, List, Tuple, Any, Set, Optional
 from pathlib import Path
-from collections import defaultdict, deque
-import networkx as nx
+from collections.abc import Mapping
 
+from .commit_store import (
+    CommitStore,
+    CommitsView,
+    CsrAdjacency,
+    LevelsView,
+    as_index_array,
+    assign_levels,
+    type_code,
+    ROOT,
+    FAST_FORWARD,
+    MERGE,
+)
+from .merge_paths import shortest_paths, rebuild_path
+from .snapshot import load_snapshot, save_snapshot, snapshot_path_for
+from .commit_graph_file import CommitGraph
+from .git_files import find_git_dir, peel_loose_tag, read_refs, ref_candidates
+from .reachability import ReachabilityIndex
+from .metric_engine import MetricEngine, metric_method
+from .profiling import Profiler, max_rss_mb
+from .levels import LevelProfile, level_profile
+from .windows import event_entropy, export_series, windowed_metrics
+
+# Tamaño del buffer del pipe y frecuencia de reporte en modo streaming
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_PROGRESS_INTERVAL = 100_000
+
+# Claves escritas por generate_summary_stats
+SUMMARY_STATS_KEYS = (
+    "total_commits",
+    "merge_commits",
+    "fast_forward_commits",
+    "root_commits",
+    "max_depth",
+    "branching_factor",
+)
+
+# Claves escritas por calculate_level_widths
+LEVEL_WIDTH_KEYS = (
+    "max_level_width",
+    "max_generation",
+    "max_generation_width",
+)
+
+# Opciones de load_git_data que acotan la historia cargada
+BOUNDED_OPTIONS = ("since", "max_commits", "refs")
+
+# Métricas de ruta crítica: export_metrics reutiliza la última pedida
+CRITICAL_PATH_METRICS = ("critical_merge_path", "critical_merge_paths")
+
+# Tabla de traducción tipo de commit -> costo de arista (1 por merge)
+MERGE_COST_TABLE = bytes(1 if code == MERGE else 0 for code in range(256))
 
 
 class GitGraphAnalyzer:
     """Analiza la estructura del gráfico de commits del repositorio de Git."""
-    
-    def __init__(self, repo_path: str):
+
+    def __init__(self, repo_path: str, profiler: Optional[Profiler] = None):
         """Inicializar el analizador con la ruta del repositorio."""
         self.repo_path = Path(repo_path)
-        self.graph = nx.DiGraph()
-        self.commits = {} # commit_hash -> commit_info
+        self.profiler = (
+            profiler or Profiler()
+        )  # tiempos por fase y subprocesos
+        self._graph = None  # (versión del grafo, nx.DiGraph), solo si se pide
+        self._store = CommitStore()  # commits internados en arrays compactos
+        self._reachability = None  # índice de ancestros, bajo demanda
+        self._level_profile = None  # (versión del grafo, LevelProfile)
+        self._parse_timestamps = False  # líneas de rev-list con --timestamp
+        self.window = {
+            "refs": ["--all"],
+            "since": None,
+            "max_commits": None,
+        }  # historia cargada
+        self._graph_version = (
+            0  # cambia con cada carga; invalida métricas memoizadas
+        )
+        self.metric_engine = MetricEngine(self)
         self.metrics = {}
-        self.levels = {} # commit -> level (distancia desde la raíz)
-    
-    def load_git_data(self) -> None:
-        """Cargar datos de confirmación de Git y compilar DAG."""
+        self.churn_counters = None  # ChurnCounters del último calculate_churn
+
+    @property
+    def graph_version(self) -> int:
+        """Versión del grafo cargado, usada como clave de memoización."""
+        return self._graph_version
+
+    @property
+    def graph(self):
+        """
+        Vista networkx (DiGraph padre -> hijo) del DAG cargado.
+
+        Ninguna métrica la usa: se construye (e importa networkx) en el
+        primer acceso y se reconstruye solo si el grafo cambió de versión.
+        """
+        if self._graph is None or self._graph[0] != self._graph_version:
+            import networkx as nx
+
+            store = self._store
+            with self.profiler.phase("build_graph"):
+                graph = nx.DiGraph()
+                graph.add_nodes_from(store.hashes)
+                graph.add_edges_from(store.iter_edges())
+            self._graph = (self._graph_version, graph)
+        return self._graph[1]
+
+    @property
+    def commits(self) -> Mapping:
+        """Vista de solo lectura commit_hash -> commit_info."""
+        return CommitsView(self._store)
+
+    @commits.setter
+    def commits(self, commits: Mapping) -> None:
+        self._store = CommitStore.from_mapping(commits)
+        self._graph_version += 1
+
+    @property
+    def levels(self) -> Mapping:
+        """Vista de solo lectura commit -> nivel (distancia desde la raíz)."""
+        return LevelsView(self._store)
+
+    @levels.setter
+    def levels(self, levels: Mapping) -> None:
+        assign_levels(self._store, levels)
+        self._graph_version += 1
+
+    def load_git_data(
+        self,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+        progress_interval: int = DEFAULT_PROGRESS_INTERVAL,
+        max_memory_mb: Optional[int] = None,
+        timestamps: bool = False,
+        since: Optional[str] = None,
+        max_commits: Optional[int] = None,
+        refs: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Cargar datos de confirmación de Git y compilar DAG.
+
+        Con stream=True la salida de git se lee línea a línea desde el pipe
+        del proceso, sin guardar el texto completo en memoria. Con
+        timestamps=True la misma invocación trae la fecha de cada commit
+        (necesaria para las métricas por ventana).
+
+        since, max_commits y refs acotan la historia (por defecto todas las
+        refs). Los commits del borde conservan sus padres fuera de la
+        ventana como ids externos: no se clasifican como root.
+        """
+        revisions = list(refs) if refs else ["--all"]
+        if any(ref.startswith("-") and ref != "--all" for ref in revisions):
+            raise ValueError(f"Ref inválida: {revisions}")
+
+        limits = []
+        if since is not None:
+            limits.append(f"--since={since}")
+        if max_commits is not None:
+            limits.append(f"--max-count={max_commits}")
+
+        # Obtener los commits (de la ventana) y sus padres
+        if refs:
+            cmd = ["git", "rev-list", "--parents", *limits, *revisions]
+        else:
+            cmd = ["git", "rev-list", "--all", "--parents", *limits]
+        self.window = {
+            "refs": revisions,
+            "since": since,
+            "max_commits": max_commits,
+        }
+        self._store = CommitStore()
         try:
-            # Obtener todos los commits y sus padres
-            cmd = ["git", "rev_list", "--all", "--parents"]
-            result = subprocess.check_output(
+            self._read_rev_list(
                 cmd,
-                cwd=self.repo_path,
-                text=True,
-                stderr=subprocess.DEVNULL
+                stream,
+                chunk_size,
+                progress,
+                progress_interval,
+                max_memory_mb,
+                timestamps=timestamps,
             )
 
-            self._parse_git_output(result)
+            with self.profiler.phase("resolve"):
+                self._store.resolve()
             self._build_graph()
             self._calculate_levels()
             self.__analyze_commit_types()
-        
+
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Error al ejecutar git: {e}")
-    
+
+    def load_incremental(self, snapshot_path: str, **load_options) -> bool:
+        """
+        Cargar el DAG reutilizando un snapshot de la ejecución anterior.
+
+        Solo se piden a git los commits no alcanzables desde los tips
+        guardados. Si alguna ref fue borrada o reescrita (force-push) se
+        reconstruye todo. Retorna True si la carga fue incremental.
+        """
+        _reject_bounded(load_options)
+        try:
+            refs = self._read_ref_tips()
+            with self.profiler.phase("load_snapshot"):
+                snapshot = load_snapshot(snapshot_path)
+            incremental = (
+                snapshot is not None
+                and snapshot[1].get("repository_path") == str(self.repo_path)
+                and "refs" in snapshot[1]
+                and (
+                    snapshot[0].timestamps is not None
+                    or not load_options.get("timestamps")
+                )
+                and self._tips_still_reachable(snapshot[1]["refs"])
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Error al ejecutar git: {e}")
+
+        if incremental:
+            self._store, meta = snapshot
+            old_size = len(self._store)
+            old_tips = sorted(set(meta["refs"].values()))
+            if self._store.timestamps is not None:
+                # Mantener alineado el array de fechas del snapshot
+                load_options = {**load_options, "timestamps": True}
+
+            # Commits nuevos: rev-list --all ^old-tips (padres tras los hijos)
+            cmd = [
+                "git",
+                "rev-list",
+                "--all",
+                "--parents",
+                "--topo-order",
+                "--stdin",
+            ]
+            try:
+                self._read_rev_list(
+                    cmd,
+                    stdin_text="".join(f"^{sha}\n" for sha in old_tips),
+                    **load_options,
+                )
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"Error al ejecutar git: {e}")
+
+            with self.profiler.phase("resolve"):
+                self._store.resolve()
+            with self.profiler.phase("update_new_commits"):
+                self._update_new_commits(old_size)
+            self._build_graph()
+            # El store sigue mapeado sobre el archivo que se va a reemplazar
+            self._store.detach()
+        else:
+            if snapshot is not None:
+                # Cerrar el mapeo del snapshot descartado antes de reescribirlo
+                snapshot[0].detach()
+            self.load_git_data(**load_options)
+
+        with self.profiler.phase("save_snapshot"):
+            save_snapshot(
+                self._store,
+                snapshot_path,
+                {"repository_path": str(self.repo_path), "refs": refs},
+            )
+        return incremental
+
+    def save_snapshot(self, path: str) -> None:
+        """Guardar el DAG cargado en el formato binario de snapshot."""
+        with self.profiler.phase("save_snapshot"):
+            save_snapshot(
+                self._store,
+                path,
+                {
+                    "repository_path": str(self.repo_path),
+                    "window": self.window,
+                },
+            )
+
+    def load_snapshot(self, path: str, verify: bool = True) -> Dict[str, Any]:
+        """
+        Reabrir un DAG guardado con save_snapshot.
+
+        El archivo se mapea con mmap: no se vuelve a ejecutar git ni se
+        recalculan niveles o tipos. verify=False omite la suma de
+        verificación. Retorna los metadatos guardados.
+        """
+        with self.profiler.phase("load_snapshot"):
+            snapshot = load_snapshot(path, verify)
+        if snapshot is None:
+            raise RuntimeError(
+                f"Snapshot inexistente, corrupto o de otra versión: {path}"
+            )
+
+        self._store, meta = snapshot
+        self.window = meta.get("window", self.window)
+        self._build_graph()
+        return meta
+
+    def load_from_commit_graph(self, **load_options) -> bool:
+        """
+        Cargar el DAG desde el commit-graph de git (mmap, sin subprocesos).
+
+        Los commits que aún no están en el archivo se piden a git rev-list.
+        Si no existe commit-graph se usa load_git_data. Retorna True si se
+        usó el archivo.
+        """
+        _reject_bounded(load_options)
+        git_dir = find_git_dir(self.repo_path)
+        graph = CommitGraph.open(git_dir / "objects") if git_dir else None
+        if graph is None:
+            self.load_git_data(**load_options)
+            return False
+
+        try:
+            with self.profiler.phase("read_commit_graph"):
+                offsets, parent_ids = graph.parent_csr()
+                self._store = CommitStore.from_arrays(
+                    graph.oids(), offsets, parent_ids
+                )
+                if load_options.get("timestamps"):
+                    self._store.timestamps = as_index_array(graph.timestamps())
+        finally:
+            graph.close()
+
+        # Tips actuales, con los tags anotados sueltos pelados a su commit
+        index = self._store.index
+        tips = {
+            sha if sha in index else peel_loose_tag(git_dir, sha) or sha
+            for sha in read_refs(git_dir).values()
+        }
+        # Tips que no están en el archivo: commits posteriores al último
+        # "git commit-graph write"
+        if any(sha not in index for sha in tips):
+            leaves = self._store.leaves()
+            cmd = ["git", "rev-list", "--all", "--parents", "--stdin"]
+            try:
+                self._read_rev_list(
+                    cmd,
+                    stdin_text="".join(
+                        f"^{self._store.hashes[i]}\n" for i in leaves
+                    ),
+                    **load_options,
+                )
+                if any(sha not in index for sha in tips):
+                    # Tags anotados empaquetados: pelarlos con git
+                    tips = set(self._read_ref_tips().values())
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"Error al ejecutar git: {e}")
+            with self.profiler.phase("resolve"):
+                self._store.resolve()
+
+        # El archivo puede conservar commits de ramas borradas o reescritas
+        self._drop_unreachable(tips)
+        self._build_graph()
+        self._calculate_levels()
+        self.__analyze_commit_types()
+        return True
+
+    def _drop_unreachable(self, tips: Set[str]) -> None:
+        """Quitar los commits no alcanzables desde tips (rev-list --all)."""
+        store = self._store
+        index = store.index
+        tip_ids = {index[sha] for sha in tips if sha in index}
+        # Un commit inalcanzable tiene algún descendiente sin hijos que no
+        # es tip
+        if all(leaf in tip_ids for leaf in store.leaves()):
+            return
+
+        with self.profiler.phase("drop_unreachable"):
+            reachable = bytearray(len(store))
+            pending = list(tip_ids)
+            for commit in pending:
+                reachable[commit] = 1
+            while pending:
+                for parent in store.parents(pending.pop()):
+                    if parent >= 0 and not reachable[parent]:
+                        reachable[parent] = 1
+                        pending.append(parent)
+            self._store = store.subset(reachable)
+
+    def _read_ref_tips(self) -> Dict[str, str]:
+        """Leer HEAD y todas las refs (tags pelados al commit) de una vez."""
+        try:
+            output = self._git_output(
+                ["git", "show-ref", "--head", "--dereference"]
+            )
+        except subprocess.CalledProcessError as e:
+            # show-ref retorna 1 si el repositorio no tiene refs
+            if e.returncode == 1:
+                return {}
+            raise
+
+        refs = {}
+        for line in output.splitlines():
+            sha, _, name = line.partition(" ")
+            # Las líneas "^{}" contienen el commit de un tag anotado
+            refs[name[:-3] if name.endswith("^{}") else name] = sha
+        return refs
+
+    def _tips_still_reachable(self, old_refs: Dict[str, str]) -> bool:
+        """Comprobar que los tips previos siguen alcanzables desde las refs."""
+        old_tips = sorted(set(old_refs.values()))
+        if not old_tips:
+            return True
+
+        # Cualquier commit alcanzable desde un tip viejo pero no desde --all
+        # indica una ref borrada o un force-push
+        try:
+            lost = self._git_output(
+                [
+                    "git",
+                    "rev-list",
+                    "--max-count=1",
+                    "--stdin",
+                    "--not",
+                    "--all",
+                ],
+                stdin_text="".join(f"{sha}\n" for sha in old_tips),
+            )
+        except subprocess.CalledProcessError:
+            # Algún tip viejo ya no existe en el repositorio
+            return False
+        return not lost.strip()
+
+    def _update_new_commits(self, first_new: int) -> None:
+        """Calcular niveles y tipos solo para los commits añadidos."""
+        store = self._store
+        offsets = store.parent_offsets
+        parent_ids = store.parent_ids
+        levels = store.levels
+
+        # Recorrer en orden inverso: con --topo-order los padres van primero
+        for commit in range(len(store) - 1, first_new - 1, -1):
+            level = 0
+            parent_levels = [
+                levels[parent_ids[k]]
+                for k in range(offsets[commit], offsets[commit + 1])
+                if parent_ids[k] >= 0
+            ]
+            if parent_levels:
+                level = min(parent_levels) + 1
+            levels[commit] = level
+            store.types[commit] = type_code(
+                offsets[commit + 1] - offsets[commit]
+            )
+
+    def _read_rev_list(
+        self,
+        cmd: List[str],
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+        progress_interval: int = DEFAULT_PROGRESS_INTERVAL,
+        max_memory_mb: Optional[int] = None,
+        stdin_text: Optional[str] = None,
+        timestamps: bool = False,
+    ) -> None:
+        """Ejecutar rev-list --parents (y --timestamp) y parsear la salida."""
+        if timestamps:
+            cmd = cmd + ["--timestamp"]
+        self._parse_timestamps = timestamps
+
+        if stream:
+            # git y el parseo se solapan: una sola fase para ambos
+            with self.profiler.phase(
+                "parse", stream=True
+            ), self.profiler.command(cmd):
+                self._stream_git_output(
+                    cmd,
+                    chunk_size,
+                    progress,
+                    progress_interval,
+                    max_memory_mb,
+                    stdin_text,
+                )
+            return
+
+        result = self._git_output(cmd, stdin_text)
+        with self.profiler.phase("parse"):
+            self._parse_git_output(result)
+
+    def _git_output(
+        self, cmd: List[str], stdin_text: Optional[str] = None
+    ) -> str:
+        """Ejecutar un comando git y retornar su salida (con su duración)."""
+        with self.profiler.command(cmd):
+            return subprocess.check_output(
+                cmd,
+                cwd=self.repo_path,
+                input=stdin_text,
+                text=True,
+                stderr=subprocess.DEVNULL,
+            )
+
+    def _stream_git_output(
+        self,
+        cmd: List[str],
+        chunk_size: int,
+        progress: Optional[Callable[[int], None]],
+        progress_interval: int,
+        max_memory_mb: Optional[int],
+        stdin_text: Optional[str] = None,
+    ) -> None:
+        """Leer la salida de git del pipe y parsearla a medida que llega."""
+        process = subprocess.Popen(
+            cmd,
+            cwd=self.repo_path,
+            stdin=subprocess.PIPE if stdin_text is not None else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=chunk_size,
+        )
+        try:
+            if stdin_text is not None:
+                # rev-list lee todas las revisiones antes de escribir
+                process.stdin.write(stdin_text)
+                process.stdin.close()
+
+            self._parse_stream(
+                process.stdout, progress, progress_interval, max_memory_mb
+            )
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+    def _parse_stream(
+        self,
+        lines: Iterable[str],
+        progress: Optional[Callable[[int], None]],
+        progress_interval: int,
+        max_memory_mb: Optional[int],
+    ) -> None:
+        """Parsear rev-list con progreso y control de memoria periódicos."""
+        count = 0
+        for line in lines:
+            if not self._parse_git_line(line):
+                continue
+
+            count += 1
+            if count % progress_interval == 0:
+                if progress is not None:
+                    progress(count)
+                if max_memory_mb is not None:
+                    self._check_memory_limit(max_memory_mb)
+
+        if progress is not None:
+            progress(count)
+
+    @staticmethod
+    def _check_memory_limit(max_memory_mb: int) -> None:
+        """Abortar la carga si el pico de memoria supera el límite."""
+        peak_mb = max_rss_mb()
+        if peak_mb is not None and peak_mb > max_memory_mb:
+            raise RuntimeError(
+                f"Límite de memoria superado: {peak_mb:.0f} MB > "
+                f"{max_memory_mb} MB"
+            )
+
     def _parse_git_output(self, git_output: str) -> None:
         """Parsear la salida de git para extraer commits y sus padres."""
-        for line in git_output.strip().split('\n'):
-            if not line:
-                continue
+        for line in io.StringIO(git_output):
+            self._parse_git_line(line)
+
+    def _parse_git_line(self, line: str) -> bool:
+        """Parsear una línea de rev-list --parents. False si está vacía."""
+        parts = line.split()
+        if not parts:
+            return False
+
+        if self._parse_timestamps:
+            # Formato --timestamp: "<fecha> <commit> <padres...>"
+            self._store.add_commit(
+                parts[1], parts[2:], timestamp=int(parts[0])
+            )
+        else:
+            self._store.add_commit(parts[0], parts[1:])
+        return True
 
-            parts = line.split()
-            commit = parts[0]
-            parents = parts[1:] if len(parts) > 1 else []
-
-            self.commits[commit] = {
-                'hash': commit,
-                'parents': parents,
-                'children': [],
-                'type': 'root' if not parents else 'unknown'
-            }       
-    
     def _build_graph(self) -> None:
-        """Costruir NetworkX DiGraph a partir de los commits."""
-        # Agrega todos los commits como nodos
-        for commit_hash in self.commits:
-            self.graph.add_node(commit_hash)
-        
-        # Agrega aristas entre padres e hijos
-        for commit_hash, commit_info in self.commits.items():
-            for parent in commit_info['parents']:
-                if parent in self.commits:
-                    self.graph.add_edge(parent, commit_hash)
-                    self.commits[parent]['children'].append(commit_hash)
+        """Construir el CSR de hijos y publicar una nueva versión del grafo."""
+        with self.profiler.phase("build_children"):
+            self._store.build_children()
+        # La vista networkx (self.graph) se construye bajo demanda
+        self._graph_version += 1
 
     def _calculate_levels(self) -> None:
         """Calcular niveles de commits (distancia desde la raíz)."""
-        # Buscar nodos raíz (sin padres)
-        roots = [commit for commit, info in self.commits.items() 
-                if not info['parents']]
-        
-        if not roots:
-            return
-        
-        # BFS para calcular niveles
-        queue = deque([(root, 0) for root in roots])
-        visited = set()
-        
-        while queue:
-            commit, level = queue.popleft()
-            if commit in visited:
-                continue
-                
-            visited.add(commit)
-            self.levels[commit] = level
-        
-        # Añade hijos a la cola
-        for child in self.commits[commit]['children']:
-                if child not in visited:
-                    queue.append((child, level + 1))
+        with self.profiler.phase("levels"):
+            profile = level_profile(self._store)
+        self._store.levels = profile.min_depth
+        self._level_profile = (self._graph_version, profile)
+
+    @property
+    def level_profile(self) -> LevelProfile:
+        """Profundidades mínima/máxima e histogramas de anchura por nivel."""
+        if (
+            self._level_profile is None
+            or self._level_profile[0] != self._graph_version
+        ):
+            with self.profiler.phase("levels"):
+                self._level_profile = (
+                    self._graph_version,
+                    level_profile(self._store),
+                )
+        return self._level_profile[1]
 
     def __analyze_commit_types(self) -> None:
-        """Analizar tipos de commits y calcular métricas."""
-        for commit_hash, commit_info in self.commits.items():
-            parent_count = len(commit_info['parents'])
-            
-            if parent_count == 0:
-                commit_info['type'] = 'root'
-            elif parent_count == 1:
-                commit_info['type'] = 'fast-forward'
-            else:
-                commit_info['type'] = 'merge'
+        """Analizar tipos de commits a partir del número de padres."""
+        store = self._store
+        offsets = store.parent_offsets
+        with self.profiler.phase("commit_types"):
+            store.types = bytearray(
+                type_code(offsets[i + 1] - offsets[i])
+                for i in range(len(store))
+            )
 
+    @metric_method("branch_density", outputs=("branch_density",))
     def calculate_branch_density(self) -> float:
         """
         Calcular la métrica de densidad de sucursales.
         Fórmula: numero de nodos(commits) / numero máximo de nodos en un nivel.
         """
-        
-        if not self.levels:
+
+        widths = self.level_profile.min_widths
+        if not widths:
             return 0.0
-        
-        num_nodes = len(self.commits)
-        max_level = max(self.levels.values()) if self.levels else 0
-        
-        if max_level == 0:
-            density = float(num_nodes)
-        else:
-            density = num_nodes / (max_level + 1)  # +1 porque los niveles empiezan en 0
-        
-        self.metrics['branch_density'] = density
+
+        # Niveles por distancia más corta desde una raíz (empiezan en 0)
+        density = sum(widths) / len(widths)
+
+        self.metrics["branch_density"] = density
         return density
-        
-    
-    def find_critical_merge_path(self, target_tag: str = "v0.0.0") -> List[str]:
+
+    @metric_method(
+        "critical_merge_path", outputs=("critical_merge_path",), export=False
+    )
+    def find_critical_merge_path(
+        self, target_tag: str = "v0.0.0"
+    ) -> List[str]:
         """
         Encuentre la ruta de fusión crítica utilizando la inversa de Dijkstra.
         Costo: 1 por merge, 0 por fast-forward.
         """
         try:
             # Obtener el commit HEAD
-            head_result = subprocess.check_output(
-                ["git", "rev-parse", "HEAD"],
-                cwd=self.repo_path,
-                text=True,
-                stderr=subprocess.DEVNULL
-            )
+            head_result = self._git_output(["git", "rev-parse", "HEAD"])
             head_commit = head_result.strip()
-            
+
             # Obtener el target tag de un commit
             try:
-                tag_result = subprocess.check_output(
-                    ["git", "rev-parse", target_tag],
-                    cwd=self.repo_path,
-                    text=True,
-                    stderr=subprocess.DEVNULL
-                )
+                tag_result = self._git_output(["git", "rev-parse", target_tag])
                 target_commit = tag_result.strip()
             except subprocess.CalledProcessError:
                 # Si no se encuentra el tag, buscar el commit más antiguo
                 target_commit = self._find_oldest_commit()
-            
+
             path = self._dijkstra_merge_path(head_commit, target_commit)
-            self.metrics['critical_merge_path'] = path
+            self.metrics["critical_merge_path"] = path
             return path
-            
+
         except subprocess.CalledProcessError:
             # Fallback: retorna una lista vacía si falla
-            self.metrics['critical_merge_path'] = []
+            self.metrics["critical_merge_path"] = []
             return []
-        
+
+    def resolve_refs(self, targets: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolver HEAD y varios targets (nombres o globs) a commits.
+
+        Todas las refs se leen con una sola invocación de git show-ref; los
+        targets que no son refs (hashes, HEAD~3, ...) se resuelven juntos con
+        una única llamada a git cat-file --batch-check. Un glob se expande a
+        cada ref que coincide; un nombre no resuelto queda como None.
+        """
+        refs = self._read_ref_tips()
+        resolved: Dict[str, Optional[str]] = {"HEAD": refs.get("HEAD")}
+        pending = []
+
+        for target in targets:
+            if any(char in target for char in "*?["):
+                resolved.update(_match_refs(refs, target))
+                continue
+
+            sha = next(
+                (
+                    refs[name]
+                    for name in ref_candidates(target)
+                    if name in refs
+                ),
+                None,
+            )
+            resolved[target] = sha
+            if sha is None:
+                pending.append(target)
+
+        if pending:
+            resolved.update(self._resolve_revisions(pending))
+        return resolved
+
+    def _resolve_revisions(
+        self, revisions: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """Resolver revisiones arbitrarias a commits con un solo cat-file."""
+        output = self._git_output(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            stdin_text="".join(f"{rev}^{{commit}}\n" for rev in revisions),
+        )
+
+        resolved = {}
+        for rev, line in zip(revisions, output.splitlines()):
+            sha, _, object_type = line.partition(" ")
+            resolved[rev] = sha if object_type == "commit" else None
+        return resolved
+
+    @metric_method(
+        "critical_merge_paths",
+        outputs=("critical_merge_paths", "critical_merge_path"),
+        export=False,
+    )
+    def find_critical_merge_paths(
+        self, targets: List[str]
+    ) -> Dict[str, List[str]]:
+        """
+        Rutas de fusión crítica de HEAD a varios targets en un solo recorrido.
+
+        Costo: 1 por merge, 0 por fast-forward. Un target que no se puede
+        resolver usa el commit más antiguo, como find_critical_merge_path.
+        """
+        try:
+            resolved = self.resolve_refs(targets)
+        except subprocess.CalledProcessError:
+            resolved = {}
+
+        store = self._store
+        head = resolved.pop("HEAD", None)
+        paths: Dict[str, List[str]] = {}
+        if head is not None and head in store.index:
+            target_ids = {}
+            for name, sha in resolved.items():
+                if sha is None:
+                    sha = self._find_oldest_commit()
+                if sha in store.index:
+                    target_ids[name] = store.index[sha]
+
+            start = store.index[head]
+            _, pred = shortest_paths(
+                store.parent_offsets,
+                store.parent_ids,
+                start,
+                targets=set(target_ids.values()),
+                node_cost=self._merge_costs(),
+            )
+            for name, target in target_ids.items():
+                paths[name] = [
+                    store.hashes[i] for i in rebuild_path(pred, start, target)
+                ]
+
+        self.metrics["critical_merge_paths"] = paths
+        self.metrics["critical_merge_path"] = next(iter(paths.values()), [])
+        return paths
+
+    def build_reachability_index(self) -> ReachabilityIndex:
+        """Construir (o reutilizar) el índice de ancestros del DAG cargado."""
+        index = self._reachability
+        if (
+            index is None
+            or index.store is not self._store
+            or index.size != len(self._store)
+        ):
+            index = self._reachability = ReachabilityIndex(self._store)
+        return index
+
+    def _commit_id(self, revision: str) -> int:
+        """Id de un commit a partir de su hash o de un nombre de ref."""
+        store = self._store
+        if revision in store.index:
+            return store.index[revision]
+
+        sha = self.resolve_refs([revision]).get(revision)
+        if sha is None or sha not in store.index:
+            raise KeyError(f"Commit no encontrado: {revision}")
+        return store.index[sha]
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """¿ancestor está contenido en la historia de descendant?"""
+        index = self.build_reachability_index()
+        return index.is_ancestor(
+            self._commit_id(ancestor), self._commit_id(descendant)
+        )
+
+    def merge_bases(self, first: str, second: str) -> List[str]:
+        """Todos los mejores ancestros comunes de dos commits."""
+        index = self.build_reachability_index()
+        bases = index.merge_bases(
+            self._commit_id(first), self._commit_id(second)
+        )
+        return [self._store.hashes[i] for i in bases]
+
+    def merge_base(self, first: str, second: str) -> Optional[str]:
+        """Mejor ancestro común de dos commits (None sin historia común)."""
+        bases = self.merge_bases(first, second)
+        return bases[0] if bases else None
+
+    def commits_between(self, start: str, end: str) -> List[str]:
+        """Commits alcanzables desde end pero no desde start (start..end)."""
+        index = self.build_reachability_index()
+        commits = index.commits_between(
+            self._commit_id(start), self._commit_id(end)
+        )
+        return [self._store.hashes[i] for i in commits]
+
     def _find_oldest_commit(self) -> str:
         """Busca el commit más antiguo en el repositorio."""
-        if not self.levels:
-            return list(self.commits.keys())[0] if self.commits else ""
-        
-        return min(self.levels, key=self.levels.get)
-    
+        store = self._store
+        reached = [i for i, level in enumerate(store.levels) if level >= 0]
+        if not reached:
+            return store.hashes[0] if len(store) else ""
+
+        return store.hashes[min(reached, key=store.levels.__getitem__)]
+
     def _dijkstra_merge_path(self, start: str, end: str) -> List[str]:
         """
-        Modificación de Dijkstra para encontrar el costo minimo considerando costos de merges.
+        Camino de costo mínimo considerando costos de merges.
+
+        Los costos son 0/1, así que se usa 0-1 BFS con mapa de predecesores;
+        el camino se reconstruye una sola vez al final.
         """
         if start == end:
             return [start]
-        
-        if start not in self.commits or end not in self.commits:
+
+        store = self._store
+        if start not in store.index or end not in store.index:
             return []
-        
-        # Cola prioridad: (cost, commit, path)
-        queue = [(0, start, [start])]
-        visited = set()
-        
-        while queue:
-            queue.sort()  # Implementación simple de cola de prioridad
-            cost, current, path = queue.pop(0)
-            
-            if current in visited:
-                continue
-                
-            visited.add(current)
-            
-            if current == end:
-                return path
-            
-            # Explorar padres
-            for parent in self.commits[current]['parents']:
-                if parent not in visited:
-                    # Calcular costo del edge
-                    edge_cost = 1 if self.commits[current]['type'] == 'merge' else 0
-                    new_cost = cost + edge_cost
-                    new_path = path + [parent]
-                    queue.append((new_cost, parent, new_path))
-        
-        return []  # Si no se encuentra un camino   
-    
+
+        start_id = store.index[start]
+        end_id = store.index[end]
+        dist, pred = shortest_paths(
+            store.parent_offsets,
+            store.parent_ids,
+            start_id,
+            targets=[end_id],
+            node_cost=self._merge_costs(),
+        )
+
+        return [store.hashes[i] for i in rebuild_path(pred, start_id, end_id)]
+
+    def _merge_costs(self) -> bytes:
+        """Costo por commit: 1 si es merge, 0 en otro caso."""
+        return bytes(self._store.types).translate(MERGE_COST_TABLE)
+
+    @metric_method("historical_entropy", outputs=("historical_entropy",))
     def calculate_historical_entropy(self) -> float:
         """Calcular la métrica de entropía histórica."""
-        
-        event_counts = defaultdict(int)
-        total_events = 0
-        
-        for commit_info in self.commits.values():
-            if commit_info['type'] in ['merge', 'fast-forward']:
-                event_counts[commit_info['type']] += 1
-                total_events += 1
-        
-        if total_events == 0:
-            self.metrics['historial_entropy'] = 0.0
-            return 0.0
-        
-        # Calculando entropia
-        entropy = 0.0
-        for event_type, count in event_counts.items():
-            probability = count / total_events
-            if probability > 0:
-                entropy -= probability * math.log2(probability)
-        
-        self.metrics['historial_entropy'] = entropy
+
+        store = self._store
+        entropy = event_entropy(
+            store.count_type(MERGE), store.count_type(FAST_FORWARD)
+        )
+
+        self.metrics["historical_entropy"] = entropy
         return entropy
-    
-    
+
+    @metric_method("summary_stats", outputs=SUMMARY_STATS_KEYS)
+    def generate_summary_stats(self) -> Dict[str, Any]:
+        """Calcular estadísticas generales del DAG de commits."""
+        store = self._store
+        with_children = sum(
+            1
+            for i in range(len(store))
+            if store.child_offsets[i + 1] > store.child_offsets[i]
+        )
+        edges = store.child_offsets[len(store)]
+
+        stats = {
+            "total_commits": len(store),
+            "merge_commits": store.count_type(MERGE),
+            "fast_forward_commits": store.count_type(FAST_FORWARD),
+            "root_commits": store.count_type(ROOT),
+            "max_depth": max(len(self.level_profile.min_widths) - 1, 0),
+            "branching_factor": (
+                edges / with_children if with_children else 0.0
+            ),
+        }
+        self.metrics.update(stats)
+        return stats
+
+    @metric_method("level_widths", outputs=LEVEL_WIDTH_KEYS)
+    def calculate_level_widths(self) -> Dict[str, int]:
+        """
+        Anchura máxima por nivel (distancia mínima) y por generación (camino
+        más largo).
+        """
+        profile = self.level_profile
+        widths = {
+            "max_level_width": max(profile.min_widths, default=0),
+            "max_generation": max(len(profile.max_widths) - 1, 0),
+            "max_generation_width": profile.max_width,
+        }
+        self.metrics.update(widths)
+        return widths
+
+    @metric_method(
+        "windowed_metrics", outputs=("windowed_metrics",), export=False
+    )
+    def calculate_windowed_metrics(
+        self, window: str = "month", step: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Entropía, ratio de merges y densidad por semana, mes o N commits.
+
+        Requiere cargar los datos con timestamps=True. El resultado es una
+        serie columnar que se exporta con el resto de métricas.
+        """
+        series = windowed_metrics(self._store, window, step)
+        self.metrics["windowed_metrics"] = series
+        return series
+
+    @metric_method("churn", outputs=("churn",), export=False)
+    def calculate_churn(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Líneas añadidas/borradas, archivos más modificados y concentración
+        de autores de los commits cargados.
+
+        Lanza git log --numstat por shards de commits en un pool de procesos
+        (workers, por defecto uno por CPU). Los contadores por commit quedan
+        en churn_counters; el resumen se exporta con el resto de métricas.
+        """
+        from .churn import collect_churn, summarize
+
+        counters = collect_churn(
+            str(self.repo_path), self._store.hashes, workers
+        )
+        self.churn_counters = counters
+        summary = summarize(counters)
+        self.metrics["churn"] = summary
+        return summary
+
+    def export_windowed_metrics(self, output_path: str) -> None:
+        """Exportar la serie por ventanas a CSV o Parquet (requiere pandas)."""
+        series = self.metrics.get("windowed_metrics")
+        if series is None:
+            raise RuntimeError(
+                "No hay métricas por ventana: "
+                "llamar calculate_windowed_metrics"
+            )
+        export_series(series, output_path)
+
+    def adjacency_matrix(self):
+        """
+        Matriz de adyacencia dispersa padre -> hijo (fila padre, columna hijo).
+
+        Retorna scipy.sparse.csr_matrix si SciPy está instalado y, si no,
+        un CsrAdjacency con arrays NumPy. Los índices son los ids del
+        almacén (analyzer._store.hashes[i]); se reutiliza el CSR de hijos.
+        """
+        import numpy as np
+
+        store = self._store
+        indptr = np.frombuffer(store.child_offsets, dtype=np.int64)
+        indices = np.frombuffer(store.child_ids, dtype=np.int64)
+        shape = (len(store), len(store))
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError:
+            return CsrAdjacency(indptr, indices, shape)
+        data = np.ones(len(indices), dtype=np.int8)
+        return csr_matrix((data, indices, indptr), shape=shape)
+
+    def export_adjacency(self, output_path: str) -> None:
+        """
+        Guardar la matriz de adyacencia en .npz con el formato de
+        scipy.sparse.save_npz (legible con scipy.sparse.load_npz), sin
+        requerir SciPy; los hashes de cada fila van en la clave 'hashes'.
+        """
+        import numpy as np
+
+        store = self._store
+        np.savez_compressed(
+            output_path,
+            format=np.array(b"csr"),
+            shape=np.array([len(store), len(store)]),
+            indptr=np.frombuffer(store.child_offsets, dtype=np.int64),
+            indices=np.frombuffer(store.child_ids, dtype=np.int64),
+            data=np.ones(len(store.child_ids), dtype=np.int8),
+            hashes=np.array(list(store.hashes), dtype="S"),
+        )
+
+    def export_plots(
+        self,
+        output_path: str,
+        bins: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Gráficas del perfil de anchura (con la ruta crítica) y, si se
+        cargaron fechas, del ratio de merges en el tiempo. Los datos se
+        agregan en como mucho bins intervalos; ver src/visualization.py.
+        """
+        from .visualization import MAX_BINS, plot_metrics
+
+        with self.profiler.phase("plot"):
+            plot_metrics(self, output_path, bins or MAX_BINS, cache_dir)
+
+    def export_commits(
+        self,
+        output_path: str,
+        fmt: Optional[str] = None,
+        compression: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Exportar una fila por commit (hash, padres, tipo, nivel, hijos y si
+        está en la ruta crítica) a NDJSON, CSV o Parquet, por bloques y sin
+        armar el documento en memoria. Retorna las filas escritas.
+        """
+        from .commit_export import DEFAULT_CHUNK_SIZE, export_commits
+
+        store = self._store
+        index = store.index
+        critical_ids = [
+            index[commit]
+            for commit in self.metrics.get("critical_merge_path", [])
+            if commit in index
+        ]
+        with self.profiler.phase("export_commits"):
+            return export_commits(
+                store,
+                output_path,
+                fmt,
+                compression,
+                chunk_size or DEFAULT_CHUNK_SIZE,
+                critical_ids,
+                self.churn_counters,
+            )
 
     def export_metrics(self, output_path: str) -> None:
         """Exportar metricas en un archivo JSON."""
-        self.calculate_branch_density()
-        self.find_critical_merge_path()
-        self.calculate_historical_entropy()
-
-        self.metrics['metada'] = {
-            'repository_path': str(self.repo_path),
-            'analysis_version': '1.0.0',
-            'total_metrics_calculated': len([k for k in self.metrics.keys() if k != 'metadata'])
+        write_metrics(self.collect_metrics(), output_path)
+
+    def collect_metrics(self, parallel: bool = True) -> Dict[str, Any]:
+        """
+        Calcular las métricas y retornar el documento que se exporta.
+
+        Las métricas ya calculadas para esta versión del grafo no se repiten;
+        la ruta crítica usa los últimos targets pedidos (por defecto v0.0.0).
+        """
+        engine = self.metric_engine
+        names = [name for name, spec in engine.specs().items() if spec.export]
+
+        critical_name, critical_params = self.critical_path_request()
+        engine.evaluate(
+            names + [critical_name], {critical_name: critical_params}, parallel
+        )
+
+        self.metrics["metadata"] = {
+            "repository_path": str(self.repo_path),
+            "analysis_version": "1.0.0",
+            "total_metrics_calculated": len(
+                [k for k in self.metrics.keys() if k != "metadata"]
+            ),
+            "window": self.describe_window(),
+            "profile": self.profiler.report(
+                len(self._store), int(self._store.parent_offsets[-1])
+            ),
         }
+        return self.get_metrics()
 
-        with open(output_path, 'w') as f:
-            json.dump(self.metrics, f, indent=2, sort_keys=True)
+    def critical_path_request(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Métrica de ruta crítica y parámetros (los últimos pedidos) que
+        exporta collect_metrics.
+        """
+        requests = self.metric_engine.requests
+        critical = [name for name in requests if name in CRITICAL_PATH_METRICS]
+        critical_name = critical[-1] if critical else "critical_merge_path"
+        return critical_name, requests.get(
+            critical_name, {"target_tag": "v0.0.0"}
+        )
+
+    def describe_window(self) -> Dict[str, Any]:
+        """Qué parte de la historia cubren las métricas."""
+        store = self._store
+        window = dict(self.window)
+        window["bounded"] = (
+            window["since"] is not None
+            or window["max_commits"] is not None
+            or window["refs"] != ["--all"]
+        )
+        window["commits"] = len(store)
+        window["boundary_commits"] = len(store.boundary())
+        if store.timestamps is not None and len(store):
+            window["first_commit_time"] = min(store.timestamps)
+            window["last_commit_time"] = max(store.timestamps)
+        return window
 
     def get_metrics(self) -> Dict[str, Any]:
         """Obtener las métricas calculadas."""
         return self.metrics.copy()
-    
-def main():
-    """Función principal para ejecutar el análisis desde la línea de comandos."""
+
+
+def scalars_first(value: Any) -> Any:
+    """
+    Claves ordenadas con los escalares antes que listas y objetos, para que
+    el reporte leído en streaming abra cada sección con su resumen.
+    """
+    if not isinstance(value, dict):
+        return value
+    return {
+        key: scalars_first(value[key])
+        for key in sorted(
+            value, key=lambda key: (isinstance(value[key], (dict, list)), key)
+        )
+    }
+
+
+def write_metrics(metrics: Dict[str, Any], output_path: str) -> None:
+    """Escribir un documento de métricas con los escalares primero."""
+    with open(output_path, "w") as f:
+        json.dump(scalars_first(metrics), f, indent=2)
+
+
+def _reject_bounded(load_options: Dict[str, Any]) -> None:
+    """Las cargas incremental y desde commit-graph siempre cubren --all."""
+    bounded = [
+        key for key in BOUNDED_OPTIONS if load_options.get(key) is not None
+    ]
+    if bounded:
+        raise ValueError(
+            f"Opciones de historia acotada no soportadas aquí: {bounded}"
+        )
+
+
+def _match_refs(refs: Dict[str, str], pattern: str) -> Dict[str, str]:
+    """Refs cuyo nombre completo o corto coincide con un glob."""
+    matches = {}
+    for name, sha in refs.items():
+        short = name
+        for prefix in ("refs/tags/", "refs/heads/", "refs/remotes/"):
+            if name.startswith(prefix):
+                short = name.removeprefix(prefix)
+                break
+        if fnmatch.fnmatchcase(short, pattern) or fnmatch.fnmatchcase(
+            name, pattern
+        ):
+            matches[short] = sha
+    return matches
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Argumentos de la línea de comandos."""
     parser = argparse.ArgumentParser(
+        prog="python -m src analyze",
         description="Aanalizar el gráfico del repositorio de Git",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
         Ejemplo:
-        python graph_analysis.py --repo . --output metrics.json
-        python graph_analysis.py --repo /path/to/repo --output analysis.json --tag v1.0.0
-        """
+        python -m src analyze --repo . --output metrics.json
+        python -m src analyze --repo ../otro --output out.json --tag v1.0.0
+        python -m src analyze --repos-glob "/srv/git/*" --ndjson all.ndjson
+        python -m src pipeline --repo . --output metrics.json
+        """,
     )
 
     parser.add_argument(
-        "--repo", 
-        default=".", 
-        help="Repositorio path (default: current directory)"
+        "--repo",
+        default=".",
+        help="Repositorio path (default: current directory)",
     )
     parser.add_argument(
-        "--output", 
-        default="metrics.json", 
-        help="Ruta de salida del archivo JSON (default: metrics.json)"
+        "--output",
+        default="metrics.json",
+        help="Ruta de salida del archivo JSON (default: metrics.json)",
     )
     parser.add_argument(
         "--tag",
-        default="v0.0.0",
-        help="Etiqueta de destino para el PATH (default: v0.0.0)"
+        nargs="+",
+        default=["v0.0.0"],
+        help="Etiquetas o globs (p. ej. 'v*') destino del PATH "
+        "(default: v0.0.0)",
     )
     parser.add_argument(
         "--verbose",
         action="store_true",
-        help="Habilitar salida detallada durante el análisis"
+        help="Habilitar salida detallada durante el análisis",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Leer la salida de git en streaming (menor pico de memoria)",
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=None,
+        help="Abortar la carga en streaming si la memoria supera este límite",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reutilizar el snapshot previo y cargar solo los commits nuevos",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directorio del snapshot incremental (default: el del --output)",
+    )
+    parser.add_argument(
+        "--commit-graph",
+        action="store_true",
+        help="Leer el commit-graph de git si existe (carga más rápida)",
+    )
+
+    parser.add_argument(
+        "--since",
+        default=None,
+        help="Analizar solo commits posteriores a la fecha "
+        "(p. ej. '6 months ago')",
+    )
+    parser.add_argument(
+        "--max-commits",
+        type=int,
+        default=None,
+        help="Analizar como máximo los N commits más recientes",
+    )
+    parser.add_argument(
+        "--refs",
+        nargs="+",
+        default=None,
+        help="Refs o rangos en lugar de --all (p. ej. main v1.0..v2.0)",
+    )
+    parser.add_argument(
+        "--window",
+        default=None,
+        help="Métricas por ventana: week, month o un número de commits",
+    )
+    parser.add_argument(
+        "--window-step",
+        type=int,
+        default=None,
+        help="Paso entre ventanas de N commits (menor que N: deslizante)",
+    )
+    parser.add_argument(
+        "--window-output",
+        default=None,
+        help="Exportar la serie por ventanas a CSV o Parquet (.parquet)",
+    )
+    parser.add_argument(
+        "--churn",
+        action="store_true",
+        help="Calcular métricas de churn (git log --numstat en paralelo)",
+    )
+    parser.add_argument(
+        "--churn-workers",
+        type=int,
+        default=None,
+        help="Procesos para el churn (default: número de CPUs)",
+    )
+    parser.add_argument(
+        "--adjacency",
+        default=None,
+        metavar="PATH",
+        help="Exportar la matriz de adyacencia CSR "
+        "(.npz, legible con scipy.sparse.load_npz)",
+    )
+    parser.add_argument(
+        "--commits-output",
+        default=None,
+        metavar="PATH",
+        help="Exportar una fila por commit (.ndjson, .csv o .parquet; "
+        ".gz/.bz2/.xz comprime)",
+    )
+    parser.add_argument(
+        "--commits-format",
+        choices=["ndjson", "csv", "parquet"],
+        default=None,
+        help="Formato de --commits-output (por defecto, según la extensión)",
+    )
+    parser.add_argument(
+        "--commits-compression",
+        default=None,
+        help="gzip, bz2 o xz para NDJSON/CSV; snappy, gzip, zstd... Parquet",
+    )
+    parser.add_argument(
+        "--commits-chunk-size",
+        type=int,
+        default=None,
+        help="Commits por bloque al exportar (default: 65536)",
+    )
+    parser.add_argument(
+        "--plot",
+        default=None,
+        metavar="PATH",
+        help="Gráficas de anchura por nivel, ruta crítica y ratio de merges "
+        "(png, svg o pdf)",
+    )
+    parser.add_argument(
+        "--plot-bins",
+        type=int,
+        default=None,
+        help="Intervalos máximos por gráfica (default: 1000)",
+    )
+    parser.add_argument(
+        "--plot-cache",
+        default=None,
+        metavar="DIR",
+        help="Directorio para cachear los datos agregados de las gráficas",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="PATH",
+        help="Perfilar el análisis: trace de Chrome si PATH termina en .json, "
+        "si no, volcado de cProfile (también mide la memoria con tracemalloc)",
+    )
+
+    batch = parser.add_argument_group("modo batch (varios repositorios)")
+    batch.add_argument("--repos", nargs="+", help="Repositorios a analizar")
+    batch.add_argument(
+        "--repos-file", help="Archivo con un repositorio por línea"
+    )
+    batch.add_argument(
+        "--repos-glob", help="Glob de directorios de repositorios"
+    )
+    batch.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Procesos del pool (default: número de CPUs)",
+    )
+    batch.add_argument(
+        "--timeout",
+        type=int,
+        default=None,
+        help="Timeout en segundos por repositorio",
     )
-    
-    args = parser.parse_args()
-    
+    batch.add_argument(
+        "--output-dir",
+        default=None,
+        help="Directorio con un archivo de métricas por repositorio",
+    )
+    batch.add_argument(
+        "--ndjson", default=None, help="Archivo NDJSON agregado"
+    )
+    return parser
+
+
+def _load(
+    analyzer: GitGraphAnalyzer,
+    args: argparse.Namespace,
+    bounded: Dict[str, Any],
+) -> None:
+    """Cargar el DAG según el modo (snapshot, commit-graph o rev-list)."""
+
+    def progress(count: int) -> None:
+        if args.verbose:
+            print(f"  {count} commits leídos")
+
+    load_options = {
+        "stream": args.stream or args.max_memory_mb is not None,
+        "progress": progress,
+        "max_memory_mb": args.max_memory_mb,
+        "timestamps": args.window is not None or args.plot is not None,
+    }
+    if args.incremental or args.cache_dir:
+        snapshot = snapshot_path_for(args.repo, args.output, args.cache_dir)
+        incremental = analyzer.load_incremental(snapshot, **load_options)
+        if args.verbose:
+            mode = "incremental" if incremental else "completa"
+            print(f"Carga {mode} (snapshot: {snapshot})")
+    elif args.commit_graph:
+        used = analyzer.load_from_commit_graph(**load_options)
+        if args.verbose and not used:
+            print("Sin archivo commit-graph: usando git rev-list")
+    else:
+        analyzer.load_git_data(**load_options, **bounded)
+
+
+def _run_optional(
+    analyzer: GitGraphAnalyzer, args: argparse.Namespace
+) -> None:
+    """Métricas y exportaciones opcionales pedidas por flags."""
+    if args.window is not None:
+        analyzer.calculate_windowed_metrics(args.window, args.window_step)
+        if args.window_output:
+            analyzer.export_windowed_metrics(args.window_output)
+    if args.churn:
+        analyzer.calculate_churn(args.churn_workers)
+    if args.adjacency:
+        analyzer.export_adjacency(args.adjacency)
+    if args.plot:
+        analyzer.export_plots(args.plot, args.plot_bins, args.plot_cache)
+    if args.commits_output:
+        analyzer.export_commits(
+            args.commits_output,
+            args.commits_format,
+            args.commits_compression,
+            args.commits_chunk_size,
+        )
+
+
+def _print_results(metrics: Dict[str, Any]) -> None:
+    print("\nResultados:")
+    print(f"  Densidad de rama: {metrics.get('branch_density', 0):.3f}")
+    print(f"  Historial Entropía: {metrics.get('historical_entropy', 0):.3f}")
+    print(
+        f"  Longitug del PATH: {len(metrics.get('critical_merge_path', []))}"
+    )
+    print(f"  Total Commits: {metrics.get('total_commits', 0)}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Función principal para ejecutar el análisis desde la consola."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    bounded = {
+        "since": args.since,
+        "max_commits": args.max_commits,
+        "refs": args.refs,
+    }
+    if any(value is not None for value in bounded.values()) and (
+        args.incremental or args.cache_dir or args.commit_graph
+    ):
+        parser.error(
+            "--since/--max-commits/--refs no se combinan con "
+            "--incremental, --cache-dir ni --commit-graph"
+        )
+
+    if args.repos or args.repos_file or args.repos_glob:
+        from .batch import main_batch
+
+        return main_batch(args)
+
+    profiler = Profiler(trace_memory=args.profile is not None)
+    cprofile = None
+    if args.profile and not args.profile.endswith(".json"):
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
     try:
         if args.verbose:
             print(f"Analizando repositorio: {args.repo}")
-        
-        analyzer = GitGraphAnalyzer(args.repo)
-        analyzer.load_git_data()
-        
+
+        analyzer = GitGraphAnalyzer(args.repo, profiler)
+        _load(analyzer, args, bounded)
+
         if args.verbose:
             print(f"Cargando {len(analyzer.commits)} commits")
             print("Calculando metricas.")
-        
-        # Calcular métricas con los tag
-        analyzer.calculate_branch_density()
-        analyzer.find_critical_merge_path(args.tag)
-        analyzer.calculate_historical_entropy()
-        analyzer.generate_summary_stats()
-        
+
+        # Calcular la ruta crítica con los tags; export_metrics la reutiliza
+        # y calcula el resto de métricas en paralelo
+        analyzer.find_critical_merge_paths(args.tag)
+        _run_optional(analyzer, args)
+
         # Resultados exportados
         analyzer.export_metrics(args.output)
-        
+
         if args.verbose:
-            metrics = analyzer.get_metrics()
-            print(f"\nResultados:")
-            print(f"  Densidad de rama: {metrics.get('branch_density', 0):.3f}")
-            print(f"  Historial Entropía: {metrics.get('historical_entropy', 0):.3f}")
-            print(f"  Longitug del PATH: {len(metrics.get('critical_merge_path', []))}")
-            print(f"  Total Commits: {metrics.get('total_commits', 0)}")
-        
+            _print_results(analyzer.get_metrics())
+
         print(f"Analis completo. Metricas guardado en {args.output}")
-        
+
     except Exception as e:
         print(f"Error: {e}")
         return 1
-    
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(args.profile)
+        elif args.profile:
+            profiler.write_chrome_trace(args.profile)
+        profiler.stop()
+
     return 0
 
+
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    # Con imports relativos: python -m src.graph_anaylisis o
+    # python -m src analyze
+    exit(main())
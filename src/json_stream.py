@@ -0,0 +1,266 @@
+"""
+Lectura incremental de documentos JSON grandes (p. ej. metrics.json con
+rutas críticas de decenas de miles de hashes) sin cargarlos enteros.
+
+iter_object recorre el objeto raíz y produce pares (clave, valor). Hasta la
+profundidad lazy_depth, arrays y objetos se entregan como iteradores
+perezosos (StreamedArray / StreamedObject) que leen el archivo a medida que
+se consumen; por debajo, cada valor se decodifica con
+json.JSONDecoder.raw_decode. Como con los eventos de ijson, los iteradores
+se consumen en orden: al pasar al siguiente par se descarta lo no leído.
+"""
+
+import json
+import re
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_LAZY_DEPTH = 2
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Buffer de texto sobre el archivo, rellenado por bloques."""
+
+    def __init__(self, source: TextIO, chunk_size: int):
+        self._source = source
+        self._chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, minimum: int = 0) -> bool:
+        """Leer otro bloque (descartando lo consumido). False si no hay más."""
+        if self.eof:
+            return False
+        if self.pos:
+            pos, self.pos = self.pos, 0
+            self.buffer = self.buffer[pos:]
+        data = self._source.read(max(self._chunk_size, minimum))
+        if not data:
+            self.eof = True
+            return False
+        self.buffer += data
+        return True
+
+    def peek(self) -> str:
+        """Siguiente carácter significativo ("" al final del archivo)."""
+        if (
+            self.pos < len(self.buffer)
+            and self.buffer[self.pos] not in " \t\n\r"
+        ):
+            return self.buffer[self.pos]
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        """Consumir el siguiente carácter, que debe estar en expected."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise ValueError(
+                f"JSON inválido: se esperaba {expected!r} y se leyó {char!r}"
+            )
+        self.pos += 1
+        return char
+
+    def _number_may_continue(self, value: Any, end: int) -> bool:
+        if type(value) not in (int, float):
+            return end >= len(self.buffer)
+        return _NUMBER_TAIL.match(self.buffer, end).end() == len(self.buffer)
+
+    def decode(self) -> Any:
+        """Decodificar un valor completo, leyendo más si está cortado."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                end = None
+            # Un número cortado ("12" de "12.5e3") puede seguir en el próximo
+            # bloque
+            if end is not None and (
+                self.eof or not self._number_may_continue(value, end)
+            ):
+                self.pos = end
+                return value
+            if not self.fill(2 * (len(self.buffer) - self.pos)):
+                if end is not None:
+                    self.pos = end
+                    return value
+                raise ValueError("JSON inválido o truncado")
+
+
+class _Streamed:
+    """Contenedor perezoso; se recorre una sola vez."""
+
+    def __init__(self, reader: _Reader, depth: int, lazy_depth: int):
+        self._reader = reader
+        self._depth = depth
+        self._lazy_depth = lazy_depth
+        self._items: Optional[Iterator] = None
+
+    def __iter__(self) -> Iterator:
+        if self._items is not None:
+            raise RuntimeError(
+                "El contenedor ya se recorrió (lectura en streaming)"
+            )
+        self._items = self._generate()
+        return self._items
+
+    def skip(self) -> None:
+        """Consumir lo que quede sin leer."""
+        if self._items is None:
+            self._items = self._generate()
+        # El generador descarta los hijos perezosos al avanzar
+        for _ in self._items:
+            pass
+
+    def _child(self) -> Any:
+        return _node(self._reader, self._depth + 1, self._lazy_depth)
+
+    def _generate(self) -> Iterator:
+        raise NotImplementedError
+
+
+class StreamedArray(_Streamed):
+    """Array leído elemento a elemento."""
+
+    def _generate(self) -> Iterator[Any]:
+        reader = self._reader
+        reader.take("[")
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        lazy = self._depth < self._lazy_depth
+        while True:
+            # Camino rápido para escalares: valor y separador con una búsqueda
+            match = None
+            if not (lazy and reader.peek() in ("[", "{")):
+                try:
+                    value, end = _DECODER.raw_decode(reader.buffer, reader.pos)
+                    match = _SEPARATOR.match(reader.buffer, end)
+                except json.JSONDecodeError:
+                    pass
+            if match is not None:
+                reader.pos = match.end()
+                yield value
+                separator = match.group(1)
+            else:
+                # Espacios delante, contenedor perezoso o valor cortado
+                child = self._child()
+                yield child
+                _skip(child)
+                separator = reader.take(",]")
+            if separator == "]":
+                return
+
+
+class StreamedObject(_Streamed):
+    """Objeto leído par a par."""
+
+    def _generate(self) -> Iterator[Tuple[str, Any]]:
+        reader = self._reader
+        reader.take("{")
+        if reader.peek() == "}":
+            reader.pos += 1
+            return
+        while True:
+            key = reader.decode()
+            reader.take(":")
+            child = self._child()
+            yield key, child
+            _skip(child)
+            if reader.take(",}") == "}":
+                return
+
+
+def _node(reader: _Reader, depth: int, lazy_depth: int) -> Any:
+    char = reader.peek()
+    if depth <= lazy_depth and char == "[":
+        return StreamedArray(reader, depth, lazy_depth)
+    if depth <= lazy_depth and char == "{":
+        return StreamedObject(reader, depth, lazy_depth)
+    return reader.decode()
+
+
+def _skip(node: Any) -> None:
+    if isinstance(node, _Streamed):
+        node.skip()
+
+
+def is_array(value: Any) -> bool:
+    return isinstance(value, (list, StreamedArray))
+
+
+def is_object(value: Any) -> bool:
+    return isinstance(value, (dict, StreamedObject))
+
+
+def iter_items(value: Any) -> Iterator[Tuple[str, Any]]:
+    """Pares de un objeto, perezoso o ya decodificado."""
+    return iter(value.items() if isinstance(value, dict) else value)
+
+
+def materialize(value: Any) -> Any:
+    """Convertir un valor perezoso en listas y dicts normales."""
+    if isinstance(value, StreamedArray):
+        return [materialize(item) for item in value]
+    if isinstance(value, StreamedObject):
+        return {key: materialize(item) for key, item in value}
+    return value
+
+
+def iter_canonical(value: Any, batch: int = 1024) -> Iterator[str]:
+    """
+    Fragmentos de una codificación JSON canónica de value (claves de los
+    dicts ordenadas), para hashear sin materializar los valores perezosos.
+    Los objetos perezosos conservan el orden del archivo.
+    """
+    if isinstance(value, StreamedObject):
+        yield "{"
+        for key, item in value:
+            yield json.dumps(key) + ":"
+            yield from iter_canonical(item, batch)
+            yield ","
+        yield "}"
+    elif isinstance(value, StreamedArray):
+        yield "["
+        pending = []
+        for item in value:
+            if isinstance(item, _Streamed):
+                if pending:
+                    yield json.dumps(pending, sort_keys=True)
+                    pending = []
+                yield from iter_canonical(item, batch)
+            else:
+                pending.append(item)
+                if len(pending) == batch:
+                    yield json.dumps(pending, sort_keys=True)
+                    pending = []
+        if pending:
+            yield json.dumps(pending, sort_keys=True)
+        yield "]"
+    else:
+        yield json.dumps(value, sort_keys=True)
+
+
+def iter_object(
+    source: TextIO,
+    lazy_depth: int = DEFAULT_LAZY_DEPTH,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[str, Any]]:
+    """Pares (clave, valor) del objeto raíz de source, leídos en streaming."""
+    reader = _Reader(source, chunk_size)
+    if reader.peek() != "{":
+        raise ValueError("El documento JSON debe ser un objeto")
+    yield from StreamedObject(reader, 0, lazy_depth)
+    if reader.peek():
+        raise ValueError("Datos extra tras el objeto JSON")
@@ -0,0 +1,39 @@
+"""
+Imports diferidos de dependencias opcionales.
+
+Importar NumPy cuesta más que analizar un repositorio pequeño, y los
+caminos vectorizados solo se usan a partir de NUMPY_MIN_EDGES aristas. Los
+módulos que lo usan lo obtienen con optional_module: el import real ocurre
+en el primer acceso a un atributo.
+"""
+
+import importlib
+import importlib.util
+from typing import Any, Optional
+
+
+class _LazyModule:
+    """Proxy de un módulo que se importa en el primer acceso a un atributo."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        state = "importado" if self._module is not None else "sin importar"
+        return f"<módulo diferido {self._name} ({state})>"
+
+
+def optional_module(name: str) -> Optional[Any]:
+    """Módulo diferido, o None si no está instalado (sin importarlo)."""
+    try:
+        if importlib.util.find_spec(name) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    return _LazyModule(name)
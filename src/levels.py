@@ -0,0 +1,184 @@
+"""
+Niveles topológicos del DAG en una sola pasada (algoritmo de Kahn por
+generaciones sobre el CSR de hijos).
+
+Para cada commit se calcula:
+- min_depth: distancia más corta desde una raíz (el nivel histórico);
+- max_depth: camino más largo desde una raíz (número de generación - 1).
+Y los histogramas de anchura por nivel de ambas medidas.
+
+Las generaciones anchas se procesan vectorizadas con NumPy y las estrechas
+en Python; ambos caminos escriben sobre los mismos arrays sin copiarlos.
+"""
+
+from array import array
+from typing import List, NamedTuple
+
+from .commit_store import CommitStore, INDEX_TYPECODE, NUMPY_MIN_EDGES
+from .lazy import optional_module
+
+np = optional_module("numpy")
+
+# Con NumPy, generaciones con al menos estos commits se procesan vectorizadas
+WIDE_FRONTIER = 512
+
+
+class LevelProfile(NamedTuple):
+    """Profundidades por commit e histogramas de anchura por nivel."""
+
+    min_depth: array
+    max_depth: array
+    min_widths: array  # min_widths[d] = commits con min_depth == d
+    max_widths: array  # max_widths[d] = commits en la generación d
+
+    @property
+    def max_width(self) -> int:
+        """Anchura máxima de una generación."""
+        return max(self.max_widths, default=0)
+
+
+def level_profile(store: CommitStore) -> LevelProfile:
+    """Profundidades e histogramas de un almacén con hijos construidos."""
+    n = len(store)
+    use_numpy = np is not None and len(store.parent_ids) >= NUMPY_MIN_EDGES
+    child_offsets = store.child_offsets
+    child_ids = store.child_ids
+
+    indegree = array(INDEX_TYPECODE, bytes(8 * n))
+    if use_numpy:
+        counts = np.bincount(
+            np.frombuffer(child_ids, dtype=np.int64), minlength=n
+        )
+        indegree = array(INDEX_TYPECODE, counts.astype(np.int64).tobytes())
+    else:
+        for child in child_ids:
+            indegree[child] += 1
+
+    # n como infinito: ninguna profundidad puede alcanzarlo
+    min_depth = array(INDEX_TYPECODE, [n]) * n
+    max_depth = array(INDEX_TYPECODE, bytes(8 * n))
+    frontier = [i for i in range(n) if indegree[i] == 0]
+    for root in frontier:
+        min_depth[root] = 0
+
+    if use_numpy:
+        _kahn_hybrid(
+            child_offsets, child_ids, indegree, min_depth, max_depth, frontier
+        )
+    else:
+        _kahn_python(
+            child_offsets,
+            child_ids,
+            indegree,
+            min_depth,
+            max_depth,
+            frontier,
+            0,
+        )
+
+    return LevelProfile(
+        min_depth,
+        max_depth,
+        histogram(min_depth, use_numpy),
+        histogram(max_depth, use_numpy),
+    )
+
+
+def _kahn_python(
+    child_offsets,
+    child_ids,
+    indegree,
+    min_depth,
+    max_depth,
+    frontier: List[int],
+    depth: int,
+    limit: float = float("inf"),
+) -> List[int]:
+    """
+    Procesar generaciones en Python hasta agotar el DAG o hasta que una
+    generación llegue a limit commits; retorna esa generación pendiente.
+    """
+    while frontier and len(frontier) < limit:
+        depth += 1
+        generation = []
+        for node in frontier:
+            low = min_depth[node] + 1
+            for k in range(child_offsets[node], child_offsets[node + 1]):
+                child = child_ids[k]
+                if low < min_depth[child]:
+                    min_depth[child] = low
+                remaining = indegree[child] - 1
+                indegree[child] = remaining
+                if not remaining:
+                    max_depth[child] = depth
+                    generation.append(child)
+        frontier = generation
+    return frontier
+
+
+def _kahn_hybrid(
+    child_offsets,
+    child_ids,
+    indegree,
+    min_depth,
+    max_depth,
+    frontier: List[int],
+) -> None:
+    """Generaciones anchas con NumPy y estrechas en Python (vistas comunes)."""
+    offsets_np = np.frombuffer(child_offsets, dtype=np.int64)
+    ids_np = np.frombuffer(child_ids, dtype=np.int64)
+    indegree_np = np.frombuffer(indegree, dtype=np.int64)
+    min_np = np.frombuffer(min_depth, dtype=np.int64)
+    max_np = np.frombuffer(max_depth, dtype=np.int64)
+
+    depth = 0
+    while len(frontier):
+        if len(frontier) < WIDE_FRONTIER:
+            frontier = _kahn_python(
+                child_offsets,
+                child_ids,
+                indegree,
+                min_depth,
+                max_depth,
+                list(frontier),
+                depth,
+                WIDE_FRONTIER,
+            )
+            if not frontier:
+                return
+            depth = max_depth[frontier[0]]
+
+        nodes = np.asarray(frontier, dtype=np.int64)
+        starts = offsets_np[nodes]
+        counts = offsets_np[nodes + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return
+
+        # Posiciones de todas las aristas salientes de la generación
+        ends = np.cumsum(counts)
+        positions = np.arange(total, dtype=np.int64) + np.repeat(
+            starts - ends + counts, counts
+        )
+        children = ids_np[positions]
+        np.minimum.at(min_np, children, np.repeat(min_np[nodes] + 1, counts))
+
+        unique, hits = np.unique(children, return_counts=True)
+        indegree_np[unique] -= hits
+        depth += 1
+        frontier = unique[indegree_np[unique] == 0]
+        max_np[frontier] = depth
+
+
+def histogram(depths: array, use_numpy: bool = False) -> array:
+    """Número de commits por profundidad."""
+    if not len(depths):
+        return array(INDEX_TYPECODE)
+    if use_numpy and np is not None:
+        counts = np.bincount(np.frombuffer(depths, dtype=np.int64))
+        return array(INDEX_TYPECODE, counts.astype(np.int64).tobytes())
+
+    widths = array(INDEX_TYPECODE, bytes(8 * (max(depths) + 1)))
+    for depth in depths:
+        widths[depth] += 1
+    return widths
@@ -0,0 +1,144 @@
+import heapq
+from array import array
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .commit_store import INDEX_TYPECODE
+
+# Marcador de distancia/predecesor no alcanzado
+UNREACHED = -1
+
+
+def _target_set(targets: Optional[Iterable[int]]) -> Optional[set]:
+    """Conjunto de destinos pendientes, o None para recorrer todo."""
+    return None if targets is None else set(targets)
+
+
+def zero_one_bfs(
+    offsets: Sequence[int],
+    neighbors: Sequence[int],
+    node_cost: Sequence[int],
+    start: int,
+    targets: Optional[Iterable[int]] = None,
+) -> Tuple[array, array]:
+    """
+    0-1 BFS sobre un grafo en formato CSR.
+
+    node_cost[v] (0 o 1) es el costo de todas las aristas que salen de v.
+    Retorna (dist, pred); se detiene cuando todos los targets están resueltos.
+    """
+    n = len(offsets) - 1
+    dist = array(INDEX_TYPECODE, [UNREACHED]) * n
+    pred = array(INDEX_TYPECODE, [UNREACHED]) * n
+    settled = bytearray(n)
+    pending = _target_set(targets)
+
+    dist[start] = 0
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if settled[current]:
+            continue
+        settled[current] = 1
+
+        if pending is not None:
+            pending.discard(current)
+            if not pending:
+                break
+
+        cost = node_cost[current]
+        new_dist = dist[current] + cost
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = neighbors[k]
+            if neighbor < 0 or settled[neighbor]:
+                continue
+            if dist[neighbor] == UNREACHED or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                pred[neighbor] = current
+                if cost:
+                    queue.append(neighbor)
+                else:
+                    queue.appendleft(neighbor)
+
+    return dist, pred
+
+
+def dijkstra(
+    offsets: Sequence[int],
+    neighbors: Sequence[int],
+    edge_cost: Callable[[int, int], float],
+    start: int,
+    targets: Optional[Iterable[int]] = None,
+) -> Tuple[list, array]:
+    """
+    Dijkstra con heap para pesos generales no negativos.
+
+    edge_cost(u, v) es el costo de la arista u -> v. Retorna (dist, pred).
+    """
+    n = len(offsets) - 1
+    dist = [None] * n
+    pred = array(INDEX_TYPECODE, [UNREACHED]) * n
+    settled = bytearray(n)
+    pending = _target_set(targets)
+
+    dist[start] = 0
+    heap = [(0, start)]
+    while heap:
+        cost, current = heapq.heappop(heap)
+        if settled[current]:
+            continue
+        settled[current] = 1
+
+        if pending is not None:
+            pending.discard(current)
+            if not pending:
+                break
+
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = neighbors[k]
+            if neighbor < 0 or settled[neighbor]:
+                continue
+            new_cost = cost + edge_cost(current, neighbor)
+            if dist[neighbor] is None or new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                pred[neighbor] = current
+                heapq.heappush(heap, (new_cost, neighbor))
+
+    return dist, pred
+
+
+def shortest_paths(
+    offsets: Sequence[int],
+    neighbors: Sequence[int],
+    start: int,
+    targets: Optional[Iterable[int]] = None,
+    node_cost: Optional[Sequence[int]] = None,
+    edge_cost: Optional[Callable[[int, int], float]] = None,
+) -> Tuple[Sequence, array]:
+    """
+    Elegir el motor según los pesos: 0-1 BFS si todos los costos son 0/1,
+    Dijkstra con heap en otro caso.
+    """
+    if edge_cost is None:
+        if node_cost is None:
+            node_cost = bytes(len(offsets) - 1)
+        if all(cost in (0, 1) for cost in set(node_cost)):
+            return zero_one_bfs(offsets, neighbors, node_cost, start, targets)
+        costs = node_cost
+        edge_cost = lambda u, v: costs[u]  # noqa: E731
+
+    return dijkstra(offsets, neighbors, edge_cost, start, targets)
+
+
+def rebuild_path(pred: Sequence[int], start: int, end: int) -> List[int]:
+    """Reconstruir el camino start -> end siguiendo los predecesores."""
+    if start == end:
+        return [start]
+    if pred[end] == UNREACHED:
+        return []
+
+    path = [end]
+    while path[-1] != start:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return path
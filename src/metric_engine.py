@@ -0,0 +1,240 @@
+"""
+Motor de métricas: registro de métricas con dependencias, memoización por
+versión del grafo y evaluación concurrente de métricas independientes.
+
+Una métrica externa se registra sin tocar GitGraphAnalyzer:
+
+    @register_metric("merge_ratio", depends=("summary_stats",))
+    def merge_ratio(analyzer):
+        stats = analyzer.metric_engine.compute("summary_stats")
+        return stats["merge_commits"] / max(stats["total_commits"], 1)
+"""
+
+import inspect
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+
+class MetricSpec(NamedTuple):
+    """Definición de una métrica registrada."""
+
+    name: str
+    func: Callable[..., Any]  # func(analyzer, **params) -> valor
+    depends: Tuple[str, ...] = ()
+    outputs: Optional[Tuple[str, ...]] = (
+        None  # claves de metrics que escribe func
+    )
+    export: bool = True  # incluir en export_metrics
+
+
+_REGISTRY: Dict[str, MetricSpec] = {}
+
+
+def register_metric(
+    name: str,
+    depends: Iterable[str] = (),
+    outputs: Optional[Iterable[str]] = None,
+    export: bool = True,
+):
+    """Registrar una función func(analyzer, **params) como métrica global."""
+
+    def decorator(func):
+        _REGISTRY[name] = MetricSpec(
+            name,
+            func,
+            tuple(depends),
+            tuple(outputs) if outputs is not None else None,
+            export,
+        )
+        return func
+
+    return decorator
+
+
+def metric_method(
+    name: str,
+    depends: Iterable[str] = (),
+    outputs: Optional[Iterable[str]] = None,
+    export: bool = True,
+):
+    """
+    Registrar un método de GitGraphAnalyzer como métrica.
+
+    El método queda envuelto: al llamarlo se resuelve a través del motor,
+    así que el resultado se memoiza por versión del grafo y parámetros.
+    """
+
+    def decorator(func):
+        register_metric(name, depends, outputs, export)(func)
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop(next(iter(signature.parameters)))
+            return self.metric_engine.compute(name, **params)
+
+        return wrapper
+
+    return decorator
+
+
+def registered_metrics() -> Dict[str, MetricSpec]:
+    """Copia del registro global de métricas."""
+    return dict(_REGISTRY)
+
+
+def _freeze(value: Any) -> Any:
+    """Convertir parámetros a una clave hashable."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class MetricEngine:
+    """Evalúa métricas de un analizador con memoización y en paralelo."""
+
+    def __init__(self, analyzer, max_workers: Optional[int] = None):
+        self.analyzer = analyzer
+        self.max_workers = max_workers
+        self.requests: Dict[str, Dict[str, Any]] = (
+            {}
+        )  # últimos parámetros por métrica
+        self._local: Dict[str, MetricSpec] = {}
+        self._cache: Dict[tuple, Tuple[Any, Dict[str, Any]]] = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        depends: Iterable[str] = (),
+        outputs: Optional[Iterable[str]] = None,
+        export: bool = True,
+    ) -> None:
+        """Registrar una métrica solo para este analizador."""
+        self._local[name] = MetricSpec(
+            name,
+            func,
+            tuple(depends),
+            tuple(outputs) if outputs is not None else None,
+            export,
+        )
+
+    def specs(self) -> Dict[str, MetricSpec]:
+        """Métricas disponibles: registro global más las locales."""
+        return {**_REGISTRY, **self._local}
+
+    def compute(self, name: str, **params) -> Any:
+        """Valor de una métrica, calculándolo solo si no está memoizado."""
+        spec = self.specs()[name]
+        version = self.analyzer.graph_version
+        key = (name, _freeze(params))
+
+        with self._lock:
+            self.requests.pop(name, None)
+            self.requests[name] = params
+            if self._version != version:
+                self._cache.clear()
+                self._version = version
+            cached = self._cache.get(key)
+
+        if cached is not None:
+            value, outputs = cached
+            self.analyzer.metrics.update(outputs)
+            return value
+
+        for dependency in spec.depends:
+            self.compute(dependency)
+
+        with self.analyzer.profiler.phase(f"metric:{name}"):
+            value = spec.func(self.analyzer, **params)
+        outputs = self._publish(spec, value)
+        with self._lock:
+            if self._version == version:
+                self._cache[key] = (value, outputs)
+        return value
+
+    def _publish(self, spec: MetricSpec, value: Any) -> Dict[str, Any]:
+        """Escribir el resultado en analyzer.metrics y retornar lo escrito."""
+        metrics = self.analyzer.metrics
+        if spec.outputs is None:
+            metrics[spec.name] = value
+            return {spec.name: value}
+        return {key: metrics[key] for key in spec.outputs if key in metrics}
+
+    def evaluate(
+        self,
+        names: Iterable[str],
+        params: Optional[Dict[str, Dict[str, Any]]] = None,
+        parallel: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Evaluar varias métricas respetando sus dependencias.
+
+        Las métricas se agrupan en oleadas (todas las dependencias en oleadas
+        anteriores); las de una misma oleada corren en un pool de hilos.
+        """
+        params = params or {}
+        results: Dict[str, Any] = {}
+        for wave in self._waves(list(names)):
+
+            def run(name: str) -> Any:
+                return self.compute(name, **params.get(name, {}))
+
+            if parallel and len(wave) > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    values = list(pool.map(run, wave))
+            else:
+                values = [run(name) for name in wave]
+            results.update(zip(wave, values))
+        return results
+
+    def _waves(self, names: List[str]) -> List[List[str]]:
+        """Orden topológico por niveles de las métricas y sus dependencias."""
+        specs = self.specs()
+        depth: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> int:
+            if name in path:
+                cycle = " -> ".join(path + (name,))
+                raise ValueError(
+                    f"Dependencia circular entre métricas: {cycle}"
+                )
+            if name not in specs:
+                raise KeyError(f"Métrica no registrada: {name}")
+            if name not in depth:
+                depth[name] = 1 + max(
+                    (
+                        visit(dep, path + (name,))
+                        for dep in specs[name].depends
+                    ),
+                    default=-1,
+                )
+            return depth[name]
+
+        for name in names:
+            visit(name, ())
+
+        waves: List[List[str]] = [
+            [] for _ in range(max(depth.values(), default=-1) + 1)
+        ]
+        for name, level in depth.items():
+            waves[level].append(name)
+        return waves
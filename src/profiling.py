@@ -0,0 +1,158 @@
+"""
+Instrumentación del análisis: tiempo de pared y de CPU por fase, duración
+de los subprocesos de git y memoria pico.
+
+Los tiempos se registran siempre (dos lecturas de reloj por fase). El
+rastreo de memoria con tracemalloc y cProfile solo se activan al perfilar,
+porque ralentizan todo el proceso.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Profiler:
+    """Registro de fases y subprocesos de un GitGraphAnalyzer."""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str, **args) -> Iterator[None]:
+        """Medir una fase; la CPU es la del hilo que la ejecuta."""
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self._record(
+                "phase",
+                name,
+                wall,
+                {"cpu_seconds": time.thread_time() - cpu, **args},
+            )
+
+    @contextmanager
+    def command(self, cmd: List[str]) -> Iterator[None]:
+        """Medir la duración de un subproceso de git."""
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(
+                "subprocess",
+                " ".join(cmd[:2]),
+                wall,
+                {"command": " ".join(cmd)},
+            )
+
+    def _record(
+        self, category: str, name: str, start: float, args: Dict[str, Any]
+    ) -> None:
+        end = time.perf_counter()
+        event = {
+            "cat": category,
+            "name": name,
+            "start": start - self._origin,
+            "seconds": end - start,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def truncate(self, size: int) -> None:
+        """Descartar los eventos registrados después de los primeros size."""
+        with self._lock:
+            del self.events[size:]
+
+    def report(self, commits: int = 0, edges: int = 0) -> Dict[str, Any]:
+        """Resumen serializable para el bloque metadata de las métricas."""
+        phases: Dict[str, Dict[str, float]] = {}
+        subprocesses: List[Dict[str, Any]] = []
+        for event in self.events:
+            if event["cat"] == "subprocess":
+                subprocesses.append(
+                    {
+                        "command": event["args"]["command"],
+                        "seconds": round(event["seconds"], 6),
+                    }
+                )
+                continue
+            totals = phases.setdefault(
+                event["name"],
+                {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0},
+            )
+            totals["calls"] += 1
+            totals["wall_seconds"] += event["seconds"]
+            totals["cpu_seconds"] += event["args"]["cpu_seconds"]
+
+        for totals in phases.values():
+            totals["wall_seconds"] = round(totals["wall_seconds"], 6)
+            totals["cpu_seconds"] = round(totals["cpu_seconds"], 6)
+
+        report = {
+            "commits": commits,
+            "edges": edges,
+            "phases": phases,
+            "subprocesses": subprocesses,
+            "max_rss_mb": max_rss_mb(),
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            report["peak_traced_memory_mb"] = round(
+                tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3
+            )
+        return report
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Eventos en formato trace-event (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        trace = [
+            {
+                "name": event["name"],
+                "cat": event["cat"],
+                "ph": "X",
+                "ts": round(event["start"] * 1e6, 3),
+                "dur": round(event["seconds"] * 1e6, 3),
+                "pid": pid,
+                "tid": event["tid"],
+                "args": event["args"],
+            }
+            for event in self.events
+        ]
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+    def stop(self) -> None:
+        """Detener el rastreo de memoria si este perfilador lo inició."""
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def max_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso en MB (None si no disponible)."""
+    if resource is None:
+        return None
+
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(
+        peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1
+    )
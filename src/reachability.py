@@ -0,0 +1,203 @@
+import heapq
+from array import array
+from typing import Dict, List
+
+from .commit_store import CommitStore, INDEX_TYPECODE
+
+# Marcas para la búsqueda de merge bases (como paint_down_to_common de git)
+PARENT1 = 1
+PARENT2 = 2
+STALE = 4
+
+
+class ReachabilityIndex:
+    """
+    Índice de ancestros sobre los arrays de un CommitStore.
+
+    Combina tres etiquetas calculadas en un único DFS sobre los padres:
+    - generación topológica (1 + máxima generación de los padres);
+    - intervalo [pre, post] del árbol DFS: respuesta positiva exacta;
+    - intervalo [low, post] del DAG: si post(a) queda fuera, a no es ancestro.
+    Solo los casos que ninguna etiqueta decide recorren el grafo, podando
+    con las mismas etiquetas.
+    """
+
+    def __init__(self, store: CommitStore):
+        self.store = store
+        self.size = len(store)
+        n = self.size
+        self.generation = array(INDEX_TYPECODE, [0]) * n
+        self.pre = array(INDEX_TYPECODE, [-1]) * n
+        self.post = array(INDEX_TYPECODE, [-1]) * n
+        self.low = array(INDEX_TYPECODE, [0]) * n
+        self._label(store.leaves())
+
+    def _label(self, tips: List[int]) -> None:
+        """DFS iterativo desde los tips siguiendo aristas hacia los padres."""
+        offsets = self.store.parent_offsets
+        parent_ids = self.store.parent_ids
+        generation, pre, post, low = (
+            self.generation,
+            self.pre,
+            self.post,
+            self.low,
+        )
+        pre_counter = post_counter = 0
+
+        # Los tips van primero; el resto cubre componentes sin tip propio
+        for root in tips + list(range(self.size)):
+            if pre[root] >= 0:
+                continue
+            pre[root] = pre_counter
+            pre_counter += 1
+            stack = [(root, offsets[root])]
+
+            while stack:
+                node, k = stack[-1]
+                end = offsets[node + 1]
+                while k < end and (
+                    parent_ids[k] < 0 or pre[parent_ids[k]] >= 0
+                ):
+                    k += 1
+
+                if k < end:
+                    parent = parent_ids[k]
+                    stack[-1] = (node, k + 1)
+                    pre[parent] = pre_counter
+                    pre_counter += 1
+                    stack.append((parent, offsets[parent]))
+                    continue
+
+                # Todos los padres ya terminaron: cerrar el nodo
+                stack.pop()
+                post[node] = post_counter
+                node_low = post_counter
+                node_generation = 1
+                for j in range(offsets[node], end):
+                    parent = parent_ids[j]
+                    if parent >= 0:
+                        node_low = min(node_low, low[parent])
+                        node_generation = max(
+                            node_generation, generation[parent] + 1
+                        )
+                low[node] = node_low
+                generation[node] = node_generation
+                post_counter += 1
+
+    def _tree_contains(self, ancestor: int, descendant: int) -> bool:
+        """ancestor está en el subárbol DFS de descendant (alcanzable)."""
+        return (
+            self.pre[descendant] <= self.pre[ancestor]
+            and self.post[ancestor] <= self.post[descendant]
+        )
+
+    def _may_reach(self, node: int, target: int) -> bool:
+        """Filtros negativos: False si target seguro no es ancestro de node."""
+        return (
+            self.generation[target] < self.generation[node]
+            and self.low[node] <= self.post[target] <= self.post[node]
+        )
+
+    def is_ancestor(self, ancestor: int, descendant: int) -> bool:
+        """True si ancestor es alcanzable desde descendant (o son el mismo)."""
+        if ancestor == descendant:
+            return True
+        if not self._may_reach(descendant, ancestor):
+            return False
+        if self._tree_contains(ancestor, descendant):
+            return True
+
+        # Caso no decidido por las etiquetas: DFS podado
+        offsets = self.store.parent_offsets
+        parent_ids = self.store.parent_ids
+        seen = {descendant}
+        stack = [descendant]
+        while stack:
+            node = stack.pop()
+            for k in range(offsets[node], offsets[node + 1]):
+                parent = parent_ids[k]
+                if parent < 0 or parent in seen:
+                    continue
+                if parent == ancestor or self._tree_contains(ancestor, parent):
+                    return True
+                seen.add(parent)
+                if self._may_reach(parent, ancestor):
+                    stack.append(parent)
+        return False
+
+    def merge_bases(self, first: int, second: int) -> List[int]:
+        """Mejores ancestros comunes (sin bases redundantes) por generación."""
+        offsets = self.store.parent_offsets
+        parent_ids = self.store.parent_ids
+        generation = self.generation
+
+        flags = {first: PARENT1}
+        flags[second] = flags.get(second, 0) | PARENT2
+        heap = [(-generation[node], node) for node in flags]
+        heapq.heapify(heap)
+        candidates = []
+
+        # Pintar hacia abajo en orden de generación decreciente mientras
+        # quede en la cola alguna entrada que no estaba marcada STALE
+        active = len(heap)
+        stale_entries: Dict[tuple, int] = {}
+        while active:
+            entry = heapq.heappop(heap)
+            if stale_entries.get(entry):
+                stale_entries[entry] -= 1
+            else:
+                active -= 1
+            node = entry[1]
+            node_flags = flags[node] & (PARENT1 | PARENT2 | STALE)
+            if node_flags == PARENT1 | PARENT2:
+                candidates.append(node)
+                node_flags |= STALE
+
+            for k in range(offsets[node], offsets[node + 1]):
+                parent = parent_ids[k]
+                if parent < 0:
+                    continue
+                parent_flags = flags.get(parent, 0)
+                if parent_flags & node_flags == node_flags:
+                    continue
+                flags[parent] = parent_flags | node_flags
+                parent_entry = (-generation[parent], parent)
+                heapq.heappush(heap, parent_entry)
+                if node_flags & STALE:
+                    stale_entries[parent_entry] = (
+                        stale_entries.get(parent_entry, 0) + 1
+                    )
+                else:
+                    active += 1
+
+        # Quitar candidatos que son ancestros de otro candidato
+        return [
+            node
+            for node in candidates
+            if not any(
+                other != node and self.is_ancestor(node, other)
+                for other in candidates
+            )
+        ]
+
+    def commits_between(self, start: int, end: int) -> List[int]:
+        """Commits alcanzables desde end pero no desde start (start..end)."""
+        offsets = self.store.parent_offsets
+        parent_ids = self.store.parent_ids
+
+        result = []
+        seen = {end}
+        stack = [end]
+        while stack:
+            node = stack.pop()
+            if self.is_ancestor(node, start):
+                continue
+            result.append(node)
+            for k in range(offsets[node], offsets[node + 1]):
+                parent = parent_ids[k]
+                if parent >= 0 and parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+
+        result.sort(key=self.generation.__getitem__, reverse=True)
+        return result
@@ -0,0 +1,187 @@
+"""
+Notas de lanzamiento entre dos tags con una sola llamada a git log.
+
+El rango from..to se lee en streaming de un git log con campos separados
+por NUL y se cachea en disco por el par de shas resueltos: como un sha
+identifica su historia, generar de nuevo el reporte para los mismos tags
+no lanza git (las refs se leen de .git sin subprocesos).
+"""
+
+import json
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .git_files import find_git_dir, read_refs, ref_candidates
+from .report_suite import ReleaseNote
+
+# Hash, autor, fecha ISO y mensaje; con -z cada commit también termina en NUL
+LOG_FORMAT = "%H%x00%an%x00%aI%x00%B"
+FIELDS = 4
+
+NOTES_CACHE_VERSION = 1
+
+SHA_PATTERN = re.compile(r"[0-9a-f]{40}([0-9a-f]{24})?")
+
+
+def parse_log_stream(chunks: Iterator[str]) -> Iterator[ReleaseNote]:
+    """ReleaseNotes desde la salida de git log -z troceada arbitrariamente."""
+    fields: List[str] = []
+    pending = ""
+    for chunk in chunks:
+        parts = (pending + chunk).split("\0")
+        pending = parts.pop()
+        for part in parts:
+            fields.append(part)
+            if len(fields) == FIELDS:
+                yield _note(fields)
+                fields = []
+    if pending:
+        fields.append(pending)
+    if len(fields) == FIELDS:
+        yield _note(fields)
+    elif fields:
+        raise RuntimeError("Salida de git log incompleta")
+
+
+def _note(fields: List[str]) -> ReleaseNote:
+    commit, author, date, message = fields
+    # git separa los commits con NUL; el hash puede venir precedido de "\n"
+    return ReleaseNote(commit.strip(), message.strip(), author, date)
+
+
+class GitNotesService:
+    """NotesService sobre git log con caché en disco por par de shas."""
+
+    def __init__(
+        self,
+        repo_path: str = ".",
+        cache_dir: Optional[str] = None,
+        chunk_size: int = 1 << 16,
+    ):
+        self.repo_path = Path(repo_path)
+        self.git_dir = find_git_dir(repo_path)
+        if cache_dir is None and self.git_dir is not None:
+            cache_dir = str(self.git_dir / "git-graph-cache")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.chunk_size = chunk_size
+        self.git_calls = 0
+
+    def resolve(self, revision: str) -> str:
+        """Sha de un tag, rama o hash; git rev-parse solo para expresiones."""
+        if SHA_PATTERN.fullmatch(revision):
+            return revision
+        if self.git_dir is not None:
+            refs = read_refs(self.git_dir)
+            sha = next(
+                (
+                    refs[name]
+                    for name in ref_candidates(revision)
+                    if name in refs
+                ),
+                None,
+            )
+            if sha is not None:
+                return sha
+
+        self.git_calls += 1
+        result = subprocess.run(
+            [
+                "git",
+                "rev-parse",
+                "--verify",
+                "--quiet",
+                f"{revision}^{{commit}}",
+            ],
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"No se pudo resolver la revisión: {revision}")
+        return result.stdout.strip()
+
+    def extract_release_notes(
+        self, from_tag: Optional[str], to_tag: str
+    ) -> List[ReleaseNote]:
+        """
+        Commits alcanzables desde to_tag y no desde from_tag, del más
+        reciente al más antiguo. Sin from_tag se lista toda la historia.
+        """
+        from_sha = self.resolve(from_tag) if from_tag else None
+        to_sha = self.resolve(to_tag)
+
+        cache_path = self._cache_path(from_sha, to_sha)
+        notes = self._read_cache(cache_path)
+        if notes is None:
+            notes = list(self.iter_release_notes(from_sha, to_sha))
+            self._write_cache(cache_path, notes)
+        return notes
+
+    def iter_release_notes(
+        self, from_rev: Optional[str], to_rev: str
+    ) -> Iterator[ReleaseNote]:
+        """Leer el rango de git log a medida que llega, sin caché."""
+        revision = f"{from_rev}..{to_rev}" if from_rev else to_rev
+        cmd = ["git", "log", "-z", f"--format={LOG_FORMAT}", revision, "--"]
+        self.git_calls += 1
+        process = subprocess.Popen(
+            cmd,
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding="utf-8",
+            errors="replace",
+        )
+        try:
+            chunks = iter(lambda: process.stdout.read(self.chunk_size), "")
+            yield from parse_log_stream(chunks)
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+    def _cache_path(
+        self, from_sha: Optional[str], to_sha: str
+    ) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"notes-{from_sha or 'root'}-{to_sha}.json"
+
+    @staticmethod
+    def _read_cache(path: Optional[Path]) -> Optional[List[ReleaseNote]]:
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != NOTES_CACHE_VERSION:
+            return None
+        return [ReleaseNote(*fields) for fields in data["notes"]]
+
+    @staticmethod
+    def _write_cache(path: Optional[Path], notes: List[ReleaseNote]) -> None:
+        if path is None:
+            return
+        data = {
+            "version": NOTES_CACHE_VERSION,
+            "notes": [
+                [note.commit_hash, note.message, note.author, note.date]
+                for note in notes
+            ],
+        }
+        # Escritura atómica: archivo temporal + rename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,185 @@
+"""
+Caché de reportes direccionada por contenido.
+
+La clave es un hash de una forma canónica de las secciones de métricas
+(leídas en streaming, sin las partes que cambian en cada ejecución), del
+escritor (tipo y opciones), de la versión de plantilla y de cualquier
+otra entrada (p. ej. las notas de lanzamiento). Si la clave ya está en
+caché no se vuelve a renderizar, y si el reporte de salida ya tiene ese
+contenido tampoco se reescribe.
+
+Las entradas se escriben en un temporal único y se publican con rename,
+así que varios procesos pueden compartir el directorio: en el peor caso
+dos renderizan la misma clave y gana el último rename, con idéntico
+contenido. Al superar max_bytes se borran las entradas usadas hace más
+tiempo (el mtime se actualiza en cada acierto).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .json_stream import iter_canonical
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".report"
+STATS_FILE = "stats.json"
+
+
+def default_cache_dir() -> Path:
+    """Directorio de caché del usuario ($XDG_CACHE_HOME o ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "git-graph" / "reports"
+
+
+def _tmp_path(path: Path) -> Path:
+    """Temporal único por proceso e hilo junto al destino."""
+    return path.with_name(
+        f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+
+
+def _same_content(entry: Path, tail: bytes, output: Path) -> bool:
+    """Comprobar si output es exactamente entry seguido de tail."""
+    size = entry.stat().st_size
+    if output.stat().st_size != size + len(tail):
+        return False
+    with open(entry, "rb") as expected, open(output, "rb") as actual:
+        for block in iter(lambda: expected.read(1 << 20), b""):
+            if actual.read(len(block)) != block:
+                return False
+        return actual.read() == tail
+
+
+class ReportCache:
+    """Reportes renderizados indexados por hash con desalojo LRU por tamaño."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser positivo")
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(
+        self, sections: Iterable[Tuple[str, Any]], parts: Iterable[Any]
+    ) -> str:
+        """Hash de los pares (sección, valor), quizá perezosos, y de parts."""
+        digest = hashlib.sha256()
+        for name, value in sections:
+            digest.update(json.dumps(name).encode())
+            for piece in iter_canonical(value):
+                digest.update(piece.encode())
+        digest.update(
+            json.dumps(list(parts), sort_keys=True, default=str).encode()
+        )
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Ruta de la entrada si existe (marcándola como usada) o None."""
+        path = self.entry_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, key: str, render: Callable[[str], None]) -> Path:
+        """Renderizar con render(ruta_temporal) y publicar la entrada."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.entry_path(key)
+        tmp_path = _tmp_path(path)
+        try:
+            render(str(tmp_path))
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        self.evict(keep=path)
+        return path
+
+    def install(self, entry: Path, output_path: str, tail: str = "") -> bool:
+        """
+        Copiar la entrada seguida de tail (partes que no se cachean) a
+        output_path si difiere. True si se escribió.
+        """
+        output = Path(output_path)
+        tail_bytes = tail.encode("utf-8")
+        if output.is_file() and _same_content(entry, tail_bytes, output):
+            return False
+        tmp_path = _tmp_path(output)
+        try:
+            shutil.copyfile(entry, tmp_path)
+            with open(tmp_path, "ab") as f:
+                f.write(tail_bytes)
+            os.replace(tmp_path, output)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return True
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Borrar las entradas menos usadas hasta caber en max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                info = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # Otro proceso ya la desalojó
+                pass
+            total -= size
+            evicted += 1
+        if evicted:
+            self.record(evictions=evicted)
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        """Aciertos, fallos y desalojos acumulados en este directorio."""
+        try:
+            with open(self.cache_dir / STATS_FILE) as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        return {
+            name: int(stats.get(name, 0))
+            for name in ("hits", "misses", "evictions")
+        }
+
+    def record(self, **increments: int) -> Dict[str, int]:
+        """
+        Sumar a las estadísticas. Se reescriben con rename: con escritores
+        concurrentes se puede perder un incremento, nunca corromper el archivo.
+        """
+        stats = self.stats()
+        for name, value in increments.items():
+            stats[name] += value
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / STATS_FILE
+        tmp_path = _tmp_path(path)
+        with open(tmp_path, "w") as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, path)
+        return stats
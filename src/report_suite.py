@@ -1,13 +1,41 @@
+import html
+import io
+import itertools
 import json
 import argparse
-from typing import Dict, Any, Protocol, List
+import re
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    TextIO,
+    Tuple,
+    Union,
+)
 from pathlib import Path
 from dataclasses import dataclass
 
+from .json_stream import (
+    DEFAULT_CHUNK_SIZE,
+    is_array,
+    is_object,
+    iter_items,
+    iter_object,
+    materialize,
+)
+from .report_cache import DEFAULT_MAX_BYTES, ReportCache
+
+
 # Estructuras de datos
 @dataclass
 class CommitStats:
     """Estructura de datos para estadísticas de commits."""
+
     total_commits: int
     merge_commits: int
     fast_forward_commits: int
@@ -21,15 +49,20 @@ class CommitStats:
 @dataclass
 class ReleaseNote:
     """Estructura de datos para notas de lanzamiento."""
+
+    # Sin __dict__ por instancia: un rango puede tener miles de commits
+    __slots__ = ("commit_hash", "message", "author", "date")
+
     commit_hash: str
     message: str
     author: str
     date: str
 
+
 # Definición de protocolos para escritores de reportes
 class StatsService(Protocol):
     """Protoclo para servicios de estadísticas de commits."""
-    
+
     def get_stats_from_json(self, json_path: str) -> CommitStats:
         """Extracción de estadísticas desde un archivo JSON."""
         ...
@@ -37,51 +70,627 @@ class StatsService(Protocol):
 
 class NotesService(Protocol):
     """Protocolo para servicios de notas de lanzamiento."""
-    
-    def extract_release_notes(self, from_tag: str, to_tag: str) -> List[ReleaseNote]:
+
+    def extract_release_notes(
+        self, from_tag: Optional[str], to_tag: str
+    ) -> List[ReleaseNote]:
         """Extracción de notas de lanzamiento entre dos etiquetas."""
         ...
 
 
 class WriterService(Protocol):
     """Protocolo para escritores de reportes."""
-    
-    def format_content(self, stats: CommitStats, notes: List[ReleaseNote]) -> str:
+
+    def format_content(
+        self, stats: CommitStats, notes: List[ReleaseNote]
+    ) -> str:
         """Formato estadistico y notas de lanzamiento."""
         ...
 
+
 class ReportWriter(Protocol):
     """Protocolo para reportar escritor."""
+
     def write(self, data: Dict[str, Any], output_path: str) -> None:
         """Escribir reporte en el formato específico."""
 
 
+# Elementos que se muestran de cada lista larga (rutas críticas, series)
+DEFAULT_LIMIT = 50
+
+# Cambiar al modificar el formato de salida: invalida los reportes en caché
+REPORT_TEMPLATE_VERSION = 1
+
+SECTION_TITLES = {
+    "critical_merge_path": "Ruta crítica de merges",
+    "critical_merge_paths": "Rutas críticas por tag",
+    "windowed_metrics": "Métricas por ventana",
+    "metadata": "Metadatos",
+    "window": "Ventana de historia",
+    "profile": "Perfil de ejecución",
+    "phases": "Fases",
+    "subprocesses": "Subprocesos",
+    "release_notes": "Notas de lanzamiento",
+    "report_cache": "Caché de reportes",
+}
+
+# Partes de metadata que cambian en cada ejecución de analyze (tiempos,
+# memoria): no forman parte de la clave de caché y se escriben al final
+VOLATILE_METADATA = ("profile",)
+
+# Objetos cuyas listas son columnas de una misma tabla
+COLUMNAR_SECTIONS = {"windowed_metrics"}
+
+HASH_PATTERN = re.compile(r"[0-9a-f]{40}([0-9a-f]{24})?")
+
+
+def iter_metrics(
+    input_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Pares (sección, valor) del archivo de métricas, leídos en streaming.
+
+    Acepta el JSON de analyze (listas y objetos grandes se entregan como
+    iteradores perezosos) o NDJSON, p. ej. la salida de batch --ndjson:
+    cada línea de un resultado por repositorio es una sección.
+    """
+    with open(input_path, encoding="utf-8") as f:
+        if Path(input_path).suffix not in (".ndjson", ".jsonl"):
+            yield from iter_object(f, chunk_size=chunk_size)
+            return
+
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "repo" in record and (
+                "metrics" in record or "status" in record
+            ):
+                if "metrics" in record:
+                    yield record["repo"], record["metrics"]
+                else:
+                    yield record["repo"], {
+                        key: record.get(key) for key in ("status", "error")
+                    }
+            else:
+                yield from record.items()
+
+
+def _split_volatile(
+    pairs: Iterator[Tuple[str, Any]], volatile: Dict[str, Any]
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Pares sin las partes volátiles de metadata, que se guardan en volatile
+    (por repositorio si vienen de un NDJSON de batch).
+    """
+    for key, value in pairs:
+        if key == "metadata" and is_object(value):
+            value = _strip_metadata(value, volatile, None)
+        elif isinstance(value, dict) and is_object(value.get("metadata")):
+            value = {
+                **value,
+                "metadata": _strip_metadata(value["metadata"], volatile, key),
+            }
+        yield key, value
+
+
+def _strip_metadata(
+    metadata: Any, volatile: Dict[str, Any], repo: Optional[str]
+) -> Dict[str, Any]:
+    kept = {}
+    for key, value in iter_items(metadata):
+        if key not in VOLATILE_METADATA:
+            kept[key] = materialize(value)
+        elif repo is None:
+            volatile[key] = materialize(value)
+        else:
+            volatile.setdefault(key, {})[repo] = materialize(value)
+    return kept
+
+
+def _deferred_items(values: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """Pares de values leídos al consumir el iterador, no al crearlo."""
+    yield from values.items()
+
+
+class StreamingReportWriter:
+    """
+    Pipeline común de los escritores: recorre las métricas en orden y
+    escribe cada sección en cuanto la lee, sin construir el documento.
+
+    Los escalares consecutivos forman una tabla clave/valor, cada lista es
+    una sección propia (truncada a limit elementos) y los objetos se
+    recorren como subsecciones. Las subclases solo dan formato.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = DEFAULT_LIMIT,
+        title: str = "Reporte de métricas del grafo de commits",
+    ):
+        if limit is not None and limit < 1:
+            raise ValueError("El límite de elementos debe ser positivo")
+        self.limit = limit
+        self.title = title
+
+    def write(
+        self,
+        data: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+        output_path: str,
+    ) -> None:
+        """Escribir el reporte; data es un dict o un iterable de pares."""
+        with open(output_path, "w", encoding="utf-8") as out:
+            self.render_body(out, data)
+            self.end(out)
+
+    def render_body(
+        self,
+        out: TextIO,
+        data: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+    ) -> None:
+        """Título y secciones de data, sin cerrar el documento."""
+        self.begin(out, self.title)
+        self._render_object(out, iter_items(data), level=2, summary="Resumen")
+
+    def render_tail(
+        self, data: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]
+    ) -> str:
+        """Secciones finales y cierre del documento, como texto."""
+        out = io.StringIO()
+        self._render_object(out, iter_items(data), level=2)
+        self.end(out)
+        return out.getvalue()
+
+    # Primitivas de formato
+
+    def begin(self, out: TextIO, title: str) -> None:
+        raise NotImplementedError
+
+    def heading(self, out: TextIO, text: str, level: int) -> None:
+        raise NotImplementedError
+
+    def table(
+        self, out: TextIO, header: List[str], rows: Iterable[List[Any]]
+    ) -> None:
+        raise NotImplementedError
+
+    def bullet_list(self, out: TextIO, items: Iterable[Any]) -> None:
+        raise NotImplementedError
+
+    def note(self, out: TextIO, text: str) -> None:
+        raise NotImplementedError
+
+    def end(self, out: TextIO) -> None:
+        pass
+
+    # Recorrido
+
+    def _render_object(
+        self,
+        out: TextIO,
+        pairs: Iterator[Tuple[str, Any]],
+        level: int,
+        summary: Optional[str] = None,
+    ) -> None:
+        scalars: List[Tuple[str, Any]] = []
+
+        def flush() -> None:
+            nonlocal summary
+            if scalars:
+                if summary:
+                    self.heading(out, summary, level)
+                    summary = None
+                self.table(
+                    out,
+                    ["Métrica", "Valor"],
+                    ([key, value] for key, value in scalars),
+                )
+                scalars.clear()
+
+        for key, value in pairs:
+            if is_array(value) or is_object(value):
+                flush()
+                self._render_section(out, key, value, level)
+            else:
+                scalars.append((key, value))
+        flush()
+
+    def _render_section(
+        self, out: TextIO, key: str, value: Any, level: int
+    ) -> None:
+        self.heading(out, SECTION_TITLES.get(key, key), level)
+        if is_array(value):
+            self._render_list(out, value)
+        elif key in COLUMNAR_SECTIONS:
+            self._render_columns(out, iter_items(value))
+        elif (
+            isinstance(value, dict)
+            and value
+            and all(_is_record(v) for v in value.values())
+        ):
+            # Objeto de registros (p. ej. fases del perfil): una fila por clave
+            names, total = self._head(value.items())
+            self._render_records(
+                out,
+                [{"Nombre": name, **record} for name, record in names],
+                total,
+            )
+        else:
+            self._render_object(out, iter_items(value), min(level + 1, 6))
+
+    def _head(self, values: Iterable[Any]) -> Tuple[List[Any], int]:
+        """Los primeros limit elementos (materializados) y el total."""
+        head: List[Any] = []
+        total = 0
+        for item in values:
+            if self.limit is None or total < self.limit:
+                head.append(materialize(item))
+            total += 1
+        return head, total
+
+    def _truncated(self, out: TextIO, shown: int, total: int) -> None:
+        if shown < total:
+            self.note(out, f"Mostrando {shown} de {total} elementos")
+
+    def _render_list(self, out: TextIO, values: Any) -> None:
+        head, total = self._head(values)
+        if not head:
+            self.note(out, "Sin elementos")
+        elif all(_is_record(item) for item in head):
+            self._render_records(out, head, total)
+        else:
+            self.bullet_list(out, head)
+            self._truncated(out, len(head), total)
+
+    def _render_records(
+        self, out: TextIO, records: List[Dict[str, Any]], total: int
+    ) -> None:
+        header: List[str] = []
+        for record in records:
+            header += [key for key in record if key not in header]
+        self.table(
+            out,
+            header,
+            ([record.get(key) for key in header] for record in records),
+        )
+        self._truncated(out, len(records), total)
+
+    def _render_columns(
+        self, out: TextIO, pairs: Iterator[Tuple[str, Any]]
+    ) -> None:
+        scalars: List[List[Any]] = []
+        columns: Dict[str, List[Any]] = {}
+        total = 0
+        for key, value in pairs:
+            if is_array(value):
+                columns[key], total = self._head(value)
+            else:
+                scalars.append([key, materialize(value)])
+        if scalars:
+            self.table(out, ["Métrica", "Valor"], scalars)
+        if columns:
+            self.table(
+                out,
+                list(columns),
+                [list(row) for row in zip(*columns.values())],
+            )
+            self._truncated(
+                out, min(len(column) for column in columns.values()), total
+            )
+
+
+def _is_record(value: Any) -> bool:
+    """Dict plano (sin listas ni objetos anidados)."""
+    return isinstance(value, dict) and not any(
+        isinstance(v, (dict, list)) for v in value.values()
+    )
+
+
+def _format_number(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return str(value)
+
+
+class MarkdownWriter(StreamingReportWriter):
+    """Escritor de reportes en formato Markdown."""
+
+    def begin(self, out: TextIO, title: str) -> None:
+        out.write(f"# {title}\n\n")
+
+    def heading(self, out: TextIO, text: str, level: int) -> None:
+        out.write(f"{'#' * level} {self.cell(text)}\n\n")
+
+    def table(
+        self, out: TextIO, header: List[str], rows: Iterable[List[Any]]
+    ) -> None:
+        out.write(
+            "| " + " | ".join(self.cell(name) for name in header) + " |\n"
+        )
+        out.write("|" + "---|" * len(header) + "\n")
+        for row in rows:
+            out.write(
+                "| " + " | ".join(self.cell(value) for value in row) + " |\n"
+            )
+        out.write("\n")
+
+    def bullet_list(self, out: TextIO, items: Iterable[Any]) -> None:
+        for item in items:
+            out.write(f"- {self.cell(item)}\n")
+        out.write("\n")
+
+    def note(self, out: TextIO, text: str) -> None:
+        out.write(f"_{text}_\n\n")
+
+    def cell(self, value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=False)
+        text = _format_number(value)
+        if HASH_PATTERN.fullmatch(text):
+            return f"`{text}`"
+        return text.replace("|", "\\|").replace("\n", " ")
+
+
+class HtmlWriter(StreamingReportWriter):
+    """Escritor de reportes en formato HTML (documento autocontenido)."""
+
+    STYLE = (
+        "body{font-family:sans-serif;margin:2em}"
+        "table{border-collapse:collapse;margin-bottom:1em}"
+        "th,td{border:1px solid #ccc;padding:.25em .5em;text-align:left}"
+        ".note{color:#666;font-style:italic}"
+    )
+
+    def begin(self, out: TextIO, title: str) -> None:
+        title = html.escape(title)
+        out.write(
+            '<!DOCTYPE html>\n<html lang="es">\n'
+            '<head>\n<meta charset="utf-8">\n'
+            f"<title>{title}</title>\n<style>{self.STYLE}</style>\n</head>\n"
+            f"<body>\n<h1>{title}</h1>\n"
+        )
+
+    def heading(self, out: TextIO, text: str, level: int) -> None:
+        out.write(f"<h{level}>{html.escape(str(text))}</h{level}>\n")
+
+    def table(
+        self, out: TextIO, header: List[str], rows: Iterable[List[Any]]
+    ) -> None:
+        out.write(
+            "<table>\n<tr>"
+            + "".join(f"<th>{self.cell(name)}</th>" for name in header)
+            + "</tr>\n"
+        )
+        for row in rows:
+            out.write(
+                "<tr>"
+                + "".join(f"<td>{self.cell(value)}</td>" for value in row)
+                + "</tr>\n"
+            )
+        out.write("</table>\n")
+
+    def bullet_list(self, out: TextIO, items: Iterable[Any]) -> None:
+        out.write("<ul>\n")
+        for item in items:
+            out.write(f"<li>{self.cell(item)}</li>\n")
+        out.write("</ul>\n")
+
+    def note(self, out: TextIO, text: str) -> None:
+        out.write(f'<p class="note">{html.escape(text)}</p>\n')
+
+    def end(self, out: TextIO) -> None:
+        out.write("</body>\n</html>\n")
+
+    def cell(self, value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=False)
+        text = _format_number(value)
+        if HASH_PATTERN.fullmatch(text):
+            return f"<code>{text}</code>"
+        return html.escape(text)
+
+
+WRITERS = {
+    "md": MarkdownWriter,
+    "html": HtmlWriter,
+}
 
-class MarkdownWriter:
-    """Escritor de reportes en formato Markdown."""    
-    def write(self, data: Dict[str, Any], output_path: str) -> None:
-        """Escribir reporte en formato Markdown."""
-    
 
 class ReportingSuite:
     """Facade para el sistema de generación de reportes."""
 
-    def __init__(self, writer: ReportWriter):
-        """Inicializar con un escritor de reportes."""
+    def __init__(
+        self,
+        writer: ReportWriter,
+        notes: Optional[NotesService] = None,
+        cache: Optional[ReportCache] = None,
+    ):
+        """Inicializar con un escritor de reportes y, opcionalmente, notas y
+        caché."""
         self.writer = writer
+        self.notes = notes
+        self.cache = cache
+        # Resultado de la última generación:
+        # {'cached': acierto, 'written': salida escrita}
+        self.last_run: Dict[str, bool] = {}
 
-    def generate_report(self, input_path: str, output_path:str) -> str:
-        """Genera reporte para archivo de metricas."""
+    def generate_report(
+        self,
+        input_path: str,
+        output_path: str,
+        from_tag: Optional[str] = None,
+        to_tag: Optional[str] = None,
+    ) -> str:
+        """Genera reporte de un archivo de metricas (notas si hay to_tag)."""
+        if not Path(input_path).exists():
+            raise RuntimeError(
+                f"No existe el archivo de métricas: {input_path}"
+            )
 
-if __name__ == "__main__":
+        extra: List[Tuple[str, Any]] = []
+        if to_tag is not None:
+            if self.notes is None:
+                raise RuntimeError(
+                    "Se pidieron notas de lanzamiento sin NotesService"
+                )
+            notes = self.notes.extract_release_notes(from_tag, to_tag)
+            extra.append(
+                (
+                    "release_notes",
+                    [
+                        {
+                            "commit": note.commit_hash,
+                            "autor": note.author,
+                            "fecha": note.date,
+                            "mensaje": note.message.split("\n", 1)[0],
+                        }
+                        for note in notes
+                    ],
+                )
+            )
+
+        volatile: Dict[str, Any] = {}
+
+        def sections() -> Iterator[Tuple[str, Any]]:
+            # Las partes volátiles se acumulan en volatile a medida que se leen
+            yield from _split_volatile(iter_metrics(input_path), volatile)
+            yield from extra
 
-    parser = argparse.ArgumentParser(description="Generar reportes de metricas")
-    parser.add_argument("--format", choices =["md", "html"], default="md")
-    parser.add_argument("--input", default="metrics.json", help="Archivo de metricas de entrada")
-    parser.add_argument("--output", help="Archivo de salida del reporte")
+        writer = self.writer
+        if self.cache is None or not isinstance(writer, StreamingReportWriter):
+            # Mismo orden que con caché: las partes volátiles al final
+            writer.write(
+                itertools.chain(sections(), _deferred_items(volatile)),
+                output_path,
+            )
+            self.last_run = {"cached": False, "written": True}
+            return output_path
 
-    args = parser.parse_args()
+        writer_id = f"{type(writer).__module__}.{type(writer).__qualname__}"
+        key = self.cache.key(
+            sections(),
+            [
+                REPORT_TEMPLATE_VERSION,
+                writer_id,
+                getattr(writer, "__dict__", {}),
+            ],
+        )
+        entry = self.cache.lookup(key)
+        cached = entry is not None
+        self.cache.record(**{"hits" if cached else "misses": 1})
+        if not cached:
 
-    print(f"Generación de reporte completo: {args.output}")
+            def render(path: str) -> None:
+                with open(path, "w", encoding="utf-8") as out:
+                    writer.render_body(out, sections())
 
-    
\ No newline at end of file
+            entry = self.cache.store(key, render)
+
+        # Fuera de la entrada cacheada: el perfil de esta ejecución y el
+        # resultado de la caché. Los contadores acumulados no se escriben en
+        # el reporte para que un acierto no cambie la salida.
+        tail = writer.render_tail(
+            itertools.chain(
+                volatile.items(),
+                [
+                    (
+                        "report_cache",
+                        {
+                            "clave": key[:16],
+                            "resultado": "acierto" if cached else "fallo",
+                        },
+                    )
+                ],
+            )
+        )
+        self.last_run = {
+            "cached": cached,
+            "written": self.cache.install(entry, output_path, tail),
+        }
+        return output_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Generar el reporte desde la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src report", description="Generar reportes de metricas"
+    )
+    parser.add_argument("--format", choices=sorted(WRITERS), default="md")
+    parser.add_argument(
+        "--input",
+        default="metrics.json",
+        help="Archivo de metricas de entrada (JSON o NDJSON)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Archivo de salida del reporte (por defecto report.<format>)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        help="Elementos mostrados por lista (0: sin límite)",
+    )
+    parser.add_argument(
+        "--repo", default=".", help="Repositorio para las notas de lanzamiento"
+    )
+    parser.add_argument(
+        "--from-tag", default=None, help="Inicio (excluido) del rango de notas"
+    )
+    parser.add_argument(
+        "--to-tag",
+        default=None,
+        help="Fin del rango de notas; sin él no se incluyen notas",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Renderizar siempre, sin usar la caché de reportes",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directorio de la caché (por defecto ~/.cache/git-graph/reports)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES >> 20,
+        help="Tamaño máximo de la caché antes de desalojar (MB)",
+    )
+
+    args = parser.parse_args(argv)
+    output = args.output or f"report.{args.format}"
+
+    notes = None
+    if args.to_tag is not None:
+        from .release_notes import GitNotesService
+
+        notes = GitNotesService(args.repo)
+
+    cache = None
+    if not args.no_cache:
+        cache = ReportCache(args.cache_dir, args.cache_max_mb << 20)
+
+    writer = WRITERS[args.format](limit=args.limit or None)
+    suite = ReportingSuite(writer, notes, cache)
+    suite.generate_report(args.input, output, args.from_tag, args.to_tag)
+    if suite.last_run["written"]:
+        print(f"Generación de reporte completo: {output}")
+    else:
+        print(f"Reporte sin cambios (caché): {output}")
+    if cache is not None:
+        print(
+            "Caché de reportes: {hits} aciertos, {misses} fallos, "
+            "{evictions} desalojos".format(**cache.stats())
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    # Con imports relativos: python -m src.report_suite o python -m src report
+    exit(main())
@@ -0,0 +1,331 @@
+"""
+Snapshot binario del DAG (ids, CSR de padres e hijos, niveles, tipos y
+fechas) que se reabre con mmap sin deserializar.
+
+Formato (versión 2):
+
+    cabecera   MAGIC, versión, longitud del índice, longitud del cuerpo, CRC32
+    índice     JSON: metadatos, nº de commits, byteorder y (offset, bytes)
+               de cada sección relativo al inicio de los datos
+    datos      secciones alineadas a 8 bytes; las columnas enteras son int64
+               nativos y los hashes hex se guardan en binario de ancho fijo
+
+El CRC32 cubre índice y datos. Las columnas del CommitStore cargado son
+memoryviews sobre el mapeo; add_commit las copia a memoria propia antes de
+modificar nada (CommitStore.detach). El mismo formato se publica en
+multiprocessing.shared_memory para que los workers de un pool compartan una
+única copia del grafo.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .commit_store import CommitStore
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = ".snapshot"
+
+MAGIC = b"GGSNAP\r\n"
+# magic, versión, bytes del índice, bytes del cuerpo (índice + datos), CRC32
+HEADER = struct.Struct("<8sIIQI")
+ALIGNMENT = 8
+
+INDEX_COLUMNS = (
+    "parent_offsets",
+    "parent_ids",
+    "child_offsets",
+    "child_ids",
+    "levels",
+)
+
+
+def snapshot_path_for(
+    repo_path: str, output_path: str, cache_dir: Optional[str] = None
+) -> Path:
+    """Ruta del snapshot: en cache_dir si se indica, o junto a las métricas."""
+    if cache_dir is None:
+        return Path(output_path + SNAPSHOT_SUFFIX)
+
+    repo = Path(repo_path).resolve()
+    key = hashlib.sha1(str(repo).encode()).hexdigest()[:12]
+    return Path(cache_dir) / f"{repo.name}-{key}{SNAPSHOT_SUFFIX}"
+
+
+class PackedHashes(Sequence):
+    """Hashes de ancho fijo en binario, convertidos a hex solo al leerlos."""
+
+    def __init__(self, buffer: memoryview, width: int):
+        self._buffer = buffer
+        self._width = width
+
+    def __len__(self) -> int:
+        return len(self._buffer) // self._width
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice de commit fuera de rango")
+        start = i * self._width
+        stop = start + self._width
+        return self._buffer[start:stop].hex()
+
+    def __iter__(self):
+        # Una sola conversión a hex y cortes de ancho fijo
+        text = self._buffer.hex()
+        step = 2 * self._width
+        size = len(text)
+        bounds = map(
+            slice, range(0, size, step), range(step, size + step, step)
+        )
+        return map(text.__getitem__, bounds)
+
+
+def _encode_hashes(hashes: Sequence) -> Tuple[Dict[str, Any], bytes]:
+    """Hashes en binario si todos son hex del mismo ancho; si no, texto."""
+    if isinstance(hashes, PackedHashes):
+        return {"encoding": "hex", "width": hashes._width}, hashes._buffer
+
+    widths = {len(commit) for commit in hashes}
+    if len(widths) == 1:
+        width = widths.pop()
+        if width % 2 == 0:
+            try:
+                return {"encoding": "hex", "width": width // 2}, bytes.fromhex(
+                    "".join(hashes)
+                )
+            except ValueError:
+                pass
+    return {"encoding": "text"}, "\n".join(hashes).encode()
+
+
+def _serialize(
+    store: CommitStore, meta: Dict[str, Any]
+) -> Tuple[List[Any], int]:
+    """Partes del snapshot en orden (cabecera incluida) y tamaño total."""
+    store.resolve()
+    hash_info, hash_bytes = _encode_hashes(store.hashes)
+    columns = [("hashes", hash_bytes), ("types", store.types)]
+    columns += [(name, getattr(store, name)) for name in INDEX_COLUMNS]
+    if store.timestamps is not None:
+        columns.append(("timestamps", store.timestamps))
+
+    sections = {}
+    offset = 0
+    for name, column in columns:
+        size = memoryview(column).nbytes
+        sections[name] = [offset, size]
+        offset += -(-size // ALIGNMENT) * ALIGNMENT
+
+    index = json.dumps(
+        {
+            "meta": meta,
+            "commits": len(store),
+            "byteorder": sys.byteorder,
+            "hashes": hash_info,
+            "external_hashes": store.external_hashes,
+            "sections": sections,
+        }
+    ).encode()
+    index += b" " * (-(HEADER.size + len(index)) % ALIGNMENT)
+
+    parts: List[Any] = [index]
+    for name, column in columns:
+        raw = memoryview(column).cast("B")
+        parts.append(raw)
+        parts.append(bytes(-len(raw) % ALIGNMENT))
+
+    checksum = 0
+    for part in parts:
+        checksum = zlib.crc32(part, checksum)
+    body_size = len(index) + offset
+    header = HEADER.pack(
+        MAGIC, SNAPSHOT_VERSION, len(index), body_size, checksum
+    )
+    return [header] + parts, HEADER.size + body_size
+
+
+def save_snapshot(
+    store: CommitStore, path: Path, meta: Dict[str, Any]
+) -> None:
+    """Guardar el DAG, niveles y tipos junto a metadatos (p. ej. ref tips)."""
+    parts, _ = _serialize(store, meta)
+
+    # Escritura atómica: archivo temporal + rename
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            for part in parts:
+                f.write(part)
+        os.replace(tmp_path, path)
+    finally:
+        # Si la escritura falla no se deja el temporal a medias
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _decode(
+    buffer: Any, owner: Any, verify: bool
+) -> Optional[Tuple[CommitStore, Dict[str, Any]]]:
+    """CommitStore con columnas sobre buffer (owner lo mantiene vivo)."""
+    if len(buffer) < HEADER.size:
+        return None
+    magic, version, index_size, body_size, checksum = HEADER.unpack_from(
+        buffer, 0
+    )
+    if (
+        magic != MAGIC
+        or version != SNAPSHOT_VERSION
+        or len(buffer) < HEADER.size + body_size
+    ):
+        return None
+
+    view = memoryview(buffer)
+    start = HEADER.size
+    body_end, index_end = start + body_size, start + index_size
+    if verify and zlib.crc32(view[start:body_end]) != checksum:
+        return None
+    index = json.loads(bytes(view[start:index_end]))
+    if index["byteorder"] != sys.byteorder:
+        return None
+
+    data_start = HEADER.size + index_size
+
+    def section(name: str) -> memoryview:
+        offset, size = index["sections"][name]
+        start = data_start + offset
+        stop = start + size
+        return view[start:stop]
+
+    store = CommitStore()
+    hash_info = index["hashes"]
+    if hash_info["encoding"] == "hex":
+        store.hashes = PackedHashes(section("hashes"), hash_info["width"])
+    else:
+        text = bytes(section("hashes")).decode()
+        store.hashes = text.split("\n") if index["commits"] else []
+    # El dict hash -> id se construye en el primer acceso
+    store.index = None
+
+    # Los tipos ocupan un byte por commit: se copian para conservar bytearray
+    store.types = bytearray(section("types"))
+    store.parent_offsets = section("parent_offsets").cast("q")
+    store.parent_ids = section("parent_ids").cast("q")
+    store._child_offsets = section("child_offsets").cast("q")
+    store._child_ids = section("child_ids").cast("q")
+    store.levels = section("levels").cast("q")
+    if "timestamps" in index["sections"]:
+        store.timestamps = section("timestamps").cast("q")
+
+    store.external_hashes = index["external_hashes"]
+    store._external_index = {
+        commit: -k - 1 for k, commit in enumerate(store.external_hashes)
+    }
+    store._mapping = owner
+    return store, index["meta"]
+
+
+def load_snapshot(
+    path: Path, verify: bool = True
+) -> Optional[Tuple[CommitStore, Dict[str, Any]]]:
+    """
+    Abrir un snapshot con mmap. Retorna None si no existe, es de otra
+    versión o no pasa la suma de verificación (verify=False la omite).
+    """
+    try:
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # ValueError: archivo vacío
+        return None
+
+    result = _decode(mapping, mapping, verify)
+    if result is None:
+        mapping.close()
+    return result
+
+
+@lru_cache(maxsize=None)
+def _attached_memory_class():
+    """
+    SharedMemory para segmentos abiertos por un worker (multiprocessing se
+    importa solo al usar memoria compartida).
+    """
+    from multiprocessing import shared_memory
+
+    class AttachedMemory(shared_memory.SharedMemory):
+        def __del__(self):
+            # Las columnas del store son vistas del segmento y no se puede
+            # cerrar mientras existan; el mapeo se libera con la última vista
+            try:
+                self.close()
+            except BufferError:
+                pass
+
+    return AttachedMemory
+
+
+class SharedSnapshot:
+    """
+    Snapshot publicado en memoria compartida. El proceso que lo publica lo
+    libera con close() (o al salir del bloque with); los workers lo abren
+    por nombre con attach_snapshot.
+    """
+
+    def __init__(
+        self, store: CommitStore, meta: Optional[Dict[str, Any]] = None
+    ):
+        from multiprocessing import shared_memory
+
+        parts, size = _serialize(store, meta or {})
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        position = 0
+        for part in parts:
+            part = memoryview(part).cast("B")
+            end = position + len(part)
+            self.memory.buf[position:end] = part
+            position = end
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def close(self) -> None:
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self) -> "SharedSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_snapshot(
+    name: str, verify: bool = False
+) -> Tuple[CommitStore, Dict[str, Any]]:
+    """Abrir sin copiar un snapshot publicado con SharedSnapshot."""
+    attached_memory = _attached_memory_class()
+    if sys.version_info >= (3, 13):
+        # Solo el proceso que publica debe borrar el segmento
+        memory = attached_memory(name, track=False)
+    else:
+        memory = attached_memory(name)
+
+    result = _decode(memory.buf, memory, verify)
+    if result is None:
+        raise RuntimeError(f"Memoria compartida sin snapshot válido: {name}")
+    return result
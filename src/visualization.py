@@ -0,0 +1,271 @@
+"""
+Gráficas del DAG con coste acotado: perfil de anchura por nivel con la
+ruta crítica superpuesta y ratio merge / fast-forward en el tiempo.
+
+Antes de dibujar, los datos se agregan con operaciones vectorizadas de
+NumPy en como mucho `bins` intervalos (niveles contiguos o tramos de
+tiempo de igual duración), así que el tiempo de render y el tamaño del
+archivo no dependen del número de commits. Se dibuja con el backend Agg
+(sin pantalla, válido en CI) a través de Figure/FigureCanvasAgg, sin el
+estado global de pyplot.
+
+Los frames agregados se pueden cachear en disco (cache_dir), indexados
+por un hash de los commits cargados, la ruta crítica y el número de bins.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from .commit_store import CommitStore, FAST_FORWARD, MERGE
+from .levels import LevelProfile
+
+# Intervalos máximos por gráfica: unos pocos píxeles por intervalo
+MAX_BINS = 1000
+FRAMES_CACHE_VERSION = 1
+
+
+def _bin_starts(length: int, bins: int):
+    """Inicio de cada intervalo al repartir length posiciones en bins."""
+    import numpy as np
+
+    bins = max(1, min(bins, length))
+    return np.unique(np.linspace(0, length, bins + 1).astype(np.int64)[:-1])
+
+
+def level_width_frame(
+    profile: LevelProfile,
+    levels: Sequence[int],
+    critical_ids: Sequence[int],
+    bins: int = MAX_BINS,
+):
+    """
+    Anchura por nivel (commits con la misma distancia mínima a una raíz,
+    como store.levels) agrupada en intervalos de niveles contiguos, con los
+    commits de la ruta crítica que caen en cada intervalo.
+    """
+    import numpy as np
+    import pandas as pd
+
+    widths = np.frombuffer(profile.min_widths, dtype=np.int64)
+    if not len(widths):
+        widths = np.zeros(1, dtype=np.int64)
+    starts = _bin_starts(len(widths), bins)
+    ends = np.append(starts[1:], len(widths))
+
+    path_levels = np.asarray(levels, dtype=np.int64)[
+        np.asarray(critical_ids, dtype=np.int64)
+    ]
+    path_levels = path_levels[path_levels >= 0]
+    critical = np.bincount(
+        np.searchsorted(starts, path_levels, side="right") - 1,
+        minlength=len(starts),
+    )
+
+    return pd.DataFrame(
+        {
+            "level_start": starts,
+            "level_end": ends - 1,
+            "width_mean": np.add.reduceat(widths, starts) / (ends - starts),
+            "width_max": np.maximum.reduceat(widths, starts),
+            "critical_commits": critical[: len(starts)],
+        }
+    )
+
+
+def merge_ratio_frame(store: CommitStore, bins: int = MAX_BINS):
+    """Commits, merges y fast-forwards por tramos de tiempo iguales."""
+    import numpy as np
+    import pandas as pd
+
+    if store.timestamps is None:
+        raise RuntimeError(
+            "No hay fechas de commit: cargar los datos con timestamps=True"
+        )
+
+    timestamps = np.frombuffer(store.timestamps, dtype=np.int64)
+    types = np.frombuffer(bytes(store.types), dtype=np.uint8)
+    if not len(timestamps):
+        return pd.DataFrame(
+            columns=[
+                "start",
+                "commits",
+                "merges",
+                "fast_forwards",
+                "merge_ratio",
+            ]
+        )
+
+    first, last = int(timestamps.min()), int(timestamps.max())
+    count = max(1, min(bins, len(timestamps), last - first + 1))
+    edges = np.linspace(first, last + 1, count + 1)
+    index = np.clip(
+        np.searchsorted(edges, timestamps, side="right") - 1, 0, count - 1
+    )
+
+    commits = np.bincount(index, minlength=count)
+    merges = np.bincount(
+        index, weights=types == MERGE, minlength=count
+    ).astype(np.int64)
+    fast_forwards = np.bincount(
+        index, weights=types == FAST_FORWARD, minlength=count
+    ).astype(np.int64)
+    events = merges + fast_forwards
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(events > 0, merges / events, np.nan)
+
+    return pd.DataFrame(
+        {
+            "start": pd.to_datetime(
+                edges[:-1].astype(np.int64), unit="s", utc=True
+            ),
+            "commits": commits,
+            "merges": merges,
+            "fast_forwards": fast_forwards,
+            "merge_ratio": ratio,
+        }
+    )
+
+
+def _frames_key(
+    store: CommitStore, critical_path: Sequence[str], bins: int
+) -> str:
+    """Hash de los commits cargados (en orden), la ruta crítica y los bins."""
+    digest = hashlib.sha1(
+        f"{FRAMES_CACHE_VERSION}:{bins}:{len(store)}".encode()
+    )
+    buffer = getattr(store.hashes, "_buffer", None)
+    if buffer is not None:
+        digest.update(buffer)
+    else:
+        digest.update("\n".join(store.hashes).encode())
+    digest.update(bytes(memoryview(store.parent_offsets).cast("B")))
+    digest.update(b"timestamps" if store.timestamps is not None else b"")
+    digest.update("\n".join(critical_path).encode())
+    return digest.hexdigest()
+
+
+def aggregate_frames(
+    analyzer, bins: int = MAX_BINS, cache_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Frames agregados del analizador: 'levels' y, si hay fechas,
+    'merge_ratio'. Con cache_dir se reutilizan entre ejecuciones.
+    """
+    if bins < 1:
+        raise ValueError("El número de intervalos debe ser positivo")
+    store = analyzer._store
+    critical_path = analyzer.metrics.get("critical_merge_path", [])
+
+    cache_path = None
+    if cache_dir is not None:
+        key = _frames_key(store, critical_path, bins)
+        cache_path = Path(cache_dir) / f"frames-{key}.pkl"
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    index = store.index
+    critical_ids = [
+        index[commit] for commit in critical_path if commit in index
+    ]
+    frames = {
+        "levels": level_width_frame(
+            analyzer.level_profile, store.levels, critical_ids, bins
+        )
+    }
+    if store.timestamps is not None:
+        frames["merge_ratio"] = merge_ratio_frame(store, bins)
+
+    if cache_path is not None:
+        # Escritura atómica: archivo temporal + rename
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(
+            cache_path.name + f".{os.getpid()}.tmp"
+        )
+        with open(tmp_path, "wb") as f:
+            pickle.dump(frames, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    return frames
+
+
+def render_frames(
+    frames: Dict[str, Any], output_path: str, title: Optional[str] = None
+) -> None:
+    """Dibujar los frames agregados en output_path (png, svg o pdf)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    panels = 2 if "merge_ratio" in frames else 1
+    figure = Figure(figsize=(11, 4 * panels), layout="constrained")
+    FigureCanvasAgg(figure)
+    if title:
+        figure.suptitle(title)
+
+    levels = frames["levels"]
+    axis = figure.add_subplot(panels, 1, 1)
+    axis.fill_between(
+        levels["level_start"],
+        levels["width_max"],
+        step="post",
+        alpha=0.3,
+        label="Anchura máxima",
+    )
+    axis.step(
+        levels["level_start"],
+        levels["width_mean"],
+        where="post",
+        label="Anchura media",
+    )
+    on_path = levels[levels["critical_commits"] > 0]
+    axis.scatter(
+        on_path["level_start"],
+        on_path["width_max"],
+        marker="v",
+        s=12,
+        color="crimson",
+        zorder=3,
+        label="Ruta crítica",
+    )
+    axis.set_xlabel("Nivel (distancia mínima a una raíz)")
+    axis.set_ylabel("Commits por nivel")
+    axis.set_title("Perfil de anchura por nivel")
+    axis.legend(loc="upper right", fontsize="small")
+
+    if panels == 2:
+        ratio = frames["merge_ratio"]
+        axis = figure.add_subplot(panels, 1, 2)
+        # Commits por tramo detrás, en su propio eje
+        commits_axis = axis.twinx()
+        commits_axis.fill_between(
+            ratio["start"],
+            ratio["commits"],
+            step="post",
+            alpha=0.15,
+            color="tab:gray",
+        )
+        commits_axis.set_ylabel("Commits por tramo")
+        axis.set_zorder(commits_axis.get_zorder() + 1)
+        axis.patch.set_visible(False)
+        axis.plot(ratio["start"], ratio["merge_ratio"], color="tab:purple")
+        axis.set_ylim(0, 1)
+        axis.set_ylabel("Merges / (merges + fast-forwards)")
+        axis.set_title("Ratio de merges en el tiempo")
+
+    figure.savefig(output_path, dpi=100)
+
+
+def plot_metrics(
+    analyzer,
+    output_path: str,
+    bins: int = MAX_BINS,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Agregar (o leer de caché) y dibujar; retorna los frames usados."""
+    frames = aggregate_frames(analyzer, bins, cache_dir)
+    render_frames(frames, output_path, f"Repositorio: {analyzer.repo_path}")
+    return frames
@@ -0,0 +1,237 @@
+"""
+Métricas por ventana (semana, mes o N commits) calculadas en una sola
+pasada en orden cronológico.
+
+Cada ventana mantiene contadores incrementales (commits, merges,
+fast-forwards y commits por nivel); al cerrar una ventana se emite una
+fila sin volver a recorrer sus commits. Con ventanas de N commits y un
+paso menor que N la ventana se desliza: el commit que sale descuenta sus
+contadores.
+"""
+
+import math
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+from .commit_store import CommitStore, FAST_FORWARD, MERGE
+from .lazy import optional_module
+
+np = optional_module("numpy")
+
+CALENDAR_WINDOWS = ("week", "month")
+SECONDS_PER_DAY = 86400
+
+# Columnas de la serie, en orden
+SERIES_COLUMNS = (
+    "start",
+    "end",
+    "commits",
+    "merges",
+    "fast_forwards",
+    "merge_ratio",
+    "entropy",
+    "density",
+)
+
+
+def parse_window(spec: Union[str, int]) -> Union[str, int]:
+    """'week', 'month' o un número de commits."""
+    if isinstance(spec, int) or str(spec).isdigit():
+        size = int(spec)
+        if size <= 0:
+            raise ValueError("La ventana debe tener al menos un commit")
+        return size
+    if spec not in CALENDAR_WINDOWS:
+        raise ValueError(
+            f"Ventana no soportada: {spec} (week, month o N commits)"
+        )
+    return spec
+
+
+def event_entropy(merges: int, fast_forwards: int) -> float:
+    """Entropía de Shannon de la distribución merge / fast-forward."""
+    total = merges + fast_forwards
+    entropy = 0.0
+    for count in (merges, fast_forwards):
+        if count:
+            probability = count / total
+            entropy -= probability * math.log2(probability)
+    return entropy
+
+
+def calendar_bounds(timestamp: int, unit: str):
+    """Inicio y fin (exclusivo) en UTC de la semana o el mes de timestamp."""
+    if unit == "week":
+        day = timestamp // SECONDS_PER_DAY
+        # El 1970-01-01 fue jueves: retroceder hasta el lunes
+        start = (day - (day + 3) % 7) * SECONDS_PER_DAY
+        return start, start + 7 * SECONDS_PER_DAY
+
+    date = datetime.fromtimestamp(timestamp, timezone.utc)
+    start = datetime(date.year, date.month, 1, tzinfo=timezone.utc)
+    year, month = (
+        (date.year + 1, 1) if date.month == 12 else (date.year, date.month + 1)
+    )
+    end = datetime(year, month, 1, tzinfo=timezone.utc)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+class _WindowCounters:
+    """Contadores de la ventana actual, con altas y bajas en O(1)."""
+
+    def __init__(self):
+        self.commits = self.merges = self.fast_forwards = 0
+        self.level_counts: Dict[int, int] = {}
+
+    def add(self, code: int, level: int) -> None:
+        self.commits += 1
+        if code == MERGE:
+            self.merges += 1
+        elif code == FAST_FORWARD:
+            self.fast_forwards += 1
+        self.level_counts[level] = self.level_counts.get(level, 0) + 1
+
+    def remove(self, code: int, level: int) -> None:
+        self.commits -= 1
+        if code == MERGE:
+            self.merges -= 1
+        elif code == FAST_FORWARD:
+            self.fast_forwards -= 1
+        remaining = self.level_counts[level] - 1
+        if remaining:
+            self.level_counts[level] = remaining
+        else:
+            del self.level_counts[level]
+
+    def row(self, start: int, end: int) -> tuple:
+        # Densidad como en calculate_branch_density: commits / niveles
+        return (
+            start,
+            end,
+            self.commits,
+            self.merges,
+            self.fast_forwards,
+            self.merges / self.commits,
+            event_entropy(self.merges, self.fast_forwards),
+            self.commits / len(self.level_counts),
+        )
+
+
+def chronological_order(store: CommitStore) -> List[int]:
+    """Ids por fecha; a igual fecha, los padres (id mayor) primero."""
+    timestamps = store.timestamps
+    n = len(store)
+    if np is not None and n:
+        ids = np.arange(n, dtype=np.int64)
+        return np.lexsort(
+            (-ids, np.frombuffer(timestamps, dtype=np.int64))
+        ).tolist()
+    return sorted(range(n), key=lambda i: (timestamps[i], -i))
+
+
+def windowed_metrics(
+    store: CommitStore,
+    window: Union[str, int] = "month",
+    step: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Serie temporal columnar de métricas por ventana.
+
+    window: 'week', 'month' (ventanas de calendario UTC) o N commits.
+    step: solo para ventanas de N commits; paso entre ventanas (default N,
+    ventanas sin solape). start/end son fechas epoch: el intervalo de
+    calendario o las fechas del primer y último commit de la ventana.
+    """
+    if store.timestamps is None:
+        raise RuntimeError(
+            "No hay fechas de commit: cargar los datos con timestamps=True"
+        )
+
+    window = parse_window(window)
+    if isinstance(window, int):
+        step = window if step is None else step
+        if not 0 < step <= window:
+            raise ValueError(
+                "El paso debe estar entre 1 y el tamaño de la ventana"
+            )
+        rows = _commit_windows(store, window, step)
+    else:
+        if step is not None:
+            raise ValueError("El paso solo aplica a ventanas de N commits")
+        rows = _calendar_windows(store, window)
+
+    series: Dict[str, Any] = {"window": window}
+    if step is not None:
+        series["step"] = step
+    columns = list(zip(*rows)) if rows else [()] * len(SERIES_COLUMNS)
+    for column, values in zip(SERIES_COLUMNS, columns):
+        series[column] = [
+            round(v, 6) if isinstance(v, float) else v for v in values
+        ]
+    return series
+
+
+def _calendar_windows(store: CommitStore, unit: str) -> List[tuple]:
+    timestamps, types, levels = store.timestamps, store.types, store.levels
+    rows = []
+    counters = _WindowCounters()
+    start = end = None
+    for commit in chronological_order(store):
+        timestamp = timestamps[commit]
+        if end is None or timestamp >= end:
+            if counters.commits:
+                rows.append(counters.row(start, end))
+                counters = _WindowCounters()
+            start, end = calendar_bounds(timestamp, unit)
+        counters.add(types[commit], levels[commit])
+
+    if counters.commits:
+        rows.append(counters.row(start, end))
+    return rows
+
+
+def _commit_windows(store: CommitStore, size: int, step: int) -> List[tuple]:
+    timestamps, types, levels = store.timestamps, store.types, store.levels
+    rows = []
+    counters = _WindowCounters()
+    window: deque = deque()
+    pending = 0  # commits añadidos desde la última fila emitida
+
+    for position, commit in enumerate(chronological_order(store), 1):
+        window.append(commit)
+        counters.add(types[commit], levels[commit])
+        pending += 1
+        if len(window) > size:
+            oldest = window.popleft()
+            counters.remove(types[oldest], levels[oldest])
+
+        if position >= size and (position - size) % step == 0:
+            rows.append(
+                counters.row(timestamps[window[0]], timestamps[window[-1]])
+            )
+            pending = 0
+            if step == size:
+                # Ventanas sin solape: empezar de cero
+                window.clear()
+                counters = _WindowCounters()
+
+    if pending:
+        rows.append(
+            counters.row(timestamps[window[0]], timestamps[window[-1]])
+        )
+    return rows
+
+
+def export_series(series: Dict[str, Any], path: str) -> None:
+    """Exportar la serie a CSV o Parquet (según la extensión) con pandas."""
+    import pandas as pd
+
+    frame = pd.DataFrame({column: series[column] for column in SERIES_COLUMNS})
+    for column in ("start", "end"):
+        frame[column] = pd.to_datetime(frame[column], unit="s", utc=True)
+
+    if str(path).endswith(".parquet"):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
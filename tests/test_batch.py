@@ -0,0 +1,171 @@
+import json
+import os
+import signal
+import time
+import pytest
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from src import batch
+from src.batch import (
+    BatchWriter,
+    analyze_repo,
+    collect_repos,
+    output_name,
+    run_batch,
+    _run_isolated,
+)
+from src.graph_anaylisis import main
+
+_analyze_repo = batch.analyze_repo
+
+
+def crash_on_beta(repo, options):
+    """Worker que muere (como por OOM) con el repositorio beta."""
+    if Path(repo).name == "beta":
+        os._exit(3)
+    return _analyze_repo(repo, options)
+
+
+def hang(repo, options):
+    """Worker colgado que ignora la alarma del timeout."""
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    time.sleep(60)
+
+
+class TestBatch:
+    """Casos de tests para el análisis batch de repositorios."""
+
+    @pytest.fixture
+    def workspace(self):
+        """Directorio con dos repositorios git y un directorio que no lo es."""
+        temp_dir = tempfile.mkdtemp()
+        root = Path(temp_dir)
+        for name in ("alpha", "beta"):
+            repo = root / name
+            repo.mkdir()
+            subprocess.run(
+                ["git", "init"], cwd=repo, check=True, capture_output=True
+            )
+            subprocess.run(
+                [
+                    "git",
+                    "-c",
+                    "user.name=Test",
+                    "-c",
+                    "user.email=t@example.com",
+                    "commit",
+                    "--allow-empty",
+                    "-m",
+                    "inicial",
+                ],
+                cwd=repo,
+                check=True,
+                capture_output=True,
+            )
+        (root / "not_a_repo").mkdir()
+
+        yield root
+
+        shutil.rmtree(temp_dir)
+
+    def test_collect_repos(self, workspace):
+        """Test de recolección desde argumentos, archivo y glob sin duplicados."""
+        repos_file = workspace / "repos.txt"
+        repos_file.write_text(f"# comentario\n{workspace / 'alpha'}\n\n")
+
+        repos = collect_repos(
+            [str(workspace / "beta")], str(repos_file), str(workspace / "*")
+        )
+
+        assert repos == [str(workspace / "beta"), str(workspace / "alpha")]
+
+    def test_run_batch_isolates_failures(self, workspace):
+        """Test del pool: un repositorio inválido no afecta al resto."""
+        ndjson = workspace / "all.ndjson"
+        writer = BatchWriter(str(workspace / "out"), str(ndjson))
+        repos = [
+            str(workspace / name) for name in ("alpha", "beta", "not_a_repo")
+        ]
+        try:
+            results = run_batch(
+                repos, {"timeout": 60}, workers=2, writer=writer
+            )
+        finally:
+            writer.close()
+
+        status = {Path(r["repo"]).name: r["status"] for r in results}
+        assert status == {"alpha": "ok", "beta": "ok", "not_a_repo": "error"}
+
+        lines = [json.loads(line) for line in ndjson.read_text().splitlines()]
+        assert len(lines) == 3
+        metrics_file = (
+            workspace / "out" / output_name(str(workspace / "alpha"))
+        )
+        assert json.loads(metrics_file.read_text())["total_commits"] == 1
+
+    def test_analyze_repo_load_modes_and_timeout(self, workspace, monkeypatch):
+        """Test de analyze_repo: snapshot, commit-graph y timeout."""
+        repo = str(workspace / "alpha")
+        cache = workspace / "cache"
+        for options in ({"cache_dir": str(cache)}, {"commit_graph": True}):
+            result = analyze_repo(repo, options)
+            assert result["status"] == "ok"
+            assert result["metrics"]["total_commits"] == 1
+        assert list(cache.glob("*.snapshot"))
+
+        def slow_load(self, **options):
+            time.sleep(5)
+
+        monkeypatch.setattr(batch.GitGraphAnalyzer, "load_git_data", slow_load)
+        result = analyze_repo(repo, {"timeout": 1})
+        assert result["status"] == "timeout"
+        assert result["elapsed_seconds"] < 5
+
+    def test_worker_crash_is_retried_in_isolation(
+        self, workspace, monkeypatch
+    ):
+        """Test de BrokenProcessPool: solo falla el repositorio culpable."""
+        monkeypatch.setattr(batch, "analyze_repo", crash_on_beta)
+        repos = [str(workspace / name) for name in ("beta", "alpha")]
+        results = run_batch(repos, {}, workers=1)
+
+        status = {Path(r["repo"]).name: r for r in results}
+        assert status["alpha"]["status"] == "ok"
+        assert status["beta"]["status"] == "error"
+        assert "código 3" in status["beta"]["error"]
+
+    def test_isolated_retry_timeout(self, workspace, monkeypatch):
+        """Test del timeout del reintento aislado con un worker colgado."""
+        monkeypatch.setattr(batch, "analyze_repo", hang)
+        monkeypatch.setattr(batch, "TIMEOUT_GRACE_SECONDS", 0)
+        start = time.monotonic()
+        result = _run_isolated(str(workspace / "alpha"), {"timeout": 1})
+        assert result["status"] == "timeout"
+        assert time.monotonic() - start < 30
+
+    def test_cli_incremental_and_key_order(self, workspace, capsys):
+        """Test de la CLI batch: --incremental sin --cache-dir y orden de claves."""
+        out = workspace / "out"
+        args = [
+            "--repos",
+            str(workspace / "alpha"),
+            str(workspace / "beta"),
+            "--output-dir",
+            str(out),
+            "--incremental",
+            "--verbose",
+        ]
+        assert main(args) == 0
+        assert "2/2 repositorios" in capsys.readouterr().out
+        assert len(list((out / "snapshots").glob("*.snapshot"))) == 2
+
+        metrics = json.loads(
+            (out / output_name(str(workspace / "alpha"))).read_text()
+        )
+        kinds = [isinstance(value, (dict, list)) for value in metrics.values()]
+        assert kinds == sorted(kinds)
+
+        assert main(["--repos-glob", str(workspace / "missing-*")]) == 1
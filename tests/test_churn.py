@@ -0,0 +1,115 @@
+import subprocess
+import pytest
+
+from src.churn import bus_factor, parse_numstat, split_shards
+from src.graph_anaylisis import GitGraphAnalyzer
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Historia con dos autores, un binario, un renombre y un merge."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q")
+    git(path, "config", "user.name", "Ana")
+    git(path, "config", "user.email", "ana@example.com")
+    (path / "a.txt").write_text("1\n2\n3\n")
+    (path / "logo.bin").write_bytes(b"\0\1\2")
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "Inicial")
+    git(path, "checkout", "-q", "-b", "feature")
+    (path / "a.txt").write_text("1\n2\n3\n4\n")
+    git(
+        path,
+        "commit",
+        "-q",
+        "-am",
+        "Cuarta línea",
+        "--author",
+        "Luis <luis@example.com>",
+    )
+    git(path, "checkout", "-q", "-")
+    git(path, "mv", "a.txt", "b.txt")
+    git(path, "commit", "-q", "-m", "Renombrar")
+    (path / "c.txt").write_text("x\n" * 10)
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "Diez líneas")
+    git(path, "merge", "-q", "--no-ff", "--no-edit", "feature")
+    return path
+
+
+class TestChurn:
+    """Casos de tests para las métricas de churn."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_churn_metrics(self, repo, workers, monkeypatch):
+        """Test de contadores por commit, archivos y autores (secuencial y en pool)."""
+        monkeypatch.setattr("src.churn.MIN_SHARD_SIZE", 1)
+        analyzer = GitGraphAnalyzer(str(repo))
+        analyzer.load_git_data()
+        churn = analyzer.calculate_churn(workers)
+
+        assert churn["commits"] == 5
+        assert (
+            churn["lines_added"] == 3 + 1 + 10 and churn["lines_deleted"] == 0
+        )
+        assert churn["binary_changes"] == 1
+        assert churn["max_lines_per_commit"] == 10
+        assert churn["authors"] == 2 and churn["bus_factor"] == 1
+        assert 0 < churn["author_entropy"] < 1
+        assert churn["hot_files"][0] == {
+            "path": "c.txt",
+            "commits": 1,
+            "lines": 10,
+        }
+        assert {"path": "b.txt", "commits": 1, "lines": 0} in churn[
+            "hot_files"
+        ]
+        assert churn["top_authors"][0]["author"] == "Ana"
+
+        counters = analyzer.churn_counters
+        by_hash = {
+            analyzer._store.hashes[i]: a
+            for i, a in zip(counters.ids, counters.added)
+        }
+        assert by_hash[git(repo, "rev-parse", "HEAD~1")] == 10
+        assert analyzer.get_metrics()["churn"] == churn
+
+    def test_parse_across_chunks(self):
+        """Test del parser con renombres y tokens cortados entre bloques."""
+        output = (
+            "\x01aa\0Ana\0\n2\t1\tx.txt\0-\t-\tbin\0"
+            "\x01bb\0Luis\0\n0\t0\t\0x.txt\0y.txt\0\x01cc\0Ana\0"
+        )
+        for size in (1, 3, len(output)):
+            chunks = (
+                output[i : i + size] for i in range(0, len(output), size)
+            )
+            counters = parse_numstat(chunks, {"aa": 0, "bb": 1, "cc": 2})
+            assert list(counters.ids) == [0, 1, 2]
+            assert list(counters.added) == [2, 0, 0] and list(
+                counters.deleted
+            ) == [1, 0, 0]
+            assert counters.files == {
+                "x.txt": [1, 3],
+                "bin": [1, 0],
+                "y.txt": [1, 0],
+            }
+            assert counters.authors == {"Ana": [2, 3], "Luis": [1, 0]}
+
+    def test_shards_and_bus_factor(self):
+        """Test del reparto en shards contiguos y del bus factor."""
+        shards = split_shards(10_000, 4)
+        assert shards[0][0] == 0 and shards[-1][1] == 10_000
+        assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+        assert len(shards) == 16 and split_shards(10, 4) == [(0, 10)]
+        assert (
+            bus_factor([50, 30, 20]) == 1 and bus_factor([30, 30, 20, 20]) == 2
+        )
+        assert bus_factor([]) == 0
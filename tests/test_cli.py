@@ -0,0 +1,96 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from src.__main__ import main
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Módulos que ningún comando debe importar solo por arrancar
+HEAVY_MODULES = (
+    "numpy",
+    "networkx",
+    "pandas",
+    "matplotlib",
+    "scipy",
+    "multiprocessing",
+)
+
+# Presupuesto de import acumulado de src al arrancar "analyze" (microsegundos)
+IMPORT_BUDGET_US = 300_000
+
+
+def import_times(*args):
+    """Tiempo acumulado de import por módulo (µs) según -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestCli:
+    """Casos de tests para el punto de entrada python -m src."""
+
+    def test_import_time_budget(self):
+        """Test de arranque sin dependencias pesadas y dentro del presupuesto."""
+        for command in ("analyze", "report", "daemon"):
+            times = import_times(command, "--help")
+            loaded = [
+                name for name in times if name.split(".")[0] in HEAVY_MODULES
+            ]
+            assert loaded == [], f"{command} importa {loaded}"
+
+        times = import_times("analyze", "--help")
+        assert times["src.graph_anaylisis"] < IMPORT_BUDGET_US
+
+    def test_pipeline_single_process(self, tmp_path, capsys):
+        """Test de analyze + report en un mismo proceso."""
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=Test",
+                "-c",
+                "user.email=t@example.com",
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                "Inicial",
+            ],
+            cwd=tmp_path,
+            check=True,
+        )
+
+        metrics = tmp_path / "metrics.json"
+        status = main(
+            [
+                "pipeline",
+                "--repo",
+                str(tmp_path),
+                "--output",
+                str(metrics),
+                "--report",
+                str(tmp_path / "report.md"),
+            ]
+        )
+        assert status == 0
+        assert metrics.exists()
+        assert "Generación de reporte completo" in capsys.readouterr().out
+
+    def test_unknown_command(self, capsys):
+        """Test de comando desconocido y ayuda."""
+        assert main(["nope"]) == 2
+        assert main(["--help"]) == 0
+        assert "pipeline" in capsys.readouterr().out
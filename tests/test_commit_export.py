@@ -0,0 +1,130 @@
+import csv
+import gzip
+import importlib.util
+import json
+
+import pytest
+
+from benchmarks.synthetic import generate_dag, rev_list_text
+from src.churn import ChurnCounters
+from src.commit_export import detect_format, export_commits
+from src.commit_store import CommitStore
+from src.graph_anaylisis import GitGraphAnalyzer
+
+
+def loaded_analyzer(size=300):
+    analyzer = GitGraphAnalyzer(".")
+    analyzer._parse_git_output(
+        rev_list_text(generate_dag(size, "mixed", seed=2))
+    )
+    analyzer._store.resolve()
+    analyzer._build_graph()
+    analyzer._calculate_levels()
+    analyzer._GitGraphAnalyzer__analyze_commit_types()
+    return analyzer
+
+
+class TestCommitExport:
+    """Casos de tests para la exportación por commit."""
+
+    def test_ndjson_rows_across_chunks(self, tmp_path):
+        """Test de NDJSON: una fila por commit, igual con cualquier tamaño de bloque."""
+        analyzer = loaded_analyzer()
+        store = analyzer._store
+        critical = set(store.hashes[::10])
+        analyzer.metrics["critical_merge_path"] = list(critical)
+
+        outputs = []
+        for chunk_size in (7, 1000):
+            path = tmp_path / f"commits-{chunk_size}.ndjson"
+            assert analyzer.export_commits(
+                str(path), chunk_size=chunk_size
+            ) == len(store)
+            outputs.append(path.read_text())
+        assert outputs[0] == outputs[1]
+
+        rows = [json.loads(line) for line in outputs[0].splitlines()]
+        assert len(rows) == len(store)
+        for i, row in enumerate(rows):
+            assert row["hash"] == store.hashes[i]
+            assert row["parents"] == len(store.parents(i))
+            assert row["children"] == len(store.children(i))
+            assert row["level"] == store.levels[i]
+            assert row["on_critical_path"] == (store.hashes[i] in critical)
+        assert {row["type"] for row in rows} >= {
+            "root",
+            "fast-forward",
+            "merge",
+        }
+
+    def test_compressed_csv_with_churn(self, tmp_path):
+        """Test de CSV comprimido por extensión, con columnas de churn."""
+        analyzer = loaded_analyzer(50)
+        churn = ChurnCounters()
+        churn.ids.extend([3, 1])
+        churn.added.extend([10, 5])
+        churn.deleted.extend([2, 0])
+        analyzer.churn_counters = churn
+
+        path = tmp_path / "commits.csv.gz"
+        analyzer.export_commits(str(path), chunk_size=16)
+        with gzip.open(path, "rt", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 50
+        assert (
+            rows[3]["lines_added"] == "10" and rows[3]["lines_deleted"] == "2"
+        )
+        assert rows[1]["lines_added"] == "5" and rows[0]["lines_added"] == "0"
+        assert rows[0]["on_critical_path"] == "False"
+
+    def test_formats_and_errors(self, tmp_path):
+        """Test de detección de formato, compresión y casos inválidos."""
+        assert detect_format("a.ndjson.xz") == ("ndjson", "xz")
+        assert detect_format("a.csv", "bz2") == ("csv", "bz2")
+        assert detect_format("a.parquet") == ("parquet", None)
+
+        store = CommitStore()
+        store.resolve()
+        store.build_children()
+        store.levels = []
+        assert export_commits(store, str(tmp_path / "empty.csv")) == 0
+        assert (
+            (tmp_path / "empty.csv")
+            .read_text()
+            .startswith("hash,parents,type")
+        )
+
+        with pytest.raises(ValueError):
+            export_commits(store, str(tmp_path / "commits.txt"))
+        with pytest.raises(ValueError):
+            export_commits(
+                store, str(tmp_path / "commits.csv"), compression="zstd"
+            )
+        with pytest.raises(ValueError):
+            export_commits(store, str(tmp_path / "commits.csv"), chunk_size=0)
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("pyarrow") is not None,
+        reason="pyarrow instalado",
+    )
+    def test_parquet_requires_pyarrow(self, tmp_path):
+        """Test de Parquet sin pyarrow: error claro y sin archivo a medias."""
+        with pytest.raises(RuntimeError):
+            loaded_analyzer(20).export_commits(
+                str(tmp_path / "commits.parquet")
+            )
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("pyarrow") is None, reason="requiere pyarrow"
+    )
+    def test_parquet_row_groups(self, tmp_path):
+        """Test de Parquet escrito por row groups."""
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "commits.parquet"
+        loaded_analyzer(100).export_commits(
+            str(path), compression="zstd", chunk_size=30
+        )
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_rows == 100 and parquet.num_row_groups == 4
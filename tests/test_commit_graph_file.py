@@ -0,0 +1,120 @@
+import pytest
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from src import commit_graph_file
+from src.commit_graph_file import CommitGraph
+from src.graph_anaylisis import GitGraphAnalyzer
+
+
+def git(repo, *args):
+    """Ejecutar un comando git en el repositorio de prueba."""
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+
+
+class TestCommitGraphFile:
+    """Casos de tests para el lector de commit-graph."""
+
+    @pytest.fixture
+    def octopus_repo(self):
+        """Repositorio con un merge octopus y commit-graph escrito."""
+        temp_dir = tempfile.mkdtemp()
+        repo = Path(temp_dir)
+        git(repo, "init", "-b", "main")
+        git(repo, "config", "user.name", "Test User")
+        git(repo, "config", "user.email", "test@example.com")
+        git(repo, "commit", "--allow-empty", "-m", "root")
+        for branch in ("a", "b", "c"):
+            git(repo, "checkout", "-q", "-b", branch, "main")
+            git(repo, "commit", "--allow-empty", "-m", branch)
+        git(repo, "checkout", "-q", "main")
+        git(repo, "merge", "--no-ff", "-m", "octopus", "a", "b", "c")
+        git(repo, "commit-graph", "write", "--reachable")
+
+        yield repo
+
+        shutil.rmtree(temp_dir)
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_parents_match_rev_list(
+        self, octopus_repo, monkeypatch, use_numpy
+    ):
+        """Test de decodificación de padres, incluido el chunk EDGE."""
+        if not use_numpy:
+            monkeypatch.setattr(commit_graph_file, "np", None)
+
+        graph = CommitGraph.open(octopus_repo / ".git" / "objects")
+        try:
+            oids = graph.oids()
+            offsets, parent_ids = graph.parent_csr()
+            decoded = {
+                oids[i]: [
+                    oids[p] for p in parent_ids[offsets[i] : offsets[i + 1]]
+                ]
+                for i in range(len(graph))
+            }
+        finally:
+            graph.close()
+
+        expected = {}
+        for line in git(
+            octopus_repo, "rev-list", "--all", "--parents"
+        ).splitlines():
+            commit, *parents = line.split()
+            expected[commit] = parents
+
+        assert decoded == expected
+        assert max(len(parents) for parents in decoded.values()) == 4
+
+    def test_load_from_commit_graph_with_new_commits(self, octopus_repo):
+        """Test de carga mixta: commit-graph más commits posteriores."""
+        git(octopus_repo, "commit", "--allow-empty", "-m", "posterior")
+
+        analyzer = GitGraphAnalyzer(str(octopus_repo))
+        assert analyzer.load_from_commit_graph() is True
+
+        full = GitGraphAnalyzer(str(octopus_repo))
+        full.load_git_data()
+
+        def summary(analyzer):
+            return {
+                h: (info["parents"], info["type"], sorted(info["children"]))
+                for h, info in analyzer.commits.items()
+            }
+
+        assert summary(analyzer) == summary(full)
+        assert dict(analyzer.levels) == dict(full.levels)
+
+    def test_stale_commit_graph_and_loose_tags(self, octopus_repo):
+        """Test de commit-graph con ramas borradas y tags anotados sueltos."""
+        git(octopus_repo, "checkout", "-q", "-b", "temporal")
+        git(octopus_repo, "commit", "--allow-empty", "-m", "descartado")
+        git(octopus_repo, "checkout", "-q", "main")
+        git(octopus_repo, "commit-graph", "write", "--reachable")
+        git(octopus_repo, "branch", "-q", "-D", "temporal")
+        git(octopus_repo, "branch", "-q", "-D", "c")
+        git(octopus_repo, "tag", "-a", "v1.0", "-m", "Versión 1.0", "HEAD~1")
+
+        analyzer = GitGraphAnalyzer(str(octopus_repo))
+        assert analyzer.load_from_commit_graph() is True
+        expected = git(octopus_repo, "rev-list", "--all").split()
+        assert sorted(analyzer.commits) == sorted(expected)
+        assert analyzer.generate_summary_stats()["total_commits"] == 5
+        # El tag suelto se pela sin lanzar git rev-list
+        assert not [
+            event
+            for event in analyzer.profiler.events
+            if event["cat"] == "subprocess"
+        ]
+
+    def test_missing_commit_graph_falls_back(self, octopus_repo):
+        """Test del fallback a git rev-list sin archivo commit-graph."""
+        (octopus_repo / ".git" / "objects" / "info" / "commit-graph").unlink()
+
+        analyzer = GitGraphAnalyzer(str(octopus_repo))
+        assert analyzer.load_from_commit_graph() is False
+        assert len(analyzer.commits) == 5
@@ -0,0 +1,102 @@
+import pytest
+from array import array
+
+from src import commit_store
+from src.commit_store import (
+    CommitStore,
+    CommitsView,
+    LevelsView,
+    assign_levels,
+    MERGE,
+    ROOT,
+    UNKNOWN,
+)
+
+
+class TestCommitStore:
+    """Casos de tests para CommitStore."""
+
+    @pytest.fixture
+    def store(self):
+        """Historia en orden de rev-list: hijos antes que padres."""
+        store = CommitStore()
+        store.add_commit("merge", ["a", "b"])
+        store.add_commit("a", ["root"])
+        store.add_commit("b", ["root", "outside"])
+        store.add_commit("root", [])
+        store.resolve()
+        return store
+
+    def test_ids_and_parents(self, store):
+        """Test de internado de hashes y resolución de padres."""
+        assert len(store) == 4
+        assert store.hashes == ["merge", "a", "b", "root"]
+        assert list(store.parents(store.index["merge"])) == [1, 2]
+        assert store.external_hashes == ["outside"]
+        assert store.hash_of(store.parents(2)[1]) == "outside"
+        assert store.types[store.index["root"]] == ROOT
+        assert store.types[store.index["a"]] == UNKNOWN
+
+    def test_children_csr(self, store):
+        """Test del CSR de hijos construido desde los padres."""
+        assert sorted(store.children(store.index["root"])) == [1, 2]
+        assert list(store.children(store.index["a"])) == [0]
+        assert list(store.children(store.index["merge"])) == []
+
+    def test_children_numpy_matches_python(self, store, monkeypatch):
+        """Test de equivalencia entre la ruta vectorizada y la de Python."""
+        pytest.importorskip("numpy")
+        expected = (
+            array("q", store.child_offsets),
+            array("q", store.child_ids),
+        )
+
+        calls = []
+        numpy_builder = CommitStore._build_children_numpy
+
+        def spy(self, n):
+            calls.append(n)
+            numpy_builder(self, n)
+
+        monkeypatch.setattr(commit_store, "NUMPY_MIN_EDGES", 0)
+        monkeypatch.setattr(CommitStore, "_build_children_numpy", spy)
+        store._child_offsets = store._child_ids = None
+        store.build_children()
+
+        assert calls == [len(store)]
+        assert (
+            array("q", store.child_offsets),
+            array("q", store.child_ids),
+        ) == expected
+
+    def test_roots_ignore_external_parents(self, store):
+        """Test de raíces: commits sin padres cargados."""
+        assert store.roots() == [store.index["root"]]
+
+    def test_views(self, store):
+        """Test de las vistas de solo lectura."""
+        assign_levels(store, {"root": 0, "a": 1})
+        commits = CommitsView(store)
+        levels = LevelsView(store)
+
+        assert "merge" in commits
+        assert commits["b"]["parents"] == ["root", "outside"]
+        assert commits["root"]["type"] == "root"
+        assert dict(levels) == {"root": 0, "a": 1}
+        with pytest.raises(KeyError):
+            levels["merge"]
+
+    def test_from_mapping_keeps_types(self):
+        """Test de construcción desde el formato dict-of-dicts."""
+        store = CommitStore.from_mapping(
+            {
+                "head": {"parents": ["base"], "type": "merge"},
+                "base": {"parents": []},
+            }
+        )
+
+        assert store.types[store.index["head"]] == MERGE
+        assert store.types[store.index["base"]] == ROOT
+        assert list(store.parents(store.index["head"])) == [
+            store.index["base"]
+        ]
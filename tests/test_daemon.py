@@ -0,0 +1,158 @@
+import asyncio
+import subprocess
+import threading
+import time
+import pytest
+
+from src.daemon import AnalysisServer, DaemonClient, RepoState
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repositorio con una rama y un tag."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q")
+    git(path, "config", "user.name", "Test User")
+    git(path, "config", "user.email", "test@example.com")
+    git(path, "commit", "--allow-empty", "-m", "Inicial")
+    git(path, "tag", "v0.0.0")
+    git(path, "checkout", "-q", "-b", "feature")
+    git(path, "commit", "--allow-empty", "-m", "Feature")
+    git(path, "checkout", "-q", "-")
+    return path
+
+
+@pytest.fixture
+def server(repo, tmp_path):
+    """Servidor en un hilo con su propio event loop; retorna el socket."""
+    loop = asyncio.new_event_loop()
+    daemon = AnalysisServer(
+        [str(repo)], str(tmp_path / "cache"), poll_interval=0.05
+    )
+    socket_path = str(tmp_path / "daemon.sock")
+    loop.run_until_complete(daemon.start(socket_path))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield socket_path
+
+    asyncio.run_coroutine_threadsafe(daemon.close(), loop).result(timeout=10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=10)
+    loop.close()
+
+
+class TestDaemon:
+    """Casos de tests para el servidor de análisis."""
+
+    def test_queries(self, repo, server):
+        """Test de métricas, ancestros y errores sobre el socket."""
+        with DaemonClient(server) as client:
+            assert client.request("ping") == "pong"
+            metrics = client.request("metrics")
+            assert metrics["total_commits"] == 2
+            assert client.request(
+                "is_ancestor", ancestor="v0.0.0", descendant="feature"
+            )
+            assert client.request(
+                "merge_base", first="feature", second="HEAD"
+            ) == git(repo, "rev-parse", "HEAD")
+            paths = client.request("critical_path", targets=["v0.0.0"])
+            assert paths == {"v0.0.0": [git(repo, "rev-parse", "v0.0.0")]}
+
+            with pytest.raises(RuntimeError, match="Operación desconocida"):
+                client.request("nope")
+            with pytest.raises(RuntimeError, match="KeyError"):
+                client.request("is_ancestor", ancestor="v0.0.0")
+            with pytest.raises(RuntimeError, match="TypeError"):
+                client.request(
+                    "metric", name="critical_merge_path", params={"bogus": 1}
+                )
+            # La conexión sigue utilizable tras un error
+            assert client.request("ping") == "pong"
+
+    def test_refs_change_triggers_incremental_update(self, repo, server):
+        """Test de recarga incremental al cambiar las refs."""
+        with DaemonClient(server) as client:
+            assert (
+                client.request("metric", name="summary_stats")["total_commits"]
+                == 2
+            )
+            git(
+                repo,
+                "merge",
+                "-q",
+                "--no-ff",
+                "-m",
+                "Merge feature",
+                "feature",
+            )
+
+            deadline = time.monotonic() + 10
+            while (
+                client.request("metric", name="summary_stats")["total_commits"]
+                != 3
+            ):
+                assert (
+                    time.monotonic() < deadline
+                ), "el servidor no recargó el DAG"
+                time.sleep(0.05)
+
+            repos = client.request("repos")
+            assert repos[str(repo)]["reloads"] == 2
+            assert client.request("reload") == {"incremental": True}
+
+    def test_reload_keeps_profile_bounded(self, repo, tmp_path):
+        """Test de perfil y memo del documento tras varias recargas."""
+        state = RepoState(str(repo), str(tmp_path / "cache"))
+        state.load()
+        counts = []
+        for _ in range(3):
+            git(repo, "commit", "--allow-empty", "-m", "Otro")
+            state.load()
+            counts.append(
+                len(state.metrics()["metadata"]["profile"]["subprocesses"])
+            )
+        # Solo los subprocesos de la última recarga
+        assert counts[0] == counts[1] == counts[2]
+        assert state.metrics()["total_commits"] == 5
+
+        # Mismos parámetros en otro orden: se reutiliza el documento
+        engine = state.analyzer.metric_engine
+        engine.compute("critical_merge_paths", targets=["v0.0.0"])
+        assert state.metrics() is state.metrics()
+        engine.requests.pop("summary_stats")
+        engine.requests["summary_stats"] = {}
+        assert state.metrics() is state.metrics()
+
+    def test_queries_do_not_grow_profile(self, repo, tmp_path):
+        """Test de que cada consulta descarta los eventos de la anterior."""
+        from src.daemon import OPERATIONS
+
+        state = RepoState(str(repo), str(tmp_path / "cache"))
+        state.load()
+        sizes = []
+        for tag in ("v0.0.0", "feature", "HEAD"):
+            state.run(OPERATIONS["critical_path"], {"targets": [tag]})
+            sizes.append(len(state.analyzer.profiler.events))
+        assert sizes[0] == sizes[1] == sizes[2]
+        # El documento de métricas sigue incluyendo las fases de la carga
+        phases = state.run(OPERATIONS["metrics"], {})["metadata"]["profile"][
+            "phases"
+        ]
+        assert "save_snapshot" in phases
+
+    def test_commit_uses_git_ref_candidates(self, repo, tmp_path):
+        """Test de resolución de nombres como refs/<nombre>."""
+        state = RepoState(str(repo), str(tmp_path / "cache"))
+        state.load()
+        sha = git(repo, "rev-parse", "feature")
+        assert state.commit("heads/feature") == sha
+        assert state.commit("v0.0.0") == git(repo, "rev-parse", "v0.0.0")
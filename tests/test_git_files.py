@@ -0,0 +1,106 @@
+import subprocess
+import pytest
+
+from src.git_files import (
+    find_git_dir,
+    peel_loose_tag,
+    read_refs,
+    ref_candidates,
+)
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repositorio con dos commits, una rama y tags ligero y anotado."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    git(path, "config", "user.name", "Test User")
+    git(path, "config", "user.email", "test@example.com")
+    git(path, "commit", "--allow-empty", "-m", "Inicial")
+    git(path, "tag", "ligero")
+    git(path, "tag", "-a", "v1.0", "-m", "Versión 1.0")
+    git(path, "branch", "feature")
+    git(path, "commit", "--allow-empty", "-m", "Segundo")
+    return path
+
+
+def expected_refs(repo):
+    """Refs según git, con los tags anotados pelados."""
+    refs = {}
+    for line in git(repo, "show-ref", "--head", "--dereference").splitlines():
+        sha, _, name = line.partition(" ")
+        refs[name[:-3] if name.endswith("^{}") else name] = sha
+    return refs
+
+
+class TestGitFiles:
+    """Casos de tests para la lectura de refs sin subprocesos."""
+
+    def test_packed_refs_with_peeled_tags(self, repo):
+        """Test de packed-refs: tags anotados pelados y refs sueltas encima."""
+        git(repo, "pack-refs", "--all")
+        assert "^" in (repo / ".git" / "packed-refs").read_text()
+        # Una ref suelta nueva tiene prioridad sobre la empaquetada
+        git(repo, "branch", "-f", "feature", "main")
+
+        refs = read_refs(repo / ".git")
+        assert refs == expected_refs(repo)
+        assert refs["refs/tags/v1.0"] == git(
+            repo, "rev-parse", "v1.0^{commit}"
+        )
+
+    def test_loose_annotated_tag_and_detached_head(self, repo):
+        """Test de tags anotados sueltos (sha del tag) y HEAD desacoplado."""
+        git(repo, "checkout", "-q", "--detach", "HEAD~1")
+        refs = read_refs(repo / ".git")
+
+        tag_object = git(repo, "rev-parse", "v1.0")
+        assert refs["refs/tags/v1.0"] == tag_object
+        assert refs["HEAD"] == git(repo, "rev-parse", "HEAD")
+
+        commit = git(repo, "rev-parse", "v1.0^{commit}")
+        assert peel_loose_tag(repo / ".git", tag_object) == commit
+        assert peel_loose_tag(repo / ".git", commit) is None
+        assert peel_loose_tag(repo / ".git", "0" * 40) is None
+
+        # Tag de un tag: se sigue hasta el commit
+        git(repo, "tag", "-a", "doble", "-m", "Tag de tag", "v1.0")
+        assert (
+            peel_loose_tag(repo / ".git", git(repo, "rev-parse", "doble"))
+            == commit
+        )
+
+    def test_find_git_dir_variants(self, repo, tmp_path):
+        """Test de repositorio normal, worktree, bare y directorio sin git."""
+        assert find_git_dir(str(repo)) == repo / ".git"
+
+        worktree = tmp_path / "worktree"
+        git(repo, "worktree", "add", "-q", str(worktree), "feature")
+        assert find_git_dir(str(worktree)) == (repo / ".git").resolve()
+
+        bare = tmp_path / "bare.git"
+        git(tmp_path, "clone", "-q", "--bare", str(repo), str(bare))
+        assert find_git_dir(str(bare)) == bare
+        assert read_refs(bare)["HEAD"] == git(repo, "rev-parse", "main")
+
+        assert find_git_dir(str(tmp_path)) is None
+        (tmp_path / "broken").mkdir()
+        (tmp_path / "broken" / ".git").write_text("no es un gitdir\n")
+        assert find_git_dir(str(tmp_path / "broken")) is None
+
+    def test_ref_candidates(self):
+        """Test del orden en que se prueban los nombres cortos."""
+        assert ref_candidates("v1.0") == [
+            "v1.0",
+            "refs/v1.0",
+            "refs/tags/v1.0",
+            "refs/heads/v1.0",
+            "refs/remotes/v1.0",
+        ]
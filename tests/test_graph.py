@@ -1,3 +1,5 @@
+import os
+import sys
 import pytest
 import json
 import subprocess
@@ -8,6 +10,7 @@ from unittest.mock import patch, MagicMock
 
 from src.graph_anaylisis import GitGraphAnalyzer
 
+
 class TestGitGraphAnalyzer:
     """Casos de tests para GitGraphAnalyzer."""
 
@@ -18,25 +21,35 @@ class TestGitGraphAnalyzer:
         repo_path = Path(temp_dir)
 
         # Configurar un repositorio git mínimo
-        subprocess.run(["git", "init"], cwd=repo_path, check=True, 
-                      capture_output=True)
-        subprocess.run(["git", "config", "user.name", "Test User"], 
-                      cwd=repo_path, check=True)
-        subprocess.run(["git", "config", "user.email", "test@example.com"], 
-                      cwd=repo_path, check=True)
-        
+        subprocess.run(
+            ["git", "init"], cwd=repo_path, check=True, capture_output=True
+        )
+        subprocess.run(
+            ["git", "config", "user.name", "Test User"],
+            cwd=repo_path,
+            check=True,
+        )
+        subprocess.run(
+            ["git", "config", "user.email", "test@example.com"],
+            cwd=repo_path,
+            check=True,
+        )
+
         # Crear un commit inicial
         test_file = repo_path / "test.txt"
         test_file.write_text("Contenido inicial")
         subprocess.run(["git", "add", "test.txt"], cwd=repo_path, check=True)
-        subprocess.run(["git", "commit", "-m", "Commit inicial"], 
-                      cwd=repo_path, check=True)
-        
+        subprocess.run(
+            ["git", "commit", "-m", "Commit inicial"],
+            cwd=repo_path,
+            check=True,
+        )
+
         yield repo_path
-        
+
         # Limpiar
         shutil.rmtree(temp_dir)
-        
+
     def test_initialization(self):
         """Test de inicialización del analizador."""
         analyzer = GitGraphAnalyzer(".")
@@ -48,141 +61,450 @@ class TestGitGraphAnalyzer:
         """Test de carga de datos git desde un repositorio real."""
         analyzer = GitGraphAnalyzer(str(temp_repo))
         analyzer.load_git_data()
-        
+
         assert len(analyzer.commits) >= 1
         assert analyzer.graph.number_of_nodes() >= 1
-    
-    @patch('subprocess.check_output')
+
+    def test_load_git_data_stream(self, temp_repo):
+        """Test de carga en streaming: mismos commits que el modo normal."""
+        buffered = GitGraphAnalyzer(str(temp_repo))
+        buffered.load_git_data()
+
+        seen = []
+        streamed = GitGraphAnalyzer(str(temp_repo))
+        streamed.load_git_data(
+            stream=True, progress=seen.append, progress_interval=1
+        )
+
+        assert set(streamed.commits) == set(buffered.commits)
+        assert seen[-1] == len(streamed.commits)
+
+    def test_load_git_data_stream_memory_limit(self, temp_repo):
+        """Test del límite de memoria en modo streaming."""
+        pytest.importorskip("resource")
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+
+        with pytest.raises(RuntimeError):
+            analyzer.load_git_data(
+                stream=True, progress_interval=1, max_memory_mb=0
+            )
+
+    def test_load_incremental(self, temp_repo):
+        """Test de carga incremental con snapshot y fallback por force-push."""
+        snapshot = temp_repo / "metrics.json.snapshot"
+
+        def commit(message):
+            (temp_repo / "test.txt").write_text(message)
+            subprocess.run(
+                ["git", "commit", "-am", message],
+                cwd=temp_repo,
+                check=True,
+                capture_output=True,
+            )
+
+        assert (
+            GitGraphAnalyzer(str(temp_repo)).load_incremental(snapshot)
+            is False
+        )
+
+        commit("Segundo commit")
+        commit("Tercer commit")
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+        assert analyzer.load_incremental(snapshot) is True
+
+        full = GitGraphAnalyzer(str(temp_repo))
+        full.load_git_data()
+        assert dict(analyzer.levels) == dict(full.levels)
+        assert {h: analyzer.commits[h]["type"] for h in analyzer.commits} == {
+            h: full.commits[h]["type"] for h in full.commits
+        }
+
+        # Reescribir la historia obliga a reconstruir
+        subprocess.run(
+            ["git", "reset", "--hard", "HEAD~1"],
+            cwd=temp_repo,
+            check=True,
+            capture_output=True,
+        )
+        commit("Commit reescrito")
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+        assert analyzer.load_incremental(snapshot) is False
+        assert len(analyzer.commits) == 3
+
+    def test_load_incremental_releases_mapping(self, temp_repo, monkeypatch):
+        """El snapshot mapeado se cierra antes de reemplazar el archivo."""
+        from src import graph_anaylisis, snapshot as snapshot_module
+
+        path = temp_repo / "metrics.json.snapshot"
+        GitGraphAnalyzer(str(temp_repo)).load_incremental(path)
+
+        mappings = []
+        original_load = graph_anaylisis.load_snapshot
+        original_replace = snapshot_module.os.replace
+
+        def load(*args, **kwargs):
+            result = original_load(*args, **kwargs)
+            mappings.append(result[0]._mapping)
+            return result
+
+        def replace(src, dst):
+            assert all(mapping.closed for mapping in mappings)
+            original_replace(src, dst)
+
+        monkeypatch.setattr(graph_anaylisis, "load_snapshot", load)
+        monkeypatch.setattr(snapshot_module.os, "replace", replace)
+
+        # Sin commits nuevos el store seguiría mapeado sobre el archivo
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+        assert analyzer.load_incremental(path) is True
+        assert analyzer._store._mapping is None
+        assert len(analyzer.commits) == 1
+
+        # Snapshot descartado al cambiar las opciones de carga
+        assert (
+            GitGraphAnalyzer(str(temp_repo)).load_incremental(
+                path, timestamps=True
+            )
+            is False
+        )
+        assert len(mappings) == 2
+
+    @patch("subprocess.check_output")
     def test_parse_git_output(self, mock_subprocess):
         """Test de análisis de salida de git rev-list."""
         mock_output = """abc123 def456
         def456
         ghi789 def456 jkl012
         """
-                
+
         mock_subprocess.return_value = mock_output
-        
+
         analyzer = GitGraphAnalyzer(".")
         analyzer.load_git_data()
-        
+
         # Verificar que los commits se parsearon correctamente
         assert len(analyzer.commits) == 3
-        assert 'abc123' in analyzer.commits
-        assert analyzer.commits['abc123']['parents'] == ['def456']
-        assert analyzer.commits['def456']['parents'] == []
-        assert analyzer.commits['ghi789']['parents'] == ['def456', 'jkl012']
-    
+        assert "abc123" in analyzer.commits
+        assert analyzer.commits["abc123"]["parents"] == ["def456"]
+        assert analyzer.commits["def456"]["parents"] == []
+        assert analyzer.commits["ghi789"]["parents"] == ["def456", "jkl012"]
+
     def test_calculate_branch_density(self):
         """Test de cálculo de densidad de ramas."""
         analyzer = GitGraphAnalyzer(".")
-        
+
         # Configurar datos de prueba
         analyzer.commits = {
-            'commit1': {'parents': [], 'children': ['commit2'], 'type': 'root'},
-            'commit2': {'parents': ['commit1'], 'children': ['commit3'], 'type': 'fast-forward'},
-            'commit3': {'parents': ['commit2'], 'children': [], 'type': 'fast-forward'}
+            "commit1": {
+                "parents": [],
+                "children": ["commit2"],
+                "type": "root",
+            },
+            "commit2": {
+                "parents": ["commit1"],
+                "children": ["commit3"],
+                "type": "fast-forward",
+            },
+            "commit3": {
+                "parents": ["commit2"],
+                "children": [],
+                "type": "fast-forward",
+            },
         }
-        analyzer.levels = {'commit1': 0, 'commit2': 1, 'commit3': 2}
-        
+        analyzer.levels = {"commit1": 0, "commit2": 1, "commit3": 2}
+
         density = analyzer.calculate_branch_density()
         expected = 3 / 3  # 3 nodos, max nivel 2 (hasta 3 niveles en total)
         assert density == expected
-    
+
     def test_calculate_historical_entropy(self):
         """Test historical entropy calculation."""
         analyzer = GitGraphAnalyzer(".")
-        
+
         # Configurar datos de prueba: 2 merges, 1 fast-forward
         analyzer.commits = {
-            'commit1': {'type': 'root'},
-            'commit2': {'type': 'fast-forward'},
-            'commit3': {'type': 'merge'},
-            'commit4': {'type': 'merge'}
+            "commit1": {"type": "root"},
+            "commit2": {"type": "fast-forward"},
+            "commit3": {"type": "merge"},
+            "commit4": {"type": "merge"},
         }
-        
+
         entropy = analyzer.calculate_historical_entropy()
-        
+
         # Expected: p(merge) = 2/3, p(fast-forward) = 1/3
         # H = -(2/3 * log2(2/3) + 1/3 * log2(1/3))
         import math
-        expected = -(2/3 * math.log2(2/3) + 1/3 * math.log2(1/3))
+
+        expected = -(2 / 3 * math.log2(2 / 3) + 1 / 3 * math.log2(1 / 3))
         assert abs(entropy - expected) < 0.001
 
     def test_calculate_historical_entropy(self):
         """Test cálculo de entropía histórica."""
         analyzer = GitGraphAnalyzer(".")
-        
+
         # Configurar datos de prueba: 2 merges, 1 fast-forward
         analyzer.commits = {
-            'commit1': {'type': 'root'},
-            'commit2': {'type': 'fast-forward'},
-            'commit3': {'type': 'merge'},
-            'commit4': {'type': 'merge'}
+            "commit1": {"type": "root"},
+            "commit2": {"type": "fast-forward"},
+            "commit3": {"type": "merge"},
+            "commit4": {"type": "merge"},
         }
-        
+
         entropy = analyzer.calculate_historical_entropy()
-        
+
         # Expected: p(merge) = 2/3, p(fast-forward) = 1/3
         # H = -(2/3 * log2(2/3) + 1/3 * log2(1/3))
         import math
-        expected = -(2/3 * math.log2(2/3) + 1/3 * math.log2(1/3))
+
+        expected = -(2 / 3 * math.log2(2 / 3) + 1 / 3 * math.log2(1 / 3))
         assert abs(entropy - expected) < 0.001
-    
+
     def test_find_critical_merge_path_simple(self):
         """Test critical merge path finding."""
         analyzer = GitGraphAnalyzer(".")
-        
+
         # Configurar historia lineal simple
         analyzer.commits = {
-            'head': {'parents': ['middle'], 'children': [], 'type': 'fast-forward'},
-            'middle': {'parents': ['old'], 'children': ['head'], 'type': 'merge'},
-            'old': {'parents': [], 'children': ['middle'], 'type': 'root'}
+            "head": {
+                "parents": ["middle"],
+                "children": [],
+                "type": "fast-forward",
+            },
+            "middle": {
+                "parents": ["old"],
+                "children": ["head"],
+                "type": "merge",
+            },
+            "old": {"parents": [], "children": ["middle"], "type": "root"},
         }
         analyzer._build_graph()
-        
-        with patch('subprocess.check_output') as mock_subprocess:
-            mock_subprocess.side_effect = ['head', 'old']
+
+        with patch("subprocess.check_output") as mock_subprocess:
+            mock_subprocess.side_effect = ["head", "old"]
             path = analyzer.find_critical_merge_path()
-            
-            assert 'head' in path
-            assert 'old' in path
+
+            assert "head" in path
+            assert "old" in path
+
+    def test_find_critical_merge_paths_multiple_tags(self, temp_repo):
+        """Test de rutas a varios tags (glob y tag anotado) en un solo recorrido."""
+
+        def git(*args):
+            subprocess.run(
+                ["git", *args], cwd=temp_repo, check=True, capture_output=True
+            )
+
+        git("tag", "v1.0.0")
+        git("commit", "--allow-empty", "-m", "Segundo")
+        git("tag", "-a", "v2.0.0", "-m", "Release 2")
+        git("commit", "--allow-empty", "-m", "Tercero")
+
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+        analyzer.load_git_data()
+        head = analyzer._read_ref_tips()["HEAD"]
+
+        with patch(
+            "subprocess.check_output", wraps=subprocess.check_output
+        ) as spy:
+            paths = analyzer.find_critical_merge_paths(["v*"])
+            assert spy.call_count == 1
+
+        assert set(paths) == {"v1.0.0", "v2.0.0"}
+        assert len(paths["v1.0.0"]) == 3
+        assert len(paths["v2.0.0"]) == 2
+        assert all(path[0] == head for path in paths.values())
+        assert analyzer.metrics["critical_merge_paths"] == paths
+
+        resolved = analyzer.resolve_refs(["HEAD~2", "no-existe"])
+        assert resolved["HEAD~2"] == paths["v1.0.0"][-1]
+        assert resolved["no-existe"] is None
+
+    def test_load_git_data_bounded(self, temp_repo):
+        """Test de historia acotada: commits del borde no son root y metadata de ventana."""
+
+        def git(*args, date=None):
+            env = None
+            if date is not None:
+                env = {**os.environ, "GIT_COMMITTER_DATE": date}
+            subprocess.run(
+                ["git", *args],
+                cwd=temp_repo,
+                check=True,
+                capture_output=True,
+                env=env,
+            )
+
+        git(
+            "commit",
+            "--allow-empty",
+            "-m",
+            "Viejo",
+            date="2020-01-01T00:00:00Z",
+        )
+        git("checkout", "-b", "feature")
+        git(
+            "commit",
+            "--allow-empty",
+            "-m",
+            "Feature",
+            date="2030-01-01T00:00:00Z",
+        )
+        git("checkout", "-")
+        git(
+            "commit",
+            "--allow-empty",
+            "-m",
+            "Nuevo",
+            date="2030-01-02T00:00:00Z",
+        )
+
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+        analyzer.load_git_data(max_commits=2)
+        stats = analyzer.generate_summary_stats()
+        assert stats["total_commits"] == 2
+        assert stats["root_commits"] == 0
+        assert stats["fast_forward_commits"] == 2
+
+        metadata = analyzer.collect_metrics()["metadata"]
+        assert metadata["window"]["bounded"] is True
+        assert metadata["window"]["max_commits"] == 2
+        assert metadata["window"]["boundary_commits"] == 2
+
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+        analyzer.load_git_data(since="2029-01-01", refs=["feature"])
+        assert len(analyzer.commits) == 1
+        assert analyzer.describe_window()["refs"] == ["feature"]
+
+        with pytest.raises(ValueError):
+            analyzer.load_incremental(
+                str(temp_repo / "s.snapshot"), since="2029-01-01"
+            )
+
+    def test_ancestry_queries(self, temp_repo):
+        """Test de is_ancestor, merge_base y commits_between contra git."""
+
+        def git(*args):
+            return subprocess.run(
+                ["git", *args],
+                cwd=temp_repo,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+
+        git("tag", "base")
+        git("checkout", "-q", "-b", "feature")
+        git("commit", "--allow-empty", "-m", "Feature")
+        git("checkout", "-q", "-")
+        git("commit", "--allow-empty", "-m", "Principal")
+
+        analyzer = GitGraphAnalyzer(str(temp_repo))
+        analyzer.load_git_data()
+
+        assert analyzer.is_ancestor("base", "feature") is True
+        assert analyzer.is_ancestor("feature", "HEAD") is False
+        assert analyzer.merge_base("feature", "HEAD") == git(
+            "merge-base", "feature", "HEAD"
+        )
+        assert analyzer.commits_between("HEAD", "feature") == [
+            git("rev-parse", "feature")
+        ]
 
     def test_export_metrics(self, temp_repo):
         """Test métrica de exportación a JSON."""
         analyzer = GitGraphAnalyzer(str(temp_repo))
         analyzer.load_git_data()
-        
+
         output_file = temp_repo / "test_metrics.json"
         analyzer.export_metrics(str(output_file))
-        
+
         # Verificar que el archivo se creó
         assert output_file.exists()
-        
+
         with open(output_file) as f:
             metrics = json.load(f)
-        
+
         # Verificar que las métricas contienen los campos esperados
-        assert 'branch_density' in metrics
-        assert 'historical_entropy' in metrics
-        assert 'total_commits' in metrics
-        assert 'metadata' in metrics
+        assert "branch_density" in metrics
+        assert "historical_entropy" in metrics
+        assert "total_commits" in metrics
+        assert "metadata" in metrics
 
     def test_levels_calculation(self):
         """Test commit level calculation."""
         analyzer = GitGraphAnalyzer(".")
-        
+
         # Cofigurar estructura ramificada
         # Estructura: root -> a, b; a -> merge; b -> merge
         analyzer.commits = {
-            'root': {'parents': [], 'children': ['a', 'b']},
-            'a': {'parents': ['root'], 'children': ['merge']},
-            'b': {'parents': ['root'], 'children': ['merge']},
-            'merge': {'parents': ['a', 'b'], 'children': []}
+            "root": {"parents": [], "children": ["a", "b"]},
+            "a": {"parents": ["root"], "children": ["merge"]},
+            "b": {"parents": ["root"], "children": ["merge"]},
+            "merge": {"parents": ["a", "b"], "children": []},
         }
         analyzer._build_graph()
         analyzer._calculate_levels()
-        
-        assert analyzer.levels['root'] == 0
-        assert analyzer.levels['a'] == 1
-        assert analyzer.levels['b'] == 1
-        assert analyzer.levels['merge'] == 2
+
+        assert analyzer.levels["root"] == 0
+        assert analyzer.levels["a"] == 1
+        assert analyzer.levels["b"] == 1
+        assert analyzer.levels["merge"] == 2
+
+    def test_lazy_networkx_graph(self):
+        """Test de la vista networkx: solo al acceder y por versión del grafo."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from src.graph_anaylisis import GitGraphAnalyzer; "
+                "print('networkx' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
+
+        analyzer = GitGraphAnalyzer(".")
+        analyzer._parse_git_output("c a b\nb a\na\n")
+        analyzer._build_graph()
+        assert analyzer._graph is None
+
+        graph = analyzer.graph
+        assert sorted(graph.edges()) == [("a", "b"), ("a", "c"), ("b", "c")]
+        assert analyzer.graph is graph
+        analyzer._build_graph()
+        assert analyzer.graph is not graph
+
+    def test_adjacency_matrix(self, tmp_path):
+        """Test de la matriz CSR padre -> hijo y su exportación a .npz."""
+        np = pytest.importorskip("numpy")
+        analyzer = GitGraphAnalyzer(".")
+        analyzer._parse_git_output("c a b\nb a\na\n")
+        analyzer._build_graph()
+        ids = analyzer._store.index
+
+        matrix = analyzer.adjacency_matrix()
+        if hasattr(matrix, "toarray"):
+            dense = matrix.toarray()
+        else:
+            dense = np.zeros(matrix.shape, dtype=int)
+            for row in range(matrix.shape[0]):
+                dense[
+                    row,
+                    matrix.indices[
+                        matrix.indptr[row] : matrix.indptr[row + 1]
+                    ],
+                ] = 1
+        expected = np.zeros((3, 3), dtype=int)
+        for parent, child in [("a", "b"), ("a", "c"), ("b", "c")]:
+            expected[ids[parent], ids[child]] = 1
+        assert (dense == expected).all()
+
+        output = tmp_path / "adjacency.npz"
+        analyzer.export_adjacency(str(output))
+        with np.load(output) as data:
+            assert data["format"].item() == b"csr"
+            assert list(data["shape"]) == [3, 3]
+            assert list(data["indptr"]) == list(analyzer._store.child_offsets)
+            assert [h.decode() for h in data["hashes"]] == ["c", "b", "a"]
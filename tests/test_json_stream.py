@@ -0,0 +1,84 @@
+import io
+import json
+import random
+import pytest
+
+from src.json_stream import StreamedArray, iter_object, materialize
+
+
+def random_value(rng, depth=0):
+    """Valor JSON aleatorio con anidamiento, números cortables y escapes."""
+    roll = rng.random()
+    if depth < 4 and roll < 0.25:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(6))]
+    if depth < 4 and roll < 0.5:
+        return {
+            f'k{i}"ñ': random_value(rng, depth + 1)
+            for i in range(rng.randrange(5))
+        }
+    return rng.choice(
+        [
+            0,
+            -17,
+            123456789012,
+            0.125,
+            -2.5e10,
+            1.5e-7,
+            True,
+            None,
+            "a\\b",
+            "é" * 30,
+        ]
+    )
+
+
+class TestJsonStream:
+    """Casos de tests para la lectura incremental de JSON."""
+
+    def test_matches_json_load_at_any_chunk_size(self):
+        """Test de valores cortados entre bloques (números, strings, escapes)."""
+        rng = random.Random(3)
+        for _ in range(100):
+            doc = {f"m{i}": random_value(rng) for i in range(rng.randrange(8))}
+            text = json.dumps(doc, indent=rng.choice([None, 2]))
+            for chunk_size in (1, 3, 16, 1 << 16):
+                for lazy_depth in (0, 2, 5):
+                    pairs = iter_object(
+                        io.StringIO(text), lazy_depth, chunk_size
+                    )
+                    assert {
+                        key: materialize(value) for key, value in pairs
+                    } == doc
+
+    def test_partial_consumption(self):
+        """Test de listas leídas a medias: al avanzar se descarta el resto."""
+        doc = {
+            "path": [f"{i:040x}" for i in range(1000)],
+            "nested": {"a": [1, 2], "b": 3},
+            "total": 7,
+        }
+        pairs = iter_object(io.StringIO(json.dumps(doc)), chunk_size=64)
+
+        key, path = next(pairs)
+        assert key == "path" and isinstance(path, StreamedArray)
+        assert next(iter(path)) == f"{0:040x}"
+        key, nested = next(pairs)
+        for name, value in nested:
+            if name == "a":
+                break
+        assert next(pairs) == ("total", 7)
+        with pytest.raises(RuntimeError):
+            iter(path)
+
+    def test_invalid_documents(self):
+        """Test de documentos truncados, raíz no objeto y datos extra."""
+        for text in (
+            '{"a": [1, 2',
+            "[1, 2]",
+            '{"a": 1} {}',
+            '{"a": 1 "b": 2}',
+            '{"a": tru}',
+        ):
+            with pytest.raises(ValueError):
+                for _, value in iter_object(io.StringIO(text), chunk_size=4):
+                    materialize(value)
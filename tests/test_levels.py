@@ -0,0 +1,85 @@
+import networkx as nx
+import pytest
+
+from benchmarks.synthetic import SHAPES, generate_dag, rev_list_text
+from src import levels
+from src.graph_anaylisis import GitGraphAnalyzer
+from src.levels import level_profile
+
+
+def load_store(shape, size=1500, seed=3):
+    """CommitStore con hijos construidos a partir de una historia sintética."""
+    analyzer = GitGraphAnalyzer(".")
+    analyzer._parse_git_output(rev_list_text(generate_dag(size, shape, seed)))
+    store = analyzer._store
+    store.build_children()
+    return store
+
+
+def shortest_depths(store):
+    """Distancia mínima desde las raíces con networkx."""
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(len(store)))
+    graph.add_edges_from(
+        (p, c) for c in range(len(store)) for p in store.parents(c)
+    )
+    graph.add_edges_from(("root", r) for r in store.roots())
+    return graph, {
+        n: d - 1
+        for n, d in nx.single_source_shortest_path_length(
+            graph, "root"
+        ).items()
+        if n != "root"
+    }
+
+
+class TestLevelProfile:
+    """Casos de tests para el motor de niveles topológicos."""
+
+    @pytest.mark.parametrize("shape", sorted(SHAPES))
+    def test_matches_networkx(self, shape):
+        """Test de generaciones y distancias mínimas contra networkx."""
+        store = load_store(shape)
+        profile = level_profile(store)
+        graph, depths = shortest_depths(store)
+        graph.remove_node("root")
+
+        generations = list(nx.topological_generations(graph))
+        assert list(profile.max_widths) == [len(g) for g in generations]
+        for depth, generation in enumerate(generations):
+            assert all(profile.max_depth[node] == depth for node in generation)
+
+        assert list(profile.min_depth) == [
+            depths[i] for i in range(len(store))
+        ]
+        assert sum(profile.min_widths) == len(store)
+
+    @pytest.mark.parametrize("shape", ["fanout", "octopus", "multi_root"])
+    def test_numpy_hybrid_matches_python(self, shape, monkeypatch):
+        """Test del camino vectorizado (generaciones anchas) contra Python puro."""
+        pytest.importorskip("numpy")
+        store = load_store(shape, size=4000)
+        expected = level_profile(store)
+
+        monkeypatch.setattr(levels, "NUMPY_MIN_EDGES", 0)
+        monkeypatch.setattr(levels, "WIDE_FRONTIER", 4)
+        assert level_profile(store) == expected
+
+    def test_analyzer_level_widths(self):
+        """Test de densidad y anchuras leídas de los histogramas."""
+        analyzer = GitGraphAnalyzer(".")
+        analyzer._parse_git_output("d b c\nc a\nb e\ne a\na\n")
+        analyzer._store.resolve()
+        analyzer._build_graph()
+        analyzer._calculate_levels()
+
+        assert analyzer.levels["d"] == 2
+        assert (
+            analyzer.level_profile.max_depth[analyzer._store.index["d"]] == 3
+        )
+        assert analyzer.calculate_branch_density() == 5 / 3
+        assert analyzer.calculate_level_widths() == {
+            "max_level_width": 2,
+            "max_generation": 3,
+            "max_generation_width": 2,
+        }
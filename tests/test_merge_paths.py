@@ -0,0 +1,64 @@
+import pytest
+from array import array
+
+from src.merge_paths import (
+    zero_one_bfs,
+    dijkstra,
+    shortest_paths,
+    rebuild_path,
+    UNREACHED,
+)
+
+
+def csr(adjacency):
+    """Convertir una lista de adyacencia a (offsets, neighbors)."""
+    offsets = array("q", [0])
+    neighbors = array("q")
+    for targets in adjacency:
+        neighbors.extend(targets)
+        offsets.append(len(neighbors))
+    return offsets, neighbors
+
+
+class TestMergePaths:
+    """Casos de tests para los motores de camino mínimo."""
+
+    @pytest.fixture
+    def diamond(self):
+        """0 es merge de 1 y 2; 1 es merge; 2 es fast-forward; 3 es raíz."""
+        offsets, neighbors = csr([[1, 2], [3], [3], []])
+        node_cost = bytes([1, 1, 0, 0])
+        return offsets, neighbors, node_cost
+
+    def test_zero_one_bfs_prefers_cheaper_path(self, diamond):
+        """Test de 0-1 BFS: evita pasar por el merge intermedio."""
+        offsets, neighbors, node_cost = diamond
+        dist, pred = zero_one_bfs(offsets, neighbors, node_cost, 0)
+
+        assert list(dist) == [0, 1, 1, 1]
+        assert rebuild_path(pred, 0, 3) == [0, 2, 3]
+
+    def test_dijkstra_matches_zero_one_bfs(self, diamond):
+        """Test de equivalencia entre el heap y 0-1 BFS."""
+        offsets, neighbors, node_cost = diamond
+        dist, _ = dijkstra(offsets, neighbors, lambda u, v: node_cost[u], 0)
+
+        assert dist == [0, 1, 1, 1]
+
+    def test_shortest_paths_general_weights(self, diamond):
+        """Test del fallback a Dijkstra con pesos no 0/1."""
+        offsets, neighbors, _ = diamond
+        dist, pred = shortest_paths(
+            offsets, neighbors, 0, node_cost=[5, 2, 1, 0]
+        )
+
+        assert dist[3] == 6
+        assert rebuild_path(pred, 0, 3) == [0, 2, 3]
+
+    def test_unreachable_and_external(self):
+        """Test de nodos inalcanzables y padres externos (ids negativos)."""
+        offsets, neighbors = csr([[-1], [0]])
+        dist, pred = shortest_paths(offsets, neighbors, 0, targets=[1])
+
+        assert dist[1] == UNREACHED
+        assert rebuild_path(pred, 0, 1) == []
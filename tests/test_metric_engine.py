@@ -0,0 +1,102 @@
+import subprocess
+import pytest
+from unittest.mock import PropertyMock, patch
+
+from src import metric_engine
+from src.graph_anaylisis import GitGraphAnalyzer
+from src.metric_engine import register_metric
+
+
+@pytest.fixture
+def analyzer():
+    """Analizador con una historia pequeña: raíz, commit y merge."""
+    analyzer = GitGraphAnalyzer("/fake/repo")
+    analyzer.commits = {
+        "a": {"parents": [], "type": "root"},
+        "b": {"parents": ["a"], "type": "fast-forward"},
+        "c": {"parents": ["a"], "type": "fast-forward"},
+        "d": {"parents": ["b", "c"], "type": "merge"},
+    }
+    analyzer.levels = {"a": 0, "b": 1, "c": 1, "d": 2}
+    return analyzer
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Registro global aislado para que los plugins no afecten a otros tests."""
+    monkeypatch.setattr(
+        metric_engine, "_REGISTRY", dict(metric_engine._REGISTRY)
+    )
+
+
+class TestMetricEngine:
+    """Casos de tests para el motor de métricas."""
+
+    def test_memoization(self, analyzer):
+        """Test de que una métrica ya calculada no se recalcula."""
+        analyzer.calculate_branch_density()
+        with patch.object(
+            GitGraphAnalyzer,
+            "level_profile",
+            new_callable=PropertyMock,
+            side_effect=AssertionError("recalculado"),
+        ):
+            assert analyzer.calculate_branch_density() == pytest.approx(4 / 3)
+        assert analyzer.metrics["branch_density"] == pytest.approx(4 / 3)
+
+    def test_graph_version_invalidates_cache(self, analyzer):
+        """Test de que cargar otro grafo invalida los resultados memoizados."""
+        assert analyzer.generate_summary_stats()["total_commits"] == 4
+        analyzer.commits = {"x": {"parents": [], "type": "root"}}
+        analyzer.levels = {"x": 0}
+        assert analyzer.generate_summary_stats()["total_commits"] == 1
+
+    def test_export_reuses_requested_tags(self, analyzer):
+        """Test de que collect_metrics no repite la ruta crítica con v0.0.0."""
+        with patch(
+            "subprocess.check_output", side_effect=["d\n", "a\n"]
+        ) as mock:
+            path = analyzer.find_critical_merge_path("v1.0.0")
+            metrics = analyzer.collect_metrics()
+
+        assert mock.call_count == 2
+        assert "v1.0.0" in mock.call_args_list[1].args[0][-1]
+        assert metrics["critical_merge_path"] == path
+        assert metrics["total_commits"] == 4
+        assert "historical_entropy" in metrics
+
+    def test_plugin_metric_with_dependencies(self, analyzer, registry):
+        """Test de una métrica externa que depende de otra métrica."""
+
+        @register_metric("merge_ratio", depends=("summary_stats",))
+        def merge_ratio(analyzer):
+            stats = analyzer.metric_engine.compute("summary_stats")
+            return stats["merge_commits"] / stats["total_commits"]
+
+        with patch(
+            "subprocess.check_output",
+            side_effect=subprocess.CalledProcessError(1, "git"),
+        ):
+            metrics = analyzer.collect_metrics()
+
+        assert metrics["merge_ratio"] == 0.25
+        assert metrics["merge_commits"] == 1
+
+    def test_dependency_waves_and_cycles(self, analyzer):
+        """Test del orden por oleadas y de la detección de ciclos."""
+        engine = analyzer.metric_engine
+        engine.register("first", lambda a: 1)
+        engine.register(
+            "second",
+            lambda a: a.metric_engine.compute("first") + 1,
+            depends=("first",),
+        )
+        assert engine._waves(["second"]) == [["first"], ["second"]]
+        assert engine.evaluate(["second", "first"])["second"] == 2
+
+        engine.register("loop_a", lambda a: 0, depends=("loop_b",))
+        engine.register("loop_b", lambda a: 0, depends=("loop_a",))
+        with pytest.raises(ValueError, match="circular"):
+            engine.evaluate(["loop_a"])
+        with pytest.raises(KeyError):
+            engine.evaluate(["no_existe"])
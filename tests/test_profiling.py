@@ -0,0 +1,98 @@
+import json
+import pstats
+import subprocess
+import pytest
+
+from src.graph_anaylisis import GitGraphAnalyzer, main
+from src.profiling import Profiler
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repositorio git con dos commits."""
+
+    def git(*args):
+        subprocess.run(
+            ["git", *args], cwd=tmp_path, check=True, capture_output=True
+        )
+
+    git("init")
+    git("config", "user.name", "Test User")
+    git("config", "user.email", "test@example.com")
+    git("commit", "--allow-empty", "-m", "Primero")
+    git("commit", "--allow-empty", "-m", "Segundo")
+    return tmp_path
+
+
+class TestProfiling:
+    """Casos de tests para la instrumentación por fases."""
+
+    def test_metadata_profile(self, repo):
+        """Test de fases, subprocesos y conteos en el bloque metadata."""
+        analyzer = GitGraphAnalyzer(str(repo))
+        analyzer.load_git_data()
+        analyzer.find_critical_merge_paths(["HEAD~1"])
+        profile = analyzer.collect_metrics()["metadata"]["profile"]
+
+        assert profile["commits"] == 2
+        assert profile["edges"] == 1
+        for phase in (
+            "parse",
+            "resolve",
+            "build_children",
+            "levels",
+            "commit_types",
+            "metric:branch_density",
+            "metric:critical_merge_paths",
+        ):
+            assert profile["phases"][phase]["calls"] == 1
+            assert profile["phases"][phase]["wall_seconds"] >= 0
+        commands = [entry["command"] for entry in profile["subprocesses"]]
+        assert commands[0] == "git rev-list --all --parents"
+        assert "peak_traced_memory_mb" not in profile
+        json.dumps(profile)
+
+    def test_chrome_trace(self, tmp_path):
+        """Test del formato trace-event y del pico de memoria rastreada."""
+        profiler = Profiler(trace_memory=True)
+        try:
+            with profiler.phase("parse"):
+                data = [0] * 10000
+            with profiler.command(["git", "rev-list", "--all"]):
+                pass
+            report = profiler.report()
+            trace_path = tmp_path / "trace.json"
+            profiler.write_chrome_trace(str(trace_path))
+        finally:
+            profiler.stop()
+
+        assert report["peak_traced_memory_mb"] > 0
+        assert report["subprocesses"][0]["command"] == "git rev-list --all"
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        assert [event["name"] for event in events] == ["parse", "git rev-list"]
+        assert all(
+            event["ph"] == "X" and event["dur"] >= 0 for event in events
+        )
+        del data
+
+    def test_main_profile_cprofile(self, repo, tmp_path):
+        """Test de --profile con volcado de cProfile."""
+        stats_path = tmp_path / "analysis.prof"
+        assert (
+            main(
+                [
+                    "--repo",
+                    str(repo),
+                    "--output",
+                    str(tmp_path / "m.json"),
+                    "--profile",
+                    str(stats_path),
+                ]
+            )
+            == 0
+        )
+
+        stats = pstats.Stats(str(stats_path))
+        assert stats.total_calls > 0
+        metrics = json.loads((tmp_path / "m.json").read_text())
+        assert "peak_traced_memory_mb" in metrics["metadata"]["profile"]
@@ -0,0 +1,68 @@
+import random
+import pytest
+
+from src.commit_store import CommitStore
+from src.reachability import ReachabilityIndex
+
+
+def random_dag(num_commits, seed):
+    """DAG aleatorio con merges y varias raíces, en orden hijos -> padres."""
+    rng = random.Random(seed)
+    store = CommitStore()
+    for i in reversed(range(num_commits)):
+        candidates = list(range(i + 1, min(num_commits, i + 8)))
+        count = rng.choice([0, 1, 1, 1, 2, 2, 3]) if candidates else 0
+        parents = rng.sample(candidates, min(count, len(candidates)))
+        store.add_commit(f"c{i}", [f"c{p}" for p in parents])
+    store.resolve()
+    return store
+
+
+def ancestors(store, commit):
+    """Ancestros por BFS ingenuo (incluye el propio commit)."""
+    seen = {commit}
+    stack = [commit]
+    while stack:
+        for parent in store.parents(stack.pop()):
+            if parent >= 0 and parent not in seen:
+                seen.add(parent)
+                stack.append(parent)
+    return seen
+
+
+class TestReachabilityIndex:
+    """Casos de tests para el índice de ancestros."""
+
+    @pytest.fixture(params=[1, 2, 3])
+    def dag(self, request):
+        store = random_dag(60, request.param)
+        index = ReachabilityIndex(store)
+        closure = {i: ancestors(store, i) for i in range(len(store))}
+        return store, index, closure
+
+    def test_is_ancestor_matches_bfs(self, dag):
+        """Test de is_ancestor contra BFS para todos los pares."""
+        store, index, closure = dag
+        for a in range(len(store)):
+            for b in range(len(store)):
+                assert index.is_ancestor(a, b) == (a in closure[b])
+
+    def test_merge_bases_match_brute_force(self, dag):
+        """Test de merge_bases contra ancestros comunes no redundantes."""
+        store, index, closure = dag
+        rng = random.Random(0)
+        for _ in range(200):
+            a, b = rng.randrange(len(store)), rng.randrange(len(store))
+            common = closure[a] & closure[b]
+            best = {
+                c
+                for c in common
+                if not any(o != c and c in closure[o] for o in common)
+            }
+            assert set(index.merge_bases(a, b)) == best
+
+    def test_commits_between(self, dag):
+        """Test de commits_between como diferencia de conjuntos."""
+        store, index, closure = dag
+        for a, b in [(5, 0), (0, 5), (10, 3), (3, 3)]:
+            assert set(index.commits_between(a, b)) == closure[b] - closure[a]
@@ -0,0 +1,92 @@
+import subprocess
+import pytest
+
+from src.release_notes import GitNotesService, parse_log_stream
+from src.report_suite import MarkdownWriter, ReleaseNote, ReportingSuite
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repositorio con tres commits entre v1.0 (anotado) y v1.1."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q")
+    git(path, "config", "user.name", "Ana Pérez")
+    git(path, "config", "user.email", "ana@example.com")
+    git(path, "commit", "--allow-empty", "-m", "Inicial")
+    git(path, "tag", "-a", "v1.0", "-m", "Versión 1.0")
+    git(
+        path,
+        "commit",
+        "--allow-empty",
+        "-m",
+        "Arreglar parser\n\nDetalle en el cuerpo",
+    )
+    git(path, "commit", "--allow-empty", "-m", "Mensaje con | y ñ")
+    git(path, "commit", "--allow-empty", "-m", "Preparar 1.1")
+    git(path, "tag", "v1.1")
+    return path
+
+
+class TestReleaseNotes:
+    """Casos de tests para las notas de lanzamiento."""
+
+    def test_range_and_disk_cache(self, repo, tmp_path):
+        """Test de un rango entre tags y de la caché por par de shas."""
+        service = GitNotesService(str(repo), cache_dir=str(tmp_path / "cache"))
+        notes = service.extract_release_notes("v1.0", "v1.1")
+
+        assert [note.message for note in notes] == [
+            "Preparar 1.1",
+            "Mensaje con | y ñ",
+            "Arreglar parser\n\nDetalle en el cuerpo",
+        ]
+        assert notes[0].commit_hash == git(repo, "rev-parse", "v1.1")
+        assert notes[0].author == "Ana Pérez" and notes[0].date.startswith(
+            "20"
+        )
+        assert service.git_calls == 1
+
+        # Segunda generación: refs leídas de disco y notas de la caché
+        again = GitNotesService(str(repo), cache_dir=str(tmp_path / "cache"))
+        assert again.extract_release_notes("v1.0", "v1.1") == notes
+        assert again.git_calls == 0
+        assert len(again.extract_release_notes(None, "v1.1")) == 4
+
+        with pytest.raises(RuntimeError):
+            again.extract_release_notes("v1.0", "no-existe")
+
+    def test_stream_parsing_across_chunks(self):
+        """Test del parser con NUL y mensajes cortados en cualquier punto."""
+        output = "a\0Ana\0d1\0uno\n\ndos\n\0b\0Luis\0d2\0tres\n"
+        expected = [
+            ReleaseNote("a", "uno\n\ndos", "Ana", "d1"),
+            ReleaseNote("b", "tres", "Luis", "d2"),
+        ]
+        for size in (1, 2, 5, len(output)):
+            chunks = (
+                output[i : i + size] for i in range(0, len(output), size)
+            )
+            assert list(parse_log_stream(chunks)) == expected
+
+        with pytest.raises(RuntimeError):
+            list(parse_log_stream(iter(["a\0Ana\0"])))
+        assert not hasattr(expected[0], "__dict__")
+
+    def test_notes_section_in_report(self, repo, tmp_path):
+        """Test de la sección de notas en el reporte."""
+        metrics = tmp_path / "metrics.json"
+        metrics.write_text('{"total_commits": 4}')
+        output = tmp_path / "report.md"
+        suite = ReportingSuite(MarkdownWriter(), GitNotesService(str(repo)))
+        suite.generate_report(str(metrics), str(output), "v1.0", "v1.1")
+        text = output.read_text()
+
+        assert "## Notas de lanzamiento" in text
+        assert "| Arreglar parser |" in text and "Mensaje con \\| y ñ" in text
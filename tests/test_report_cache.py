@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import pytest
+
+from src.report_cache import ReportCache
+from src.report_suite import HtmlWriter, MarkdownWriter, ReportingSuite, main
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    path = tmp_path / "metrics.json"
+    path.write_text(
+        json.dumps({"total_commits": 10, "critical_merge_path": ["a", "b"]})
+    )
+    return path
+
+
+class TestReportCache:
+    """Casos de tests para la caché de reportes."""
+
+    def test_hit_skips_render_and_write(self, tmp_path, metrics, monkeypatch):
+        """Test de acierto: ni se renderiza ni se reescribe la salida."""
+        cache = ReportCache(str(tmp_path / "cache"))
+        output = tmp_path / "report.md"
+        suite = ReportingSuite(MarkdownWriter(), cache=cache)
+
+        suite.generate_report(str(metrics), str(output))
+        assert suite.last_run == {"cached": False, "written": True}
+        assert "## Caché de reportes" in output.read_text()
+        assert "| resultado | fallo |" in output.read_text()
+
+        # Un acierto no debe renderizar el cuerpo
+        monkeypatch.setattr(MarkdownWriter, "render_body", None)
+        suite.generate_report(str(metrics), str(output))
+        assert suite.last_run == {"cached": True, "written": True}
+        assert "| resultado | acierto |" in output.read_text()
+
+        os.utime(output, (0, 0))
+        suite.generate_report(str(metrics), str(output))
+        assert suite.last_run == {"cached": True, "written": False}
+        assert output.stat().st_mtime == 0
+
+        # Salida borrada: se restaura desde la caché
+        output.unlink()
+        suite.generate_report(str(metrics), str(output))
+        assert suite.last_run == {"cached": True, "written": True}
+        assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 0}
+
+    def test_key_covers_input_and_writer(self, tmp_path, metrics):
+        """Test de clave: cambia con las métricas, el formato y las opciones."""
+        cache = ReportCache(str(tmp_path / "cache"))
+        for writer in (
+            MarkdownWriter(),
+            MarkdownWriter(limit=5),
+            HtmlWriter(),
+        ):
+            suite = ReportingSuite(writer, cache=cache)
+            suite.generate_report(str(metrics), str(tmp_path / "out"))
+            assert not suite.last_run["cached"]
+        metrics.write_text(json.dumps({"total_commits": 11}))
+        suite.generate_report(str(metrics), str(tmp_path / "out"))
+        assert not suite.last_run["cached"]
+        assert len(list((tmp_path / "cache").glob("*.report"))) == 4
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """Test de desalojo de las entradas usadas hace más tiempo."""
+        cache = ReportCache(str(tmp_path / "cache"), max_bytes=250)
+        for key in ("a", "b"):
+            cache.store(key, lambda path: open(path, "w").write("x" * 100))
+            os.utime(
+                cache.entry_path(key), (1000, 1000 if key == "a" else 2000)
+            )
+        cache.lookup("a")  # "a" pasa a ser la más reciente
+        cache.store("c", lambda path: open(path, "w").write("x" * 100))
+
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None and cache.lookup("c") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_concurrent_writers(self, tmp_path, metrics):
+        """Test de varios hilos generando el mismo reporte a la vez."""
+        cache_dir = str(tmp_path / "cache")
+        errors = []
+
+        def generate(i):
+            try:
+                suite = ReportingSuite(
+                    MarkdownWriter(), cache=ReportCache(cache_dir)
+                )
+                suite.generate_report(
+                    str(metrics), str(tmp_path / f"report-{i % 2}.md")
+                )
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=generate, args=(i,)) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert list((tmp_path / "cache").glob("*.tmp")) == []
+        # Mismo cuerpo; solo el resultado de la caché depende del hilo
+        bodies = [
+            (tmp_path / f"report-{i}.md")
+            .read_text()
+            .split("## Caché de reportes")[0]
+            for i in (0, 1)
+        ]
+        assert bodies[0] == bodies[1]
+
+    def test_cli_no_cache(self, tmp_path, metrics, capsys):
+        """Test de --no-cache y del aviso de reporte sin cambios."""
+        args = [
+            "--input",
+            str(metrics),
+            "--output",
+            str(tmp_path / "r.md"),
+            "--cache-dir",
+            str(tmp_path / "cache"),
+        ]
+        assert main(args) == 0 and main(args) == 0 and main(args) == 0
+        out = capsys.readouterr().out
+        assert "Reporte sin cambios (caché)" in out
+        assert "Caché de reportes: 2 aciertos, 1 fallos" in out
+
+        assert main(args + ["--no-cache"]) == 0
+        assert "Generación de reporte completo" in capsys.readouterr().out
+        assert "Caché de reportes" not in (tmp_path / "r.md").read_text()
+
+    def test_key_ignores_profile(self, tmp_path):
+        """Test de clave: un analyze repetido solo cambia el perfil."""
+        cache = ReportCache(str(tmp_path / "cache"))
+        output = tmp_path / "report.md"
+        metrics = tmp_path / "metrics.json"
+        suite = ReportingSuite(MarkdownWriter(), cache=cache)
+        for seconds in (0.5, 0.7):
+            metrics.write_text(
+                json.dumps(
+                    {
+                        "total_commits": 10,
+                        "metadata": {
+                            "analysis_version": "1.0.0",
+                            "profile": {
+                                "phases": {
+                                    "parse": {
+                                        "calls": 1,
+                                        "wall_seconds": seconds,
+                                    }
+                                }
+                            },
+                        },
+                    }
+                )
+            )
+            suite.generate_report(str(metrics), str(output))
+
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+        # El perfil mostrado es el de la última ejecución
+        report = output.read_text()
+        assert "| parse | 1 | 0.7 |" in report and "0.5" not in report
+        assert report.index("## Perfil de ejecución") > report.index(
+            "## Metadatos"
+        )
+
+        ndjson = tmp_path / "batch.ndjson"
+        ndjson.write_text(
+            json.dumps(
+                {"repo": "a", "metrics": json.loads(metrics.read_text())}
+            )
+        )
+        suite.generate_report(str(ndjson), str(tmp_path / "batch.md"))
+        assert "| parse | 1 | 0.7 |" in (tmp_path / "batch.md").read_text()
@@ -1,5 +1,32 @@
+import json
 import pytest
-from src.report_suite import ReportingSuite, MarkdownWriter
+from src.report_suite import HtmlWriter, ReportingSuite, MarkdownWriter
+
+
+def metrics_file(tmp_path, path_length=500):
+    """metrics.json con una ruta crítica larga y una serie por ventana."""
+    metrics = {
+        "total_commits": path_length,
+        "merge_commits": 3,
+        "branch_density": 0.25,
+        "critical_merge_path": [f"{i:040x}" for i in range(path_length)],
+        "windowed_metrics": {
+            "window": "month",
+            "window_start": list(range(120)),
+            "commits": [1] * 120,
+            "merge_ratio": [0.5] * 120,
+        },
+        "metadata": {
+            "repository_path": "repo|x",
+            "profile": {
+                "phases": {"parse": {"calls": 1, "wall_seconds": 0.5}}
+            },
+        },
+    }
+    path = tmp_path / "metrics.json"
+    path.write_text(json.dumps(metrics, indent=2))
+    return path
+
 
 class TestReportingSuite:
     """Casos de testeo para ReportingSuite."""
@@ -8,4 +35,60 @@ class TestReportingSuite:
         """Test de inicialización del ReportingSuite."""
         writer = MarkdownWriter()
         suite = ReportingSuite(writer)
-        assert suite.writer is writer
\ No newline at end of file
+        assert suite.writer is writer
+
+    def test_markdown_report_truncates_lists(self, tmp_path):
+        """Test de reporte Markdown con listas truncadas al límite."""
+        output = tmp_path / "report.md"
+        result = ReportingSuite(MarkdownWriter(limit=10)).generate_report(
+            str(metrics_file(tmp_path)), str(output)
+        )
+        text = output.read_text()
+
+        assert result == str(output)
+        assert text.startswith("# ")
+        assert "| total_commits | 500 |" in text
+        assert f"- `{9:040x}`" in text and f"{10:040x}" not in text
+        assert "Mostrando 10 de 500 elementos" in text
+        assert "| window_start | commits | merge_ratio |" in text
+        assert "Mostrando 10 de 120 elementos" in text
+        assert "| parse | 1 | 0.5 |" in text
+        assert "repo\\|x" in text
+
+    def test_html_report(self, tmp_path):
+        """Test de reporte HTML autocontenido y escapado."""
+        output = tmp_path / "report.html"
+        ReportingSuite(HtmlWriter(limit=None)).generate_report(
+            str(metrics_file(tmp_path, 80)), str(output)
+        )
+        text = output.read_text()
+
+        assert text.startswith("<!DOCTYPE html>") and text.rstrip().endswith(
+            "</html>"
+        )
+        assert text.count("<li><code>") == 80
+        assert "Mostrando" not in text
+
+    def test_batch_ndjson_input(self, tmp_path):
+        """Test de NDJSON de batch: una sección por repositorio."""
+        path = tmp_path / "batch.ndjson"
+        lines = [
+            {"repo": "a", "status": "ok", "metrics": {"total_commits": 5}},
+            {"repo": "b", "status": "error", "error": "RuntimeError: <roto>"},
+        ]
+        path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+        output = tmp_path / "report.html"
+        ReportingSuite(HtmlWriter()).generate_report(str(path), str(output))
+        text = output.read_text()
+
+        assert "<h2>a</h2>" in text and "<h2>b</h2>" in text
+        assert "RuntimeError: &lt;roto&gt;" in text
+
+    def test_missing_input(self, tmp_path):
+        """Test de archivo de métricas inexistente y límite inválido."""
+        with pytest.raises(RuntimeError):
+            ReportingSuite(MarkdownWriter()).generate_report(
+                str(tmp_path / "x.json"), str(tmp_path / "r.md")
+            )
+        with pytest.raises(ValueError):
+            MarkdownWriter(limit=0)
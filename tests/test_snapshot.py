@@ -0,0 +1,136 @@
+import multiprocessing
+import pytest
+
+from benchmarks.synthetic import generate_dag, rev_list_text
+from src.commit_store import CommitStore
+from src import snapshot
+from src.graph_anaylisis import GitGraphAnalyzer
+from src.snapshot import (
+    SharedSnapshot,
+    attach_snapshot,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+def loaded_analyzer(size=800, shape="mixed"):
+    """Analizador con una historia sintética ya procesada."""
+    analyzer = GitGraphAnalyzer(".")
+    analyzer._parse_git_output(
+        rev_list_text(generate_dag(size, shape, seed=5))
+    )
+    analyzer._store.resolve()
+    analyzer._build_graph()
+    analyzer._calculate_levels()
+    analyzer._GitGraphAnalyzer__analyze_commit_types()
+    return analyzer
+
+
+def columns(store):
+    return (
+        list(store.hashes),
+        list(store.parent_offsets),
+        list(store.parent_ids),
+        list(store.child_offsets),
+        list(store.child_ids),
+        bytes(store.types),
+        list(store.levels),
+        store.external_hashes,
+    )
+
+
+def count_merges(name):
+    """Worker: abrir el snapshot compartido y contar merges."""
+    store, meta = attach_snapshot(name)
+    return meta["worker"], store.count_type(2), store.hashes[len(store) - 1]
+
+
+class TestSnapshot:
+    """Casos de tests para el snapshot binario."""
+
+    def test_roundtrip_is_memory_mapped(self, tmp_path):
+        """Test de ida y vuelta: mismas columnas, vistas sobre el mmap."""
+        analyzer = loaded_analyzer()
+        path = tmp_path / "dag.snapshot"
+        analyzer.save_snapshot(str(path))
+
+        reopened = GitGraphAnalyzer(".")
+        meta = reopened.load_snapshot(str(path))
+        store = reopened._store
+        assert meta["repository_path"] == "."
+        assert isinstance(store.parent_ids, memoryview)
+        assert columns(store) == columns(analyzer._store)
+        assert (
+            reopened.generate_summary_stats()
+            == analyzer.generate_summary_stats()
+        )
+        assert (
+            reopened.calculate_level_widths()
+            == analyzer.calculate_level_widths()
+        )
+
+        # Al añadir commits las columnas pasan a memoria propia
+        tip = store.hashes[0]
+        store.add_commit("f" * 40, [tip])
+        store.resolve()
+        assert store.parents(len(store) - 1).tolist() == [0]
+        assert store._mapping is None
+
+    def test_text_hashes_and_timestamps(self, tmp_path):
+        """Test de hashes no hexadecimales, padres externos y fechas."""
+        store = CommitStore()
+        store.add_commit("b", ["a", "x"], timestamp=20)
+        store.add_commit("a", [], timestamp=10)
+        store.resolve()
+        save_snapshot(store, tmp_path / "s", {"refs": {}})
+
+        loaded, meta = load_snapshot(tmp_path / "s")
+        assert loaded.hashes == ["b", "a"] and loaded.index == {"b": 0, "a": 1}
+        assert list(loaded.parents(0)) == [1, -1] and loaded.hash_of(-1) == "x"
+        assert list(loaded.timestamps) == [20, 10]
+        assert meta == {"refs": {}}
+
+    def test_rejects_corrupt_or_foreign_files(self, tmp_path):
+        """Test de checksum, versión y archivos ajenos."""
+        path = tmp_path / "dag.snapshot"
+        save_snapshot(loaded_analyzer(100)._store, path, {})
+        data = bytearray(path.read_bytes())
+        data[-3] ^= 0xFF
+        path.write_bytes(data)
+
+        assert load_snapshot(path) is None
+        assert load_snapshot(path, verify=False) is not None
+        (tmp_path / "empty").write_bytes(b"")
+        assert load_snapshot(tmp_path / "empty") is None
+        assert load_snapshot(tmp_path / "missing") is None
+        with pytest.raises(RuntimeError):
+            GitGraphAnalyzer(".").load_snapshot(str(path))
+
+    def test_failed_write_keeps_previous_snapshot(self, tmp_path, monkeypatch):
+        """Test de escritura fallida: sin temporales y con el snapshot anterior."""
+        store = loaded_analyzer(100)._store
+        path = tmp_path / "dag.snapshot"
+        save_snapshot(store, path, {})
+        previous = path.read_bytes()
+
+        def broken_parts():
+            yield b"parcial"
+            raise OSError("Disco lleno")
+
+        monkeypatch.setattr(
+            snapshot, "_serialize", lambda store, meta: (broken_parts(), None)
+        )
+        with pytest.raises(OSError):
+            save_snapshot(store, path, {})
+        assert [p.name for p in tmp_path.iterdir()] == ["dag.snapshot"]
+        assert path.read_bytes() == previous
+
+    def test_shared_memory_pool(self):
+        """Test de workers que leen el mismo snapshot en memoria compartida."""
+        store = loaded_analyzer(2000, "merges")._store
+        expected = (store.count_type(2), store.hashes[len(store) - 1])
+
+        with SharedSnapshot(store, {"worker": "pool"}) as shared:
+            with multiprocessing.Pool(2) as pool:
+                results = pool.map(count_merges, [shared.name] * 4)
+        assert results == [("pool", *expected)] * 4
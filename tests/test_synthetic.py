@@ -0,0 +1,68 @@
+import subprocess
+
+from benchmarks.suite import compare, run_suite
+from benchmarks.synthetic import (
+    SHAPES,
+    generate_dag,
+    rev_list_text,
+    write_repo,
+)
+from src.graph_anaylisis import GitGraphAnalyzer
+
+
+class TestSyntheticHistory:
+    """Casos de tests para el generador de historias y la suite de benchmarks."""
+
+    def test_generate_dag_shapes(self):
+        """Test de cada forma: determinista, padres previos y tipos esperados."""
+        for shape, spec in SHAPES.items():
+            dag = generate_dag(2000, shape, seed=1)
+            assert dag == generate_dag(2000, shape, seed=1)
+
+            counts = [len(dag.parents_of(i)) for i in range(len(dag))]
+            assert counts.count(0) == spec.roots
+            assert all(
+                p < i for i in range(len(dag)) for p in dag.parents_of(i)
+            )
+            if spec.octopus:
+                assert max(counts) > 2
+            if shape == "linear":
+                assert max(counts) == 1 and dag.tips == [1999]
+
+    def test_fast_import_matches_rev_list(self, tmp_path):
+        """Test del repositorio escrito con fast-import frente al texto sintético."""
+        dag = generate_dag(300, "octopus", seed=2)
+        shas = write_repo(dag, str(tmp_path))
+
+        real = GitGraphAnalyzer(str(tmp_path))
+        real.load_git_data()
+        synthetic = GitGraphAnalyzer(str(tmp_path))
+        synthetic._parse_git_output(rev_list_text(dag))
+
+        assert len(real.commits) == len(synthetic.commits) == 300
+        for commit, sha in shas.items():
+            expected = [shas[p] for p in dag.parents_of(commit)]
+            assert real.commits[sha]["parents"] == expected
+
+        count = subprocess.check_output(
+            ["git", "rev-list", "--all", "--count"], cwd=tmp_path, text=True
+        )
+        assert int(count) == 300
+
+    def test_compare_detects_regressions(self):
+        """Test de la comparación contra baseline con tolerancias."""
+        baseline = run_suite([200], ["mixed"], repeat=1)
+        assert compare(baseline, baseline) == []
+
+        slower = {
+            **baseline,
+            "results": {
+                key: {
+                    name: {**entry, "seconds": entry["seconds"] * 2 + 0.1}
+                    for name, entry in phases.items()
+                }
+                for key, phases in baseline["results"].items()
+            },
+        }
+        regressions = compare(slower, baseline)
+        assert any("mixed/200 parse" in line for line in regressions)
@@ -0,0 +1,108 @@
+import random
+import pytest
+
+from src import visualization
+from src.commit_store import MERGE
+from src.graph_anaylisis import GitGraphAnalyzer
+from src.visualization import aggregate_frames, plot_metrics
+
+DAY = 86400
+
+
+def dated_analyzer(num_commits, seed=0):
+    """Historia con merges, fechas crecientes y una ruta crítica."""
+    rng = random.Random(seed)
+    lines = []
+    timestamp = 1704067200
+    for i in range(num_commits):
+        parents = [f"c{i - 1}"] if i else []
+        if i > 2 and rng.random() < 0.3:
+            parents.append(f"c{rng.randrange(max(0, i - 40), i - 1)}")
+        lines.append((timestamp, f"c{i}", parents))
+        timestamp += rng.randrange(DAY // 4, DAY)
+
+    analyzer = GitGraphAnalyzer(".")
+    analyzer._parse_timestamps = True
+    analyzer._parse_git_output(
+        "".join(
+            f"{ts} {commit} {' '.join(parents)}\n"
+            for ts, commit, parents in reversed(lines)
+        )
+    )
+    analyzer._store.resolve()
+    analyzer._build_graph()
+    analyzer._calculate_levels()
+    analyzer._GitGraphAnalyzer__analyze_commit_types()
+    analyzer.metrics["critical_merge_path"] = [
+        f"c{i}" for i in range(0, num_commits, 7)
+    ]
+    return analyzer
+
+
+class TestVisualization:
+    """Casos de tests para las gráficas agregadas."""
+
+    def test_frames_are_bounded_and_exact(self):
+        """Test de agregación: filas acotadas y totales conservados."""
+        analyzer = dated_analyzer(5000)
+        store = analyzer._store
+        frames = aggregate_frames(analyzer, bins=50)
+        levels, ratio = frames["levels"], frames["merge_ratio"]
+
+        assert len(levels) <= 50 and len(ratio) <= 50
+        sizes = levels["level_end"] - levels["level_start"] + 1
+        assert round((levels["width_mean"] * sizes).sum()) == len(store)
+        assert levels["width_max"].max() == max(
+            analyzer.level_profile.min_widths
+        )
+        assert levels["critical_commits"].sum() == len(range(0, 5000, 7))
+        assert ratio["commits"].sum() == len(store)
+        assert ratio["merges"].sum() == store.count_type(MERGE)
+        assert ratio["merge_ratio"].dropna().between(0, 1).all()
+
+    def test_small_history_is_not_binned(self):
+        """Test de historia con menos niveles que intervalos."""
+        analyzer = dated_analyzer(30)
+        levels = aggregate_frames(analyzer)["levels"]
+        assert list(levels["level_start"]) == list(
+            range(len(analyzer.level_profile.min_widths))
+        )
+        assert (levels["width_mean"] == levels["width_max"]).all()
+
+    def test_plot_and_frame_cache(self, tmp_path, monkeypatch):
+        """Test de render sin pantalla y reutilización de frames en caché."""
+        analyzer = dated_analyzer(2000)
+        output = tmp_path / "dag.png"
+        plot_metrics(
+            analyzer, str(output), bins=100, cache_dir=str(tmp_path / "frames")
+        )
+        assert output.read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+        assert len(list((tmp_path / "frames").glob("frames-*.pkl"))) == 1
+
+        # Con la caché ya no se agrega de nuevo
+        def fail(*args, **kwargs):
+            raise AssertionError("frames recalculados")
+
+        monkeypatch.setattr(visualization, "level_width_frame", fail)
+        frames = plot_metrics(
+            analyzer,
+            str(tmp_path / "dag.svg"),
+            bins=100,
+            cache_dir=str(tmp_path / "frames"),
+        )
+        assert len(frames["levels"]) <= 100
+        assert (tmp_path / "dag.svg").read_text().lstrip().startswith("<?xml")
+
+        with pytest.raises(AssertionError):
+            aggregate_frames(
+                analyzer, bins=99, cache_dir=str(tmp_path / "frames")
+            )
+
+    def test_without_timestamps(self, tmp_path):
+        """Test de historia sin fechas: solo el perfil de anchura."""
+        analyzer = dated_analyzer(100)
+        analyzer._store.timestamps = None
+        frames = aggregate_frames(analyzer)
+        assert list(frames) == ["levels"]
+        analyzer.export_plots(str(tmp_path / "levels.png"))
+        assert (tmp_path / "levels.png").exists()
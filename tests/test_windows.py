@@ -0,0 +1,149 @@
+import csv
+import os
+import random
+import subprocess
+import pytest
+
+from src.commit_store import CommitStore
+from src.graph_anaylisis import GitGraphAnalyzer
+from src.windows import event_entropy, windowed_metrics
+
+DAY = 86400
+# Lunes 2024-01-01 00:00 UTC
+MONDAY = 1704067200
+
+
+def dated_history(num_commits, seed=0):
+    """Historia lineal con merges y fechas crecientes (hijos primero, como rev-list)."""
+    rng = random.Random(seed)
+    lines = []
+    timestamp = MONDAY
+    for i in range(num_commits):
+        parents = [f"c{i - 1}"] if i else []
+        if i > 2 and rng.random() < 0.3:
+            parents.append(f"c{rng.randrange(i - 1)}")
+        lines.append((timestamp, f"c{i}", parents))
+        timestamp += rng.randrange(DAY // 2, 3 * DAY)
+
+    analyzer = GitGraphAnalyzer(".")
+    analyzer._parse_timestamps = True
+    analyzer._parse_git_output(
+        "".join(
+            f"{ts} {commit} {' '.join(parents)}\n"
+            for ts, commit, parents in reversed(lines)
+        )
+    )
+    analyzer._store.resolve()
+    analyzer._build_graph()
+    analyzer._calculate_levels()
+    analyzer._GitGraphAnalyzer__analyze_commit_types()
+    return analyzer
+
+
+def brute_force(store, commits):
+    """Métricas de una ventana recalculadas desde cero."""
+    merges = sum(1 for c in commits if store.types[c] == 2)
+    fast_forwards = sum(1 for c in commits if store.types[c] == 1)
+    levels = {store.levels[c] for c in commits}
+    return (
+        len(commits),
+        merges,
+        round(event_entropy(merges, fast_forwards), 6),
+        round(len(commits) / len(levels), 6),
+    )
+
+
+class TestWindowedMetrics:
+    """Casos de tests para las métricas por ventana."""
+
+    def test_weekly_windows(self):
+        """Test de ventanas semanales contra un recálculo por semana."""
+        analyzer = dated_history(120)
+        store = analyzer._store
+        series = analyzer.calculate_windowed_metrics("week")
+
+        assert sum(series["commits"]) == 120
+        assert series["start"][0] == MONDAY
+        for start, end, commits, merges, entropy, density in zip(
+            series["start"],
+            series["end"],
+            series["commits"],
+            series["merges"],
+            series["entropy"],
+            series["density"],
+        ):
+            assert end - start == 7 * DAY and (start - MONDAY) % (7 * DAY) == 0
+            members = [
+                c
+                for c in range(len(store))
+                if start <= store.timestamps[c] < end
+            ]
+            assert (commits, merges, entropy, density) == brute_force(
+                store, members
+            )
+
+    def test_sliding_commit_windows(self):
+        """Test de ventanas deslizantes de N commits y ventanas sin solape."""
+        analyzer = dated_history(50)
+        store = analyzer._store
+        order = sorted(range(len(store)), key=lambda c: store.timestamps[c])
+
+        sliding = windowed_metrics(store, 10, step=3)
+        ends = list(range(10, 51, 3)) + [50]
+        assert len(sliding["commits"]) == len(ends)
+        for k, end in enumerate(ends):
+            members = order[end - 10 : end]
+            assert sliding["start"][k] == store.timestamps[members[0]]
+            assert (
+                sliding["commits"][k],
+                sliding["merges"][k],
+                sliding["entropy"][k],
+                sliding["density"][k],
+            ) == brute_force(store, members)
+
+        tumbling = windowed_metrics(store, "20")
+        assert tumbling["commits"] == [20, 20, 10]
+        with pytest.raises(ValueError):
+            windowed_metrics(store, 10, step=11)
+
+    def test_requires_timestamps(self):
+        """Test de error si los datos se cargaron sin fechas."""
+        store = CommitStore.from_mapping({"a": {"parents": []}})
+        with pytest.raises(RuntimeError):
+            windowed_metrics(store, "month")
+
+    def test_real_repo_monthly_csv(self, tmp_path):
+        """Test de fechas leídas con la misma invocación de rev-list y export CSV."""
+        pytest.importorskip("pandas")
+        env = {
+            **os.environ,
+            "GIT_AUTHOR_NAME": "Test",
+            "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "Test",
+            "GIT_COMMITTER_EMAIL": "t@example.com",
+        }
+        subprocess.run(
+            ["git", "init"], cwd=tmp_path, check=True, capture_output=True
+        )
+        for date in ("2024-01-05", "2024-01-20", "2024-02-02", "2024-04-10"):
+            env["GIT_COMMITTER_DATE"] = f"{date}T12:00:00Z"
+            subprocess.run(
+                ["git", "commit", "--allow-empty", "-m", date],
+                cwd=tmp_path,
+                check=True,
+                capture_output=True,
+                env=env,
+            )
+
+        analyzer = GitGraphAnalyzer(str(tmp_path))
+        analyzer.load_git_data(timestamps=True)
+        series = analyzer.calculate_windowed_metrics("month")
+        assert series["commits"] == [2, 1, 1]
+
+        output = tmp_path / "windows.csv"
+        analyzer.export_windowed_metrics(str(output))
+        with open(output) as f:
+            rows = list(csv.DictReader(f))
+        assert rows[0]["start"].startswith("2024-01-01")
+        assert rows[2]["end"].startswith("2024-05-01")
+        assert analyzer.collect_metrics()["windowed_metrics"] == series